@@ -6,14 +6,40 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('pyproject.toml', '.'), ('cookie.ico', '.')],
+    datas=[('cookie.ico', '.')],
     hiddenimports=[
         'src',
         'src.config',
+        'src.backend',
+        'src.profiles',
         'src.window_finder',
         'src.clicker',
+        'src.dispatch',
+        'src.scheduler',
+        'src.engine',
+        'src.process_host',
+        'src.geometry',
+        'src.capture',
+        'src.shimmer',
+        'src.calibration',
+        'src.cookies',
+        'src.autotune',
+        'src.burst',
+        'src.logs',
+        'src.throttle',
+        'src.telemetry',
+        'src.win_events',
         'src.overlay',
         'src.gui',
+        'src.macro',
+        'src.metrics',
+        'src.remote',
+        'src.sampling',
+        'src.recorder',
+        'src.analyzer',
+        'src.savegame',
+        'src.optimizer',
+        'src.cli',
         'customtkinter',
         'customtkinter.appearance_mode',
         'customtkinter.scaling',
@@ -24,6 +50,7 @@ a = Analysis(
         'win32api',
         'win32con',
         'win32gui',
+        'win32process',
         'keyboard',
         'tkinter',
         'threading',
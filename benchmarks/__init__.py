@@ -0,0 +1 @@
+"""Headless benchmark suite running against the simulated window backend."""
@@ -0,0 +1,130 @@
+"""Run the benchmark suite and write comparable JSON results.
+
+Usage:
+    python -m benchmarks [--quick] [--only NAME ...] [--output FILE] [--baseline FILE]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from . import (
+    clicking,
+    discovery,
+    fleet,
+    logs,
+    metrics,
+    planning,
+    profiling,
+    recording,
+    startup,
+)
+
+
+BENCHMARKS = {
+    **clicking.BENCHMARKS,
+    **discovery.BENCHMARKS,
+    **fleet.BENCHMARKS,
+    **logs.BENCHMARKS,
+    **metrics.BENCHMARKS,
+    **planning.BENCHMARKS,
+    **profiling.BENCHMARKS,
+    **recording.BENCHMARKS,
+    **startup.BENCHMARKS,
+}
+
+try:
+    from . import capture
+except ImportError:  # NumPy is an optional extra
+    pass
+else:
+    BENCHMARKS.update(capture.BENCHMARKS)
+
+
+def _git_revision() -> str | None:
+    """Get the current commit hash, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    """Flatten nested results into dotted metric names."""
+    metrics = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(_flatten(value, f"{name}."))
+        elif isinstance(value, int | float):
+            metrics[name] = value
+    return metrics
+
+
+def compare(results: dict, baseline: dict):
+    """Print the relative change of every metric present in both runs."""
+    current = _flatten(results["results"])
+    previous = _flatten(baseline["results"])
+    print(f"\n{'metric':<70} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(current.keys() & previous.keys()):
+        old, new = previous[name], current[name]
+        change = f"{(new - old) / abs(old) * 100:+.1f}%" if old else "n/a"
+        print(f"{name:<70} {old:>12.2f} {new:>12.2f} {change:>8}")
+
+
+def run(names: list[str], quick: bool) -> dict:
+    """Run the selected benchmarks and collect their results."""
+    results = {}
+    for name in names:
+        print(f"⏱️ {name}...", file=sys.stderr)
+        start = time.perf_counter()
+        # Keep the bot's own console output out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = BENCHMARKS[name](quick=quick)
+        print(f"   done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main():
+    """Entry point for the benchmark runner."""
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="shorter runs for smoke testing")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--output", type=Path, help="write the JSON results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous results file")
+    args = parser.parse_args()
+
+    results = run(args.only or list(BENCHMARKS), args.quick)
+    report = json.dumps(results, indent=2)
+
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+        print(f"📁 Results written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmarks for screen capture and golden cookie detection on synthetic frames."""
+
+import random
+import statistics
+import threading
+import time
+
+from src.calibration import locate_big_cookie
+from src.capture import ScreenCapture
+from src.clicker import AutoClicker
+from src.shimmer import ShimmerDetector, ShimmerWatcher
+from src.simulated import SimulatedBackend
+
+
+FRAME_SIZES = ((1280, 720), (1920, 1080))
+
+# Region of interest around the big cookie (client x, y, width, height)
+COOKIE_REGION = (64, 160, 256, 256)
+
+
+def _measure(capture: ScreenCapture, frames: int, animate=None) -> dict:
+    """Capture a number of frames, optionally changing the window before each one."""
+    start = time.perf_counter_ns()
+    for index in range(frames):
+        if animate:
+            animate(index)
+        capture.capture()
+    elapsed_s = (time.perf_counter_ns() - start) / 1_000_000_000
+    stats = capture.stats()
+    return {
+        "captured_fps": frames / elapsed_s,
+        "published": stats.frames_published,
+        "skipped": stats.frames_skipped,
+        "mb_copied_per_s": stats.bytes_copied / elapsed_s / 1_000_000,
+        "ms_per_frame": elapsed_s * 1000 / frames,
+    }
+
+
+def capture_throughput(quick: bool = False) -> dict:
+    """Frames per second and bytes copied for static, animated and region captures."""
+    frames = 30 if quick else 200
+    results = {}
+    for width, height in FRAME_SIZES:
+        backend = SimulatedBackend()
+        hwnd = backend.create_game_window(width=width, height=height)
+
+        def animate(index, backend=backend, hwnd=hwnd, width=width):
+            """Move a small sprite, like a golden cookie drifting across the screen."""
+            backend.draw_rect(hwnd, (index * 7) % (width - 32), 40, 32, 32, (0, 215, 255, 255))
+
+        size = f"{width}x{height}"
+        results[size] = {
+            "static": _measure(ScreenCapture(hwnd, backend), frames),
+            "animated": _measure(ScreenCapture(hwnd, backend), frames, animate),
+            "region": _measure(ScreenCapture(hwnd, backend, COOKIE_REGION), frames, animate),
+        }
+    return results
+
+
+def shimmer_detection(quick: bool = False) -> dict:
+    """Golden cookies spawned while the clicker runs: hit rate and appear-to-click latency."""
+    spawns = 10 if quick else 40
+    rng = random.Random(7)
+    backend = SimulatedBackend()
+    hwnd = backend.create_game_window()
+    # Distractors: a golden bar (wrong shape) next to the ordinary big cookie
+    backend.draw_rect(hwnd, 500, 680, 400, 12, (60, 210, 250, 255))
+
+    stop_event = threading.Event()
+    clicker = AutoClicker(hwnd, stop_event, backend=backend)
+    watcher = ShimmerWatcher(hwnd, clicker.inject_click, backend)
+    threads = [
+        threading.Thread(target=clicker.run, daemon=True),
+        threading.Thread(target=watcher.run, args=(stop_event,), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    for _ in range(spawns):
+        backend.spawn_shimmer(hwnd, rng.randrange(450, 1200), rng.randrange(60, 620))
+        time.sleep(0.25)
+    time.sleep(0.5)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+
+    window = backend.windows[hwnd]
+    latencies_ms = [latency * 1000 for latency in window.shimmer_latencies] or [0.0]
+    stats = watcher.stats()
+    telemetry = clicker.telemetry.summary()
+    return {
+        "spawned": spawns,
+        "collected": len(window.shimmer_latencies),
+        "missed": len(window.shimmers),
+        "detector_clicks": stats.clicks,
+        "appear_to_click_p50_ms": statistics.median(latencies_ms),
+        "appear_to_click_max_ms": max(latencies_ms),
+        "detect_p50_us": stats.detect_p50_us,
+        "detection_to_click_p50_us": telemetry["injection_p50_us"],
+        "scan_mean_us": stats.scan_mean_us,
+        "main_clicks_cps": clicker.get_stats().achieved_cps,
+    }
+
+
+def detector_throughput(quick: bool = False) -> dict:
+    """Detector cost on a full 1280x720 frame versus only the tiles that changed."""
+    repeats = 20 if quick else 200
+    backend = SimulatedBackend()
+    hwnd = backend.create_game_window()
+    capture = ScreenCapture(hwnd, backend)
+    capture.capture()
+    backend.spawn_shimmer(hwnd, 900, 300)
+    frame = capture.capture()
+    detector = ShimmerDetector()
+
+    results = {}
+    for name, changed in (("full_frame", None), ("changed_tiles", frame.changed)):
+        start = time.perf_counter_ns()
+        for _ in range(repeats):
+            hits = detector.detect(frame.array, changed)
+        results[name] = {
+            "us_per_frame": (time.perf_counter_ns() - start) / repeats / 1000,
+            "hits": len(hits),
+        }
+    return results
+
+
+def calibration(quick: bool = False) -> dict:
+    """Time and accuracy of locating the big cookie in one frame."""
+    repeats = 5 if quick else 50
+    rng = random.Random(13)
+    results = {}
+    for width, height in ((1280, 720), (1920, 1080), (2560, 1440)):
+        backend = SimulatedBackend()
+        hwnd = backend.create_game_window(width=width, height=height)
+        relative_x, relative_y = rng.uniform(0.1, 0.9), rng.uniform(0.2, 0.8)
+        backend.move_big_cookie(hwnd, relative_x, relative_y)
+        backend.spawn_shimmer(hwnd, width // 2, height // 4)  # Something else on screen
+        frame = ScreenCapture(hwnd, backend).capture()
+
+        samples_ms = []
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            location = locate_big_cookie(frame.array)
+            samples_ms.append((time.perf_counter_ns() - start) / 1_000_000)
+        results[f"{width}x{height}"] = {
+            "median_ms": statistics.median(samples_ms),
+            "max_ms": max(samples_ms),
+            "error_px": abs(location.x - width * relative_x)
+            + abs(location.y - height * relative_y),
+            "confidence": location.confidence,
+        }
+    return results
+
+
+BENCHMARKS = {
+    "capture_throughput": capture_throughput,
+    "shimmer_detection": shimmer_detection,
+    "detector_throughput": detector_throughput,
+    "calibration": calibration,
+}
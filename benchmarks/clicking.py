@@ -0,0 +1,473 @@
+"""Benchmarks for click scheduling accuracy, per-click overhead and stop latency."""
+
+import statistics
+import threading
+import time
+
+from src import config
+from src.autotune import Autotuner
+from src.burst import BurstController
+from src.clicker import AutoClicker
+from src.cookies import CookieSampler
+from src.dispatch import DispatchMode
+from src.geometry import GeometryTracker
+from src.macro import MacroClicker, MacroStep, Routine, compile_routine
+from src.process_host import ProcessClicker
+from src.scheduler import CatchUpPolicy
+from src.simulated import SimulatedBackend
+
+
+CPS_TARGETS = (1, 10, 50, 100, 500, 1000)
+
+
+def _run_clicker(
+    backend: SimulatedBackend, hwnd: int, cps: int, duration_s: float, policy: CatchUpPolicy
+) -> AutoClicker:
+    """Run an AutoClicker against a simulated window for a fixed time."""
+    stop_event = threading.Event()
+    clicker = AutoClicker(hwnd, stop_event, policy=policy, backend=backend)
+    clicker.scheduler.set_cps(cps)
+    clicker.telemetry.set_target_cps(cps)
+
+    thread = threading.Thread(target=clicker.run, daemon=True)
+    thread.start()
+    time.sleep(duration_s)
+    stop_event.set()
+    thread.join()
+    return clicker
+
+
+def _accuracy(message_delay_s: float, quick: bool) -> dict:
+    """Measure achieved rate and jitter for every CPS target."""
+    results = {}
+    for cps in CPS_TARGETS:
+        backend = SimulatedBackend()
+        hwnd = backend.create_game_window(message_delay_s=message_delay_s)
+        # Give slow rates enough time for several clicks
+        duration_s = max(1.0 if quick else 3.0, 3 / cps)
+        clicker = _run_clicker(backend, hwnd, cps, duration_s, CatchUpPolicy.SKIP)
+        stats = clicker.get_stats()
+        telemetry = clicker.telemetry.snapshot()
+        results[str(cps)] = {
+            "achieved_cps": stats.achieved_cps,
+            "rate_error_pct": (stats.achieved_cps - cps) / cps * 100,
+            "mean_lateness_us": stats.mean_lateness_us,
+            "jitter_us": stats.jitter_us,
+            "skipped": stats.skipped,
+            "dispatch_p99_us": telemetry.dispatch_p99_us,
+            "interval_jitter_p99_us": telemetry.jitter_p99_us,
+        }
+    return results
+
+
+def scheduler_accuracy(quick: bool = False) -> dict:
+    """Achieved CPS and jitter across targets with an instantly responding window."""
+    return _accuracy(0.0, quick)
+
+
+def scheduler_accuracy_slow_window(quick: bool = False) -> dict:
+    """Achieved CPS and jitter when the window takes 1 ms to handle each message."""
+    return _accuracy(0.001, quick)
+
+
+def click_overhead(quick: bool = False) -> dict:
+    """CPU and wall time spent per click on the bot's side of the dispatch."""
+    backend = SimulatedBackend()
+    hwnd = backend.create_game_window()
+    clicker = AutoClicker(hwnd, threading.Event(), backend=backend)
+    clicks = 20_000 if quick else 200_000
+
+    wall_start = time.perf_counter_ns()
+    cpu_start = time.process_time_ns()
+    send_click = clicker.send_click
+    for _ in range(clicks):
+        send_click()
+    cpu_ns = time.process_time_ns() - cpu_start
+    wall_ns = time.perf_counter_ns() - wall_start
+
+    return {
+        "clicks": clicks,
+        "wall_ns_per_click": wall_ns / clicks,
+        "cpu_ns_per_click": cpu_ns / clicks,
+    }
+
+
+# Cookie, three store buttons and two upgrade slots, like a buying routine
+MACRO_POINTS = ((0.15, 0.39), (0.9, 0.3), (0.9, 0.38), (0.9, 0.46), (0.8, 0.12), (0.84, 0.12))
+
+
+def macro_overhead(quick: bool = False) -> dict:
+    """Bot-side cost of a routine step, recompiling on resize and step timing on the scheduler."""
+    backend = SimulatedBackend()
+    hwnd = backend.create_game_window()
+    routine = Routine("benchmark", tuple(MacroStep(x, y, delay_ms=2.0) for x, y in MACRO_POINTS))
+    clicker = MacroClicker(hwnd, threading.Event(), routine, backend=backend)
+    steps = 20_000 if quick else 200_000
+
+    wall_start = time.perf_counter_ns()
+    cpu_start = time.process_time_ns()
+    send_click = clicker.send_click
+    for _ in range(steps):
+        send_click()
+    cpu_ns = time.process_time_ns() - cpu_start
+    wall_ns = time.perf_counter_ns() - wall_start
+
+    compile_start = time.perf_counter_ns()
+    for _ in range(1000):
+        compile_routine(routine, clicker.geometry)
+    compile_us = (time.perf_counter_ns() - compile_start) / 1000 / 1000
+
+    # Play the routine on the scheduler: 500 steps a second with uneven delays
+    uneven = Routine(
+        "uneven",
+        tuple(
+            MacroStep(x, y, delay_ms=delay)
+            for (x, y), delay in zip(MACRO_POINTS, (1, 1, 2, 1, 4, 3), strict=True)
+        ),
+    )
+    stop_event = threading.Event()
+    player = MacroClicker(hwnd, stop_event, uneven, backend=backend)
+    thread = threading.Thread(target=player.run, daemon=True)
+    thread.start()
+    time.sleep(1.0 if quick else 3.0)
+    stop_event.set()
+    thread.join()
+    stats = player.get_stats()
+    telemetry = player.telemetry.snapshot()
+
+    return {
+        "steps": steps,
+        "wall_ns_per_step": wall_ns / steps,
+        "cpu_ns_per_step": cpu_ns / steps,
+        "compile_us": compile_us,
+        "played": {
+            "target_steps_per_s": uneven.steps_per_second,
+            "achieved_steps_per_s": stats.achieved_cps,
+            "mean_lateness_us": stats.mean_lateness_us,
+            "jitter_us": stats.jitter_us,
+            "skipped": stats.skipped,
+            "interval_jitter_p99_us": telemetry.jitter_p99_us,
+        },
+    }
+
+
+def stop_latency(quick: bool = False) -> dict:
+    """Time from setting the stop event until the click loop has returned."""
+    repeats = 5 if quick else 20
+    latencies_us = []
+    for _ in range(repeats):
+        backend = SimulatedBackend()
+        hwnd = backend.create_game_window()
+        stop_event = threading.Event()
+        clicker = AutoClicker(hwnd, stop_event, backend=backend)
+        clicker.scheduler.set_cps(1)  # Worst case for a sleep-based loop: a 1 s period
+
+        thread = threading.Thread(target=clicker.run, daemon=True)
+        thread.start()
+        time.sleep(0.05)
+        start = time.perf_counter_ns()
+        stop_event.set()
+        thread.join()
+        latencies_us.append((time.perf_counter_ns() - start) / 1000)
+
+    return {
+        "repeats": repeats,
+        "median_us": statistics.median(latencies_us),
+        "max_us": max(latencies_us),
+    }
+
+
+def stalled_window(quick: bool = False) -> dict:
+    """Click-loop behaviour while the game freezes for a while, per dispatch mode."""
+    cps = 100
+    stall_s = 0.5 if quick else 2.0
+    results = {}
+    previous = config.current()
+    try:
+        for mode in DispatchMode:
+            config.update(dispatch_mode=mode.value)
+            backend = SimulatedBackend()
+            hwnd = backend.create_game_window(message_delay_s=0.0005)
+            stop_event = threading.Event()
+            clicker = AutoClicker(hwnd, stop_event, backend=backend)
+            clicker.scheduler.set_cps(cps)
+            clicker.telemetry.set_target_cps(cps)
+
+            thread = threading.Thread(target=clicker.run, daemon=True)
+            thread.start()
+            time.sleep(0.2)
+            backend.stall(hwnd, stall_s)
+            time.sleep(stall_s + 0.5)
+
+            # How long the loop takes to notice a stop request while the game is frozen
+            backend.stall(hwnd, stall_s)
+            time.sleep(0.05)
+            start = time.perf_counter_ns()
+            stop_event.set()
+            thread.join()
+            stop_us = (time.perf_counter_ns() - start) / 1000
+
+            dispatcher = clicker.dispatcher
+            results[mode.value] = {
+                "delivered": dispatcher.delivered,
+                "dropped": dispatcher.dropped,
+                "timeouts": dispatcher.timeouts,
+                "hangs": dispatcher.hangs,
+                "recoveries": dispatcher.recoveries,
+                "max_lateness_us": clicker.get_stats().max_lateness_us,
+                "stop_during_stall_us": stop_us,
+            }
+    finally:
+        config.set_current(previous)
+    return results
+
+
+def _simulated_game() -> SimulatedBackend:
+    """Backend factory for the engine process: one game window with a known handle."""
+    backend = SimulatedBackend()
+    backend.create_game_window()
+    return backend
+
+
+def _busy_interpreter(stop_event: threading.Event):
+    """Hold the GIL with pure-Python work, like a busy GUI thread."""
+    while not stop_event.is_set():
+        sum(i * i for i in range(20_000))
+
+
+def process_isolation(quick: bool = False) -> dict:
+    """Click timing under heavy interpreter load, in-process thread vs. child process."""
+    cps = 200
+    duration_s = 1.5 if quick else 5.0
+    results = {}
+    previous = config.current()
+    config.update(cps=cps)
+    try:
+        for hosting in ("thread", "process"):
+            backend = _simulated_game()
+            hwnd = next(iter(backend.windows))
+            stop_event = threading.Event()
+            if hosting == "thread":
+                clicker = AutoClicker(hwnd, stop_event, backend=backend)
+            else:
+                clicker = ProcessClicker(
+                    hwnd,
+                    stop_event,
+                    geometry_tracker=GeometryTracker(backend),
+                    backend_factory=_simulated_game,
+                )
+
+            load_stop = threading.Event()
+            load = threading.Thread(target=_busy_interpreter, args=(load_stop,), daemon=True)
+            load.start()
+            thread = threading.Thread(target=clicker.run, daemon=True)
+            thread.start()
+            time.sleep(duration_s)
+            stop_event.set()
+            thread.join()
+            load_stop.set()
+            load.join()
+
+            stats = clicker.get_stats()
+            telemetry = clicker.telemetry.snapshot()
+            results[hosting] = {
+                "achieved_cps": stats.achieved_cps,
+                "mean_lateness_us": stats.mean_lateness_us,
+                "max_lateness_us": stats.max_lateness_us,
+                "jitter_us": stats.jitter_us,
+                "interval_jitter_p99_us": telemetry.jitter_p99_us,
+            }
+    finally:
+        config.set_current(previous)
+    return results
+
+
+def _play_game(
+    backend: SimulatedBackend,
+    hwnd: int,
+    stop_event: threading.Event,
+    credited_cps: float,
+    passive_cps: float = 100.0,
+    cookies_per_click: float = 10.0,
+    buffs: tuple[tuple[float, float, float], ...] = (),
+    lumps: tuple[tuple[float, float], ...] = (),
+    banks: list[float] | None = None,
+):
+    """Keep a window's title at the bank of a game that credits at most credited_cps clicks.
+
+    ``buffs`` are (start s, duration s, click multiplier) and ``lumps`` are
+    (at s, cookies) one-off gains, both from the start of the game. ``banks``
+    receives the bank after each buff ends, then the final bank.
+    """
+    window = backend.windows[hwnd]
+    bank, allowance, handled, last = 0.0, 0.0, window.clicks, time.perf_counter()
+    started = last
+    lumps_left = sorted(lumps)
+    buffs_left = sorted(buffs)
+    banks = [] if banks is None else banks
+    while not stop_event.wait(0.01):
+        now = time.perf_counter()
+        clicks, handled = window.clicks - handled, window.clicks
+        # Token bucket: clicks beyond the credited rate are handled but earn nothing
+        allowance = min(allowance + credited_cps * (now - last), credited_cps / 10)
+        credited = min(clicks, int(allowance))
+        allowance -= credited
+        multiplier = 1.0
+        while buffs_left and now - started >= sum(buffs_left[0][:2]):
+            banks.append(bank)
+            buffs_left.pop(0)
+        if buffs_left and now - started >= buffs_left[0][0]:
+            multiplier = buffs_left[0][2]
+        while lumps_left and now - started >= lumps_left[0][0]:
+            bank += lumps_left.pop(0)[1]
+        bank += passive_cps * (now - last) + credited * cookies_per_click * multiplier
+        last = now
+        backend.set_title(hwnd, f"{bank:,.0f} cookies - Cookie Clicker")
+    banks.append(bank)
+
+
+def autotune_convergence(quick: bool = False) -> dict:
+    """Rate the tuner settles at when the game stops crediting clicks, or stops keeping up."""
+    step_s = 2.0 if quick else 4.0
+    steps = 8 if quick else 16
+    scenarios = {
+        # The game credits at most 20 clicks a second: more clicks are wasted
+        "credit_cap_20": {"credited_cps": 20.0, "message_delay_s": 0.0},
+        # Every click costs the game 2 x 10 ms: past 25 CPS dispatch eats half the period
+        "slow_window": {"credited_cps": 1000.0, "message_delay_s": 0.010},
+    }
+    results = {}
+    previous = config.current()
+    try:
+        for name, scenario in scenarios.items():
+            config.update(cps=8)
+            backend = SimulatedBackend()
+            hwnd = backend.create_game_window(message_delay_s=scenario["message_delay_s"])
+            stop_event = threading.Event()
+            clicker = AutoClicker(hwnd, stop_event, backend=backend)
+            sampler = CookieSampler(hwnd, backend, clicks=lambda c=clicker: c.telemetry.clicks)
+            tuner = Autotuner(clicker, sampler, step_s=step_s)
+
+            threads = [
+                threading.Thread(target=clicker.run, daemon=True),
+                threading.Thread(target=sampler.run, args=(stop_event, 50.0), daemon=True),
+                threading.Thread(
+                    target=_play_game,
+                    args=(backend, hwnd, stop_event, scenario["credited_cps"]),
+                    daemon=True,
+                ),
+                threading.Thread(target=tuner.run, args=(stop_event,), daemon=True),
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(steps * step_s + step_s / 2)
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+            settled_at = next(
+                (step.at_s for step in tuner.trace if step.action in ("settle", "back_off")), None
+            )
+            results[name] = {
+                "final_cps": tuner.cps,
+                "settled": tuner.settled,
+                "settle_time_s": settled_at,
+                "steps": len(tuner.trace),
+                "trace_cps": [step.cps for step in tuner.trace],
+            }
+    finally:
+        config.set_current(previous)
+    return results
+
+
+def burst_mode(quick: bool = False) -> dict:
+    """Detection latency and cookies earned by bursting through click buffs, against not bursting.
+
+    The game has a Lucky-style lump of cookies (which must not start a burst),
+    then a click buff for the expected length, then a shorter one that the burst
+    must end early for. Each run is played with and without the controller.
+    """
+    base_cps, burst_cps = 10, 50
+    scale = 0.5 if quick else 1.0
+    buffs = ((8 * scale, 13 * scale, 777.0), (30 * scale, 10 * scale, 1111.0))
+    lumps = ((4 * scale, 1e6),)
+    duration_s = 45 * scale
+    results = {}
+    previous = config.current()
+    try:
+        for bursting in (False, True):
+            config.set_current(previous.replace(cps=base_cps, burst_cps=burst_cps))
+            backend = SimulatedBackend()
+            hwnd = backend.create_game_window()
+            stop_event = threading.Event()
+            clicker = AutoClicker(hwnd, stop_event, backend=backend)
+            sampler = CookieSampler(hwnd, backend, clicks=lambda c=clicker: c.telemetry.clicks)
+            controller = BurstController(clicker, sampler, duration_s=13 * scale)
+            banks: list[float] = []
+            threads = [
+                threading.Thread(target=clicker.run, daemon=True),
+                threading.Thread(
+                    target=sampler.run, args=(stop_event, config.BURST_SAMPLE_RATE), daemon=True
+                ),
+                threading.Thread(
+                    target=_play_game,
+                    args=(backend, hwnd, stop_event, 1000.0),
+                    kwargs={"buffs": buffs, "lumps": lumps, "banks": banks},
+                    daemon=True,
+                ),
+            ]
+            if bursting:
+                threads.append(
+                    threading.Thread(target=controller.run, args=(stop_event,), daemon=True)
+                )
+            started_ns = time.perf_counter_ns()
+            for thread in threads:
+                thread.start()
+            time.sleep(duration_s)
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+            name = "burst" if bursting else "fixed"
+            results[name] = {"banks": banks, "clicks": clicker.telemetry.clicks}
+            if bursting:
+                starts = [e for e in controller.trace if e.action == "start"]
+                ends = [e for e in controller.trace if e.action == "end"]
+                offset_s = (controller.started_ns - started_ns) / 1e9
+                results[name].update(
+                    {
+                        "bursts": len(ends),
+                        # From the buff beginning in the game, not from the title update before it
+                        "true_latency_s": [
+                            start.at_s + offset_s - buff[0]
+                            for start, buff in zip(starts, buffs, strict=False)
+                        ],
+                        "reported_latency_s": [start.latency_s for start in starts],
+                        "burst_s": [end.duration_s for end in ends],
+                        "buff_s": [buff[1] for buff in buffs],
+                        "extra_clicks": [end.extra_clicks for end in ends],
+                        "estimated_extra_cookies": [end.extra_cookies for end in ends],
+                    }
+                )
+        fixed, burst = results["fixed"]["banks"], results["burst"]["banks"]
+        results["burst"]["actual_extra_cookies"] = [
+            (b - (burst[i - 1] if i else 0)) - (f - (fixed[i - 1] if i else 0))
+            for i, (f, b) in enumerate(zip(fixed, burst, strict=False))
+        ][: len(buffs)]
+        results["gain_pct"] = (burst[-1] - fixed[-1]) / fixed[-1] * 100 if fixed else 0.0
+    finally:
+        config.set_current(previous)
+    return results
+
+
+BENCHMARKS = {
+    "scheduler_accuracy": scheduler_accuracy,
+    "scheduler_accuracy_slow_window": scheduler_accuracy_slow_window,
+    "click_overhead": click_overhead,
+    "macro_overhead": macro_overhead,
+    "stop_latency": stop_latency,
+    "stalled_window": stalled_window,
+    "process_isolation": process_isolation,
+    "autotune_convergence": autotune_convergence,
+    "burst_mode": burst_mode,
+}
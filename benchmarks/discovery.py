@@ -0,0 +1,100 @@
+"""Benchmarks for game window discovery on crowded desktops."""
+
+import statistics
+import time
+
+from src.cookies import CookieSampler, parse_cookie_count
+from src.simulated import SimulatedBackend
+from src.window_finder import CookieClickerWindowFinder, WindowRegistry
+
+
+WINDOW_COUNTS = (100, 1000, 5000)
+
+# Titles in every format the game writes
+TITLES = (
+    "245 cookies - Cookie Clicker",
+    "1,234,567 cookies - Cookie Clicker",
+    "72.197 million cookies - Cookie Clicker",
+    "[G] 3.2 quindecillion cookies - Cookie Clicker",
+    "1.5 SxD cookies - Cookie Clicker",
+)
+
+
+def _median_us(function, repeats: int) -> float:
+    """Median wall time of a call in microseconds."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        samples.append((time.perf_counter_ns() - start) / 1000)
+    return statistics.median(samples)
+
+
+def window_discovery(quick: bool = False) -> dict:
+    """Full scan vs. cached registry lookup vs. re-attach after a game restart."""
+    repeats = 5 if quick else 25
+    results = {}
+    for count in WINDOW_COUNTS:
+        backend = SimulatedBackend(seed=count)
+        backend.add_noise_windows(count)
+        game = backend.create_game_window()
+
+        finder = CookieClickerWindowFinder(backend)
+        registry = WindowRegistry(backend)
+        registry.start()
+        registry.find_window()
+
+        # Restart the game: the registry must pick up the new window from events
+        reattach_samples = []
+        for _ in range(repeats):
+            backend.destroy_window(game)
+            start = time.perf_counter_ns()
+            game = backend.create_game_window()
+            found = registry.find_window()
+            reattach_samples.append((time.perf_counter_ns() - start) / 1000)
+            if found != game:
+                raise RuntimeError("Registry did not re-attach to the restarted game window")
+
+        # Churn unrelated windows and check the registry still answers from cache
+        backend.churn(min(count, 100))
+
+        results[str(count)] = {
+            "full_scan_us": _median_us(finder.find_windows, repeats),
+            "cached_lookup_us": _median_us(registry.find_window, repeats),
+            "reattach_us": statistics.median(reattach_samples),
+        }
+        registry.stop()
+    return results
+
+
+def cookie_sampling(quick: bool = False) -> dict:
+    """Cost of parsing a title and of one sample with a changing and an unchanged title."""
+    repeats = 1_000 if quick else 20_000
+    backend = SimulatedBackend()
+    game = backend.create_game_window()
+    sampler = CookieSampler(game, backend, clicks=lambda: 0)
+
+    def sample_changed():
+        backend.windows[game].title = TITLES[sampler.samples % len(TITLES)]
+        sampler.sample()
+
+    results = {}
+    for name, function in (
+        ("parse", lambda: [parse_cookie_count(title) for title in TITLES]),
+        ("sample_changed", sample_changed),
+        ("sample_unchanged", sampler.sample),
+    ):
+        start = time.perf_counter_ns()
+        for _ in range(repeats):
+            function()
+        calls = repeats * (len(TITLES) if name == "parse" else 1)
+        results[f"{name}_us"] = (time.perf_counter_ns() - start) / calls / 1000
+    if sampler.unreadable:
+        raise RuntimeError("Sampler could not read a cookie count from the window title")
+    return results
+
+
+BENCHMARKS = {
+    "window_discovery": window_discovery,
+    "cookie_sampling": cookie_sampling,
+}
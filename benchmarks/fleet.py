@@ -0,0 +1,190 @@
+"""End-to-end benchmark of a controller driving several agent processes on simulated games."""
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.config import Settings
+from src.profiles import ProfileStore
+from src.remote import Controller
+
+
+ROOT = Path(__file__).parent.parent
+
+# Rates pushed to the fleet: first by a settings change, then by a profile switch
+CONFIGURED_CPS = 40
+PROFILE_CPS = 60
+
+
+def _free_ports(count: int) -> list[int]:
+    """Ports nothing listens on right now."""
+    sockets = [socket.socket() for _ in range(count)]
+    for sock in sockets:
+        sock.bind(("127.0.0.1", 0))
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def _spawn_agent(port: int, home: str) -> subprocess.Popen:
+    """Start a paused headless agent clicking its own simulated game window."""
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "main.py",
+            "--headless",
+            "--simulated",
+            "--no-hotkeys",
+            "--paused",
+            "--listen",
+            str(port),
+            "--log-level",
+            "ERROR",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Session summaries and profiles live in a throwaway home, not the user's data
+        env={**os.environ, "HOME": home, "USERPROFILE": home},
+    )
+
+
+def _round_trip_ms(send, repeats: int) -> float:
+    """Median time of a request/reply exchange."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        send()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def _clicks(controller: Controller) -> dict[str, int]:
+    """Clicks of the current session reported by every agent."""
+    return {
+        name: status["telemetry"]["clicks"] if status.get("telemetry") else 0
+        for name, status in controller.status().items()
+    }
+
+
+def _rates(controller: Controller, duration_s: float) -> list[float]:
+    """Clicks per second of every agent over the next ``duration_s``."""
+    before = _clicks(controller)
+    start = time.perf_counter()
+    time.sleep(duration_s)
+    after = _clicks(controller)
+    elapsed = time.perf_counter() - start
+    return [(after.get(name, 0) - clicks) / elapsed for name, clicks in before.items()]
+
+
+def _failed(replies: dict[str, dict], commands: list[dict]) -> list[str]:
+    """Describe every agent error and every command an agent did not carry out."""
+    failures = []
+    for name, reply in sorted(replies.items()):
+        if "error" in reply:
+            failures.append(f"{name}: {reply['error']}")
+            continue
+        for command, result in zip(commands, reply["results"], strict=True):
+            if not result["ok"]:
+                failures.append(f"{name}: {command['op']}: {result['error']}")
+    return failures
+
+
+def _broadcast(controller: Controller, commands: list[dict], failures: list[str]) -> dict:
+    """Send one batch to every agent, noting what failed."""
+    replies = controller.broadcast(commands)
+    failures.extend(_failed(replies, commands))
+    return replies
+
+
+def fleet_control(quick: bool = False) -> dict:
+    """Connect, configure, start, switch profile and stop a fleet of agents, timing each step.
+
+    Raises RuntimeError if an agent is unreachable, a command fails or an agent
+    does not exit cleanly after ``shutdown``.
+    """
+    agents = 3 if quick else 8
+    repeats = 20 if quick else 100
+    settle_s = 1.0 if quick else 3.0
+    with tempfile.TemporaryDirectory() as home:
+        profiles_file = Path(home) / ".cookie-clicker-bot" / "profiles.json"
+        ProfileStore(profiles_file).put("fast", Settings(cps=PROFILE_CPS, show_overlay=False))
+
+        ports = _free_ports(agents)
+        start = time.perf_counter()
+        processes = [_spawn_agent(port, home) for port in ports]
+        controller = Controller([("127.0.0.1", port) for port in ports])
+        failures = []
+        try:
+            unreachable = controller.connect(wait_s=30)
+            failures.extend(f"{name}: not reachable" for name in unreachable)
+            ready_ms = (time.perf_counter() - start) * 1000
+
+            replies = _broadcast(
+                controller,
+                [{"op": "configure", "changes": {"cps": CONFIGURED_CPS}}, {"op": "start"}],
+                failures,
+            )
+            started = sum(
+                all(result["ok"] for result in reply.get("results", [{"ok": False}]))
+                for reply in replies.values()
+            )
+            configured_rates = _rates(controller, settle_s)
+
+            # One batch to every agent against one exchange per agent, in turn
+            broadcast_ms = _round_trip_ms(lambda: controller.broadcast([{"op": "status"}]), repeats)
+            singles = [Controller([address]) for address in controller.addresses]
+            for single in singles:
+                single.connect()
+            sequential_ms = _round_trip_ms(
+                lambda: [single.broadcast([{"op": "status"}]) for single in singles], repeats
+            )
+            for single in singles:
+                single.close()
+
+            _broadcast(controller, [{"op": "profile", "name": "fast"}], failures)
+            profile_rates = _rates(controller, settle_s)
+
+            _broadcast(controller, [{"op": "stop"}, {"op": "shutdown"}], failures)
+        finally:
+            controller.close()
+            exit_codes = []
+            for process in processes:
+                try:
+                    exit_codes.append(process.wait(timeout=10))
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    exit_codes.append(None)
+
+    failures.extend(
+        f"agent on port {port}: exit code {code}"
+        for port, code in zip(ports, exit_codes, strict=True)
+        if code != 0
+    )
+    if failures:
+        raise RuntimeError("Fleet control failed: " + "; ".join(failures))
+
+    return {
+        "agents": agents,
+        "unreachable": len(unreachable),
+        "ready_ms": ready_ms,
+        "started": started,
+        "broadcast_ms": broadcast_ms,
+        "sequential_ms": sequential_ms,
+        "configured_cps_min": min(configured_rates, default=0.0),
+        "configured_cps_max": max(configured_rates, default=0.0),
+        "profile_cps_min": min(profile_rates, default=0.0),
+        "profile_cps_max": max(profile_rates, default=0.0),
+        "clean_exits": exit_codes.count(0),
+    }
+
+
+BENCHMARKS = {
+    "fleet_control": fleet_control,
+}
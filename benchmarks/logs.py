@@ -0,0 +1,49 @@
+"""Benchmarks for the cost of logging over long sessions."""
+
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src import logs
+
+
+SESSION_LENGTHS = (1_000, 10_000, 100_000)
+
+
+def log_overhead(quick: bool = False) -> dict:
+    """Per-record cost on the caller's thread and per-batch drain cost, by session length."""
+    logger = logging.getLogger(f"{logs.LOGGER_NAME}.benchmark")
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for length in SESSION_LENGTHS[:2] if quick else SESSION_LENGTHS:
+            ring = logs.setup(level="INFO", file_level="DEBUG", path=Path(directory) / "bot.jsonl")
+            drain_ns = 0
+            drains = 0
+            start = time.perf_counter_ns()
+            for index in range(length):
+                logger.info("🖱️ Click %d", index, extra={"data": {"index": index}})
+                # Drain like the GUI timer would, about every hundred records
+                if index % 100 == 99:
+                    drain_start = time.perf_counter_ns()
+                    ring.drain()
+                    drain_ns += time.perf_counter_ns() - drain_start
+                    drains += 1
+            elapsed_ns = time.perf_counter_ns() - start - drain_ns
+            dropped = logs.dropped()
+            flush_start = time.perf_counter_ns()
+            logs.shutdown()
+            results[str(length)] = {
+                "record_us": elapsed_ns / length / 1000,
+                "drain_us": drain_ns / max(drains, 1) / 1000,
+                "ring_records": len(ring.records),
+                "dropped": dropped,
+                "file_flush_ms": (time.perf_counter_ns() - flush_start) / 1_000_000,
+            }
+    logs.setup(path=None)  # Leave logging as a benchmark run found it: no file
+    return results
+
+
+BENCHMARKS = {
+    "log_overhead": log_overhead,
+}
@@ -0,0 +1,152 @@
+"""Benchmarks for the metrics endpoint: scrape cost and its effect on the click path."""
+
+import re
+import statistics
+import threading
+import time
+import urllib.request
+
+from src.clicker import AutoClicker
+from src.metrics import MetricsRegistry, MetricsServer
+from src.simulated import SimulatedBackend
+from src.window_finder import WindowRegistry
+
+
+# Clickers exported at once, as in a process driving many game windows
+CLICKERS = 20
+
+# One sample line of the text exposition format: name, optional labels, value
+LABEL = r'([a-zA-Z_][a-zA-Z0-9_]*)="([^"]*)"'
+SAMPLE_LINE = re.compile(rf"([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{{({LABEL}(?:,{LABEL})*)\}})? (\S+)")
+
+
+def _scrape(url: str) -> str:
+    """Fetch the metrics page the way Prometheus would."""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def _parse(text: str) -> dict[tuple[str, frozenset], float]:
+    """Read a scraped page into {(name, labels): value}; raises RuntimeError if malformed."""
+    samples = {}
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line or line.startswith(("# HELP ", "# TYPE ")):
+            continue
+        match = SAMPLE_LINE.fullmatch(line)
+        if not match:
+            raise RuntimeError(f"Line {number} of the metrics page is malformed: {line!r}")
+        labels = re.findall(LABEL, match[2] or "")
+        try:
+            value = float(match[match.lastindex])
+        except ValueError:
+            raise RuntimeError(
+                f"Line {number} of the metrics page has no value: {line!r}"
+            ) from None
+        key = (match[1], frozenset(labels))
+        if key in samples:
+            raise RuntimeError(f"Line {number} of the metrics page repeats a series: {line!r}")
+        samples[key] = value
+    return samples
+
+
+def _check_counters(samples: dict, registry: MetricsRegistry, windows: WindowRegistry):
+    """Raise RuntimeError unless the scraped counters equal what the clickers recorded."""
+    mismatches = []
+    for label, clicker in registry.clickers():
+        labels = frozenset({("clicker", label), ("hwnd", f"0x{clicker.hwnd:x}")})
+        expected = {
+            "cookie_bot_clicks_total": clicker.telemetry.clicks,
+            "cookie_bot_injected_clicks_total": clicker.telemetry.injection.total,
+            "cookie_bot_dispatch_latency_seconds_count": clicker.telemetry.dispatch.total,
+            "cookie_bot_stalls_total": clicker.dispatcher.hangs,
+        }
+        for name, value in expected.items():
+            if samples.get((name, labels)) != value:
+                mismatches.append(
+                    f"{name} of clicker {label}: {samples.get((name, labels))} != {value}"
+                )
+    rediscoveries = samples.get(("cookie_bot_window_rediscoveries_total", frozenset()))
+    if rediscoveries != windows.rediscoveries:
+        mismatches.append(f"rediscoveries: {rediscoveries} != {windows.rediscoveries}")
+    if mismatches:
+        raise RuntimeError("Scraped metrics differ from telemetry: " + "; ".join(mismatches))
+
+
+def metrics_export(quick: bool = False) -> dict:
+    """Scrape time for a fleet of clickers, click cost while scraped, and scraped accuracy.
+
+    Raises RuntimeError if the page cannot be parsed or its counters differ from
+    the clickers' telemetry.
+    """
+    clicks = 20_000 if quick else 200_000
+    scrapes = 20 if quick else 100
+    backend = SimulatedBackend()
+    registry = MetricsRegistry()
+    clickers = []
+    for _ in range(CLICKERS):
+        clicker = AutoClicker(backend.create_game_window(), threading.Event(), backend=backend)
+        registry.add_clicker(clicker)
+        clickers.append(clicker)
+    windows = WindowRegistry(backend)
+    registry.add_registry(windows)
+
+    server = MetricsServer(0, registry=registry)
+    server.start()
+    try:
+        send_click = clickers[0].send_click
+        start = time.perf_counter_ns()
+        for _ in range(clicks):
+            send_click()
+        idle_ns = (time.perf_counter_ns() - start) / clicks
+
+        # The same clicks while a client scrapes as fast as the server answers
+        stop = threading.Event()
+        scrape_ms = []
+
+        def scrape_loop():
+            """Scrape until stopped, timing each request."""
+            while not stop.is_set():
+                begin = time.perf_counter()
+                _scrape(server.url)
+                scrape_ms.append((time.perf_counter() - begin) * 1000)
+
+        scraper = threading.Thread(target=scrape_loop, daemon=True)
+        scraper.start()
+        while len(scrape_ms) < 1:
+            time.sleep(0.001)
+        start = time.perf_counter_ns()
+        for _ in range(clicks):
+            send_click()
+        scraped_ns = (time.perf_counter_ns() - start) / clicks
+        stop.set()
+        scraper.join()
+
+        # Lose the game window and find a new one, then check what a scrape reports
+        hwnd = windows.find_window()
+        backend.destroy_window(hwnd)
+        windows.find_window()
+        page_ms = []
+        for _ in range(scrapes):
+            begin = time.perf_counter()
+            text = _scrape(server.url)
+            page_ms.append((time.perf_counter() - begin) * 1000)
+    finally:
+        server.stop()
+    samples = _parse(text)
+    _check_counters(samples, registry, windows)
+
+    return {
+        "clickers": CLICKERS,
+        "click_ns": idle_ns,
+        "click_while_scraped_ns": scraped_ns,
+        "scrape_median_ms": statistics.median(page_ms),
+        "scrape_under_load_median_ms": statistics.median(scrape_ms),
+        "page_bytes": len(text.encode("utf-8")),
+        "samples": len(samples),
+        "rediscoveries": windows.rediscoveries,
+    }
+
+
+BENCHMARKS = {
+    "metrics_export": metrics_export,
+}
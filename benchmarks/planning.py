@@ -0,0 +1,84 @@
+"""Benchmarks for the save parser and the purchase optimizer."""
+
+import time
+
+from src.optimizer import BUILDING, TIER_PRICES, TIER_UNLOCKS, PurchaseOptimizer, Strategy
+from src.savegame import BUILDINGS, encode_save, parse_save
+
+
+# Simulated play time the strategies are compared over (a day of idling)
+COMPARE_S = 86_400.0
+
+
+def _sample_save() -> str:
+    """Export text of a mid-game save: a few of every early building, 40 cookies/s of clicking."""
+    buildings = ";".join(
+        f"{max(0, 60 - index * 6)},{max(0, 60 - index * 6)},0,0,0,0,{max(0, 60 - index * 6)}"
+        for index in range(len(BUILDINGS))
+    )
+    game = ";".join(["1e6", "5e7", "20000", "12", "3e5"] + ["0"] * 40)
+    return encode_save(
+        f"2.052||1700000000000;1700000000000;1700090000000;Bench|;|{game}|{buildings}|"
+    )
+
+
+def _naive_best(optimizer: PurchaseOptimizer) -> tuple[int, int, float]:
+    """Re-score every candidate, as a planner without incremental updates would."""
+    key, best = optimizer.key, None
+    for building, (_, base_price, _) in enumerate(BUILDINGS):
+        candidates = [
+            (BUILDING, optimizer.building_price(building), optimizer.unit_output(building))
+        ]
+        candidates += [
+            (tier, base_price * TIER_PRICES[tier], optimizer.output(building))
+            for tier, unlock in enumerate(TIER_UNLOCKS)
+            if unlock <= optimizer.amounts[building] and not optimizer.tiers[building] >> tier & 1
+        ]
+        for tier, cost, gain in candidates:
+            if gain > 0 and (best is None or key(cost, gain) < best[0]):
+                best = (key(cost, gain), building, tier, cost)
+    return best[1:]
+
+
+def purchase_planning(quick: bool = False) -> dict:
+    """Save parse time, purchases planned per second, and where each strategy ends up."""
+    purchases = 2_000 if quick else 20_000
+    save = _sample_save()
+    start = time.perf_counter()
+    state = parse_save(save)
+    results = {"parse_us": (time.perf_counter() - start) * 1e6}
+
+    for strategy in Strategy:
+        optimizer = PurchaseOptimizer.from_state(state, click_income=40, strategy=strategy)
+        start = time.perf_counter()
+        plan = optimizer.plan(purchases=purchases)
+        elapsed = time.perf_counter() - start
+        results[strategy.value] = {
+            "purchases_per_s": len(plan) / elapsed,
+            "entries_per_purchase": optimizer.rescored / max(1, optimizer.purchases),
+        }
+        optimizer = PurchaseOptimizer.from_state(state, click_income=40, strategy=strategy)
+        optimizer.plan(duration_s=COMPARE_S)
+        results[strategy.value]["cps_after_day"] = optimizer.cps
+
+    # Picking each purchase by re-scoring every candidate instead of from the heap
+    optimizer = PurchaseOptimizer.from_state(state, click_income=40)
+    naive_s = incremental_s = 0.0
+    agreed = 0
+    for _ in range(purchases // 10):
+        start = time.perf_counter()
+        naive = _naive_best(optimizer)
+        naive_s += time.perf_counter() - start
+        start = time.perf_counter()
+        agreed += naive == optimizer.best()
+        optimizer.buy_next()
+        incremental_s += time.perf_counter() - start
+    results["naive_pick_us"] = naive_s / (purchases // 10) * 1e6
+    results["incremental_purchase_us"] = incremental_s / (purchases // 10) * 1e6
+    results["naive_agreement"] = agreed / (purchases // 10)
+    return results
+
+
+BENCHMARKS = {
+    "purchase_planning": purchase_planning,
+}
@@ -0,0 +1,99 @@
+"""Benchmarks for the sampling profiler: its cost to the click path and what it attributes."""
+
+import threading
+import time
+
+from src.clicker import AutoClicker
+from src.sampling import SamplingProfiler
+from src.simulated import SimulatedBackend
+
+
+# Sampling intervals compared, in milliseconds (None: no profiler)
+INTERVALS_MS = (None, 10, 1, None)
+
+# Synthetic workload: this share of each period is Python busy work, the rest a sleep
+BUSY_SHARE = 0.3
+PERIOD_S = 0.010
+
+
+def _spin(duration_s: float):
+    """Run Python code for a while, as a slow callback would."""
+    end = time.perf_counter() + duration_s
+    while time.perf_counter() < end:
+        pass
+
+
+def _workload(stop_event: threading.Event, busy: list[float]):
+    """Alternate busy work and sleeping until stopped, adding up the time spent busy."""
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        _spin(PERIOD_S * BUSY_SHARE)
+        busy[0] += time.perf_counter() - start
+        time.sleep(PERIOD_S * (1 - BUSY_SHARE))
+
+
+def sampling_overhead(quick: bool = False) -> dict:
+    """Per-click cost under each sampling interval, and the share found in a known workload."""
+    clicks = 50_000 if quick else 500_000
+    backend = SimulatedBackend()
+    clicker = AutoClicker(backend.create_game_window(), threading.Event(), backend=backend)
+    send_click = clicker.send_click
+    results = {}
+    for interval_ms in INTERVALS_MS:
+        profiler = None
+        if interval_ms is not None:
+            profiler = SamplingProfiler(interval_ms)
+            profiler.add_thread("clicker")
+            profiler.start()
+        start = time.perf_counter_ns()
+        for _ in range(clicks):
+            send_click()
+        click_ns = (time.perf_counter_ns() - start) / clicks
+        if profiler is None:
+            # Measured first and last, so drift over the run shows
+            results["click_ns" if "click_ns" not in results else "click_ns_after"] = click_ns
+            continue
+        profiler.stop()
+        send_click_pct = sum(
+            spot.total_pct
+            for spot in profiler.hot_spots("clicker", limit=50)
+            if spot.function.endswith("send_click")
+        )
+        results[f"{interval_ms}ms"] = {
+            "click_ns": click_ns,
+            "added_pct": (click_ns - results["click_ns"]) / results["click_ns"] * 100,
+            "sample_us": profiler.sample_cost_us,
+            "samples": profiler.samples,
+            "send_click_total_pct": send_click_pct,
+        }
+
+    # A thread busy about 30% of the time in one function: the profiler should find that share
+    stop_event = threading.Event()
+    busy = [0.0]
+    profiler = SamplingProfiler()
+    worker = threading.Thread(target=_workload, args=(stop_event, busy), daemon=True)
+    start = time.perf_counter()
+    worker.start()
+    profiler.add_thread("worker", worker)
+    profiler.start()
+    time.sleep(1.0 if quick else 5.0)
+    profiler.stop()
+    stop_event.set()
+    worker.join()
+    elapsed = time.perf_counter() - start
+    spin = next(
+        (
+            spot
+            for spot in profiler.hot_spots("worker", limit=50)
+            if spot.function.endswith("_spin")
+        ),
+        None,
+    )
+    results["busy_actual_pct"] = busy[0] / elapsed * 100
+    results["busy_found_pct"] = spin.total_pct if spin else 0.0
+    return results
+
+
+BENCHMARKS = {
+    "sampling_overhead": sampling_overhead,
+}
@@ -0,0 +1,105 @@
+"""Benchmarks for the session recorder's click-path cost and offline analysis speed."""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.clicker import AutoClicker
+from src.recorder import SessionRecorder
+from src.simulated import SimulatedBackend
+
+
+try:
+    from src import analyzer
+except ImportError:  # NumPy is an optional extra
+    analyzer = None
+
+
+# Session lengths analyzed, in clicks (the longest is about 55 hours at 15 CPS)
+SESSION_CLICKS = (100_000, 1_000_000, 3_000_000)
+
+
+def record_overhead(quick: bool = False) -> dict:
+    """Per-record cost on its own and per-click cost added to the clicker."""
+    clicks = 50_000 if quick else 500_000
+    backend = SimulatedBackend()
+    hwnd = backend.create_game_window()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = SessionRecorder(Path(directory) / "raw.ccrec")
+        record = recorder.record
+        start = time.perf_counter_ns()
+        for index in range(clicks):
+            record(index, hwnd, 0x00100010, 20_000, True)
+        results["record_ns"] = (time.perf_counter_ns() - start) / clicks
+        recorder.close()
+
+        for name, recorder in (
+            ("click_ns", None),
+            ("recorded_click_ns", SessionRecorder(Path(directory) / "clicks.ccrec")),
+        ):
+            clicker = AutoClicker(hwnd, threading.Event(), backend=backend, recorder=recorder)
+            send_click = clicker.send_click
+            start = time.perf_counter_ns()
+            for _ in range(clicks):
+                send_click()
+            results[name] = (time.perf_counter_ns() - start) / clicks
+            if recorder is not None:
+                recorder.close()
+                results["bytes_per_click"] = recorder.path.stat().st_size / clicks
+    results["added_ns"] = results["recorded_click_ns"] - results["click_ns"]
+    return results
+
+
+def _write_session(path: Path, clicks: int):
+    """Record a synthetic 15 CPS session with a hang every 100k clicks and a pause every 250k."""
+    recorder = SessionRecorder(path)
+    record = recorder.record
+    period_ns = 1_000_000_000 // 15
+    at_ns = 0
+    for index in range(clicks):
+        at_ns += period_ns + (index * 7919) % 2_000_000  # Up to 2 ms of jitter
+        if index % 250_000 == 249_999:
+            at_ns += 30_000_000_000  # The user paused for 30 s
+        delivered = index % 100_000 >= 45  # 45 failed clicks in a row: a 3 s hang
+        record(at_ns, 0x10000, 0x00100010, 20_000 + index % 5000, delivered)
+    recorder.close()
+
+
+def session_analysis(quick: bool = False) -> dict:
+    """Time to load and analyze recorded sessions of growing length."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for clicks in SESSION_CLICKS[:2] if quick else SESSION_CLICKS:
+            path = Path(directory) / f"{clicks}.ccrec"
+            start = time.perf_counter()
+            _write_session(path, clicks)
+            write_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            session = analyzer.load_session(path)
+            load_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            report = analyzer.analyze(session)
+            analyze_s = time.perf_counter() - start
+            del session  # Release the memory map before the directory is removed
+
+            results[str(clicks)] = {
+                "write_s": write_s,
+                "load_ms": load_ms,
+                "analyze_s": analyze_s,
+                "achieved_cps": report.achieved_cps,
+                "gaps": report.gaps,
+                "stalls": report.stalls,
+                "longest_stall_s": report.longest_stall_s,
+            }
+    return results
+
+
+BENCHMARKS = {
+    "record_overhead": record_overhead,
+}
+
+if analyzer is not None:
+    BENCHMARKS["session_analysis"] = session_analysis
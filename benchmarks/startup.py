@@ -0,0 +1,110 @@
+"""Benchmarks for startup time and memory of the headless runner against the GUI."""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent.parent
+
+# Run in a fresh interpreter: import one entry module, then report the import time,
+# the peak resident memory and whether tkinter was loaded
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+import_ms = (time.perf_counter() - start) * 1000
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class Counters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t)
+            for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                         "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                         "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+        ]
+
+    counters = Counters(cb=ctypes.sizeof(Counters))
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+    peak_mb = counters.PeakWorkingSetSize / 2**20
+else:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+print(json.dumps({"import_ms": import_ms, "peak_rss_mb": peak_mb,
+                  "tkinter": "tkinter" in sys.modules}))
+"""
+
+# Entry modules compared; each is the first thing its launch path imports
+ENTRIES = {"headless": "src.cli", "gui": "src.gui"}
+
+
+def _launch(module: str) -> dict | None:
+    """Start a fresh interpreter importing a module; None if the module cannot load here."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, module], cwd=ROOT, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        return None  # For example customtkinter or a display missing on a CI runner
+    return {"wall_ms": wall_ms, **json.loads(result.stdout)}
+
+
+def _headless_session_ms(home: str) -> float:
+    """Wall time of a whole headless session: start, find the window, click once, stop."""
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "main.py",
+            "--headless",
+            "--simulated",
+            "--no-hotkeys",
+            "--duration",
+            "0",
+            "--log-level",
+            "ERROR",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        # Session summaries and logs go to a throwaway home, not the user's data
+        env={**os.environ, "HOME": home, "USERPROFILE": home},
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def startup_footprint(quick: bool = False) -> dict:
+    """Median launch time and peak resident memory of each entry point, in fresh processes."""
+    repeats = 3 if quick else 10
+    results = {}
+    for name, module in ENTRIES.items():
+        runs = [_launch(module) for _ in range(repeats)]
+        if any(run is None for run in runs):
+            results[name] = None
+            continue
+        results[name] = {
+            "wall_ms": statistics.median(run["wall_ms"] for run in runs),
+            "import_ms": statistics.median(run["import_ms"] for run in runs),
+            "peak_rss_mb": statistics.median(run["peak_rss_mb"] for run in runs),
+            "loads_tkinter": runs[0]["tkinter"],
+        }
+    with tempfile.TemporaryDirectory() as home:
+        results["headless_session_ms"] = statistics.median(
+            _headless_session_ms(home) for _ in range(repeats)
+        )
+    return results
+
+
+BENCHMARKS = {
+    "startup_footprint": startup_footprint,
+}
@@ -1,5 +1,6 @@
-"""Entry point for the GUI application."""
+"""Entry point for the GUI application (or the headless runner with ``--headless``)."""
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -8,10 +9,18 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-# Import after path setup (required for PyInstaller)
-from src.gui import AutoClickerGUI  # noqa: E402
-
 
 if __name__ == "__main__":
+    # The click engine may run in a child process; needed for the frozen executable
+    multiprocessing.freeze_support()
+    if "--headless" in sys.argv[1:]:
+        # Imported only here, so the headless runner never loads tkinter
+        from src.cli import main
+
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
+    # Import after path setup (required for PyInstaller)
+    from src.gui import AutoClickerGUI
+
     app = AutoClickerGUI()
     app.run()
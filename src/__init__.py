@@ -1 +1,6 @@
 """Cookie Clicker Bot - Professional autoclicker with GUI."""
+
+# Kept in step with pyproject.toml by the release pipeline, so the app never parses it at runtime
+__version__ = "1.1.0"
+__author__ = "JoShMiQueL"
+__license__ = "MIT"
@@ -0,0 +1,213 @@
+"""Module for analyzing recorded click sessions offline.
+
+Loads a ``.ccrec`` file written by ``SessionRecorder`` as a NumPy structured
+array (memory-mapped, not copied) and reports the achieved rate, interval
+jitter, gaps in clicking and stalls of the game, with vectorized passes only,
+so a multi-hour session with millions of clicks is analyzed in seconds.
+
+Usage:
+    python -m src.analyzer SESSION.ccrec [...]
+
+Requires the optional ``vision`` extra (NumPy).
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .recorder import COUNT, COUNT_OFFSET, HEADER, HEADER_SIZE, KIND_CLICK, MAGIC, RECORD
+
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Session analysis needs NumPy: pip install 'cookie-clicker-bot[vision]'"
+    ) from e
+
+
+# NumPy view of one record, field for field with recorder.RECORD
+RECORD_DTYPE = np.dtype(
+    [
+        ("at_ns", "<i8"),
+        ("hwnd", "<u4"),
+        ("l_param", "<u4"),
+        ("latency_ns", "<u4"),
+        ("delivered", "u1"),
+        ("kind", "u1"),
+        ("pad", "V2"),
+    ]
+)
+
+# An interval this many times the median interval is a gap in clicking
+GAP_FACTOR = 5.0
+
+# Width of the windows the rate is measured over
+RATE_WINDOW_S = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class Session:
+    """A loaded recording."""
+
+    path: Path
+    started: datetime
+    records: np.ndarray  # RECORD_DTYPE, in recording order
+
+
+@dataclass(frozen=True, slots=True)
+class SessionReport:
+    """What a recorded session achieved."""
+
+    clicks: int
+    delivered: int
+    failed: int
+    injected: int
+    duration_s: float
+    achieved_cps: float  # Delivered regular clicks per second
+    rate_min_cps: float  # Over RATE_WINDOW_S windows, the last (partial) one excluded
+    rate_median_cps: float
+    rate_max_cps: float
+    interval_median_ms: float
+    jitter_p50_ms: float  # |interval - median interval|
+    jitter_p99_ms: float
+    jitter_std_ms: float
+    gaps: int  # Intervals over GAP_FACTOR x the median
+    longest_gap_s: float
+    gap_time_s: float
+    stalls: int  # Runs of consecutive failed clicks
+    longest_stall_s: float
+    stall_time_s: float
+    dispatch_p50_us: float
+    dispatch_p99_us: float
+    dispatch_max_us: float
+
+
+def load_session(path: Path) -> Session:
+    """Map a recording into memory; raises ValueError if it is not a session file."""
+    with path.open("rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} is too short to be a session recording")
+    magic, _version, record_size, started_unix_ns, _started_ns, _ = HEADER.unpack_from(header)
+    if magic != MAGIC or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a session recording")
+    started = datetime.fromtimestamp(started_unix_ns / 1e9)
+    (count,) = COUNT.unpack_from(header, COUNT_OFFSET)
+
+    available = (path.stat().st_size - HEADER_SIZE) // RECORD.size
+    if not available:
+        return Session(path, started, np.empty(0, dtype=RECORD_DTYPE))
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(available,))
+    if count == 0:
+        # Never closed (the bot crashed): the records end where the zero-filled room starts
+        written = np.flatnonzero(records["at_ns"])
+        count = int(written[-1]) + 1 if written.size else 0
+    return Session(path, started, records[: min(count, available)])
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end indices (exclusive) of the runs of True in a boolean array."""
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _window_rates(times_ns: np.ndarray, window_s: float) -> np.ndarray:
+    """Clicks per second in consecutive windows, the last (partial) window excluded."""
+    if times_ns.size < 2:
+        return np.empty(0)
+    window_ns = int(window_s * 1e9)
+    buckets = (times_ns - times_ns[0]) // window_ns
+    full = int(buckets[-1])
+    if full == 0:
+        return np.empty(0)
+    return np.bincount(buckets, minlength=full + 1)[:full] / window_s
+
+
+def analyze(session: Session, gap_factor: float = GAP_FACTOR) -> SessionReport:
+    """Compute the report of a loaded session."""
+    records = session.records
+    at_ns = records["at_ns"]
+    delivered = records["delivered"].astype(bool)
+    regular = records["kind"] == KIND_CLICK
+
+    clicks = int(records.size)
+    duration_s = float(at_ns[-1] - at_ns[0]) / 1e9 if clicks > 1 else 0.0
+
+    # Rate and jitter over the regular clicks the game handled
+    times = at_ns[regular & delivered]
+    intervals = np.diff(times)
+    if intervals.size:
+        median = float(np.median(intervals))
+        deviation = np.abs(intervals - median)
+        jitter_p50, jitter_p99 = np.percentile(deviation, [50, 99])
+        jitter_std = float(intervals.std())
+        gap_mask = intervals > gap_factor * median
+        gap_lengths = intervals[gap_mask]
+    else:
+        median = jitter_p50 = jitter_p99 = jitter_std = 0.0
+        gap_lengths = np.empty(0, dtype=np.int64)
+    span_s = float(times[-1] - times[0]) / 1e9 if times.size > 1 else 0.0
+    rates = _window_rates(times, RATE_WINDOW_S)
+
+    # Stalls: from the first failed click of a run to the click that got through
+    starts, ends = _runs(~delivered)
+    resumed = at_ns[np.minimum(ends, clicks - 1)] if clicks else at_ns
+    stall_lengths = (resumed - at_ns[starts]) if starts.size else np.empty(0, dtype=np.int64)
+
+    latency = records["latency_ns"][delivered]
+    latency_p50, latency_p99 = np.percentile(latency, [50, 99]) if latency.size else (0.0, 0.0)
+
+    return SessionReport(
+        clicks=clicks,
+        delivered=int(delivered.sum()),
+        failed=int(clicks - delivered.sum()),
+        injected=int(clicks - regular.sum()),
+        duration_s=duration_s,
+        achieved_cps=(times.size - 1) / span_s if span_s > 0 else 0.0,
+        rate_min_cps=float(rates.min()) if rates.size else 0.0,
+        rate_median_cps=float(np.median(rates)) if rates.size else 0.0,
+        rate_max_cps=float(rates.max()) if rates.size else 0.0,
+        interval_median_ms=median / 1e6,
+        jitter_p50_ms=float(jitter_p50) / 1e6,
+        jitter_p99_ms=float(jitter_p99) / 1e6,
+        jitter_std_ms=jitter_std / 1e6,
+        gaps=int(gap_lengths.size),
+        longest_gap_s=float(gap_lengths.max()) / 1e9 if gap_lengths.size else 0.0,
+        gap_time_s=float(gap_lengths.sum()) / 1e9,
+        stalls=int(starts.size),
+        longest_stall_s=float(stall_lengths.max()) / 1e9 if stall_lengths.size else 0.0,
+        stall_time_s=float(stall_lengths.sum()) / 1e9,
+        dispatch_p50_us=float(latency_p50) / 1000,
+        dispatch_p99_us=float(latency_p99) / 1000,
+        dispatch_max_us=float(latency.max()) / 1000 if latency.size else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the report of each recorded session as JSON."""
+    parser = argparse.ArgumentParser(description="Analyze recorded click sessions.")
+    parser.add_argument("paths", nargs="+", type=Path, help="session recordings (.ccrec)")
+    parser.add_argument("--gap-factor", type=float, default=GAP_FACTOR)
+    args = parser.parse_args(argv)
+
+    reports = {}
+    for path in args.paths:
+        try:
+            session = load_session(path)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        reports[str(path)] = {
+            "started": session.started.isoformat(timespec="seconds"),
+            **asdict(analyze(session, args.gap_factor)),
+        }
+    print(json.dumps(reports, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
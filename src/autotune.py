@@ -0,0 +1,252 @@
+"""Module for tuning the click rate from measured feedback.
+
+The tuner raises the rate one step at a time while each step still pays: the
+extra return per extra click must be at least half of the average since the
+climb started.
+The return is the cookies gained per second, or the clicks the game actually
+handled when the window title shows no cookie count. Signs that the game cannot
+keep up (dispatch timeouts, a hung window, clicks taking most of the period to
+deliver, an achieved rate well below the target) make it back off at once. A
+settled rate is probed again now and then, since upgrades and buffs change what
+a click is worth.
+"""
+
+import dataclasses
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .clicker import AutoClicker
+from .cookies import CookieSampler
+from .telemetry import SESSIONS_DIR, write_summary
+
+
+# Range the rate is tuned in (the GUI accepts 1-50)
+MIN_CPS = 1
+MAX_CPS = 50
+
+# Length of one trial; the first part lets the new rate settle before measuring
+STEP_S = 5.0
+SETTLE_FRACTION = 0.2
+
+# Rates are raised by this factor (at least +1) and cut by this one when saturated
+RAISE_FACTOR = 1.25
+BACK_OFF_FACTOR = 0.8
+
+# A step must return at least this share of the climb's average return per extra click
+MIN_MARGINAL_RETURN = 0.5
+
+# Saturation: achieved below this share of the target, or dispatch over this share of the period
+MIN_ACHIEVED_RATIO = 0.9
+MAX_DISPATCH_SHARE = 0.5
+
+# Settled steps before the rate is probed again
+REPROBE_STEPS = 12
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    """What one trial at a fixed rate produced."""
+
+    cps: int
+    elapsed_s: float
+    achieved_cps: float
+    return_rate: float  # Cookies per second, or handled clicks per second without a count
+    dispatch_mean_us: float
+    failures: int  # Clicks that timed out or were dropped
+    hung: bool
+
+
+@dataclass(frozen=True, slots=True)
+class AutotuneStep:
+    """One decision of the tuner, as recorded in the convergence trace."""
+
+    at_s: float  # Seconds since the tuner started
+    cps: int
+    achieved_cps: float
+    return_rate: float
+    dispatch_mean_us: float
+    failures: int
+    action: str  # "raise", "settle", "hold", "probe" or "back_off"
+    next_cps: int
+
+
+class Autotuner:
+    """Finds the highest click rate that still increases the return.
+
+    The rate is published like a GUI change (``config.update`` then
+    ``clicker.update_cps``), so the rest of the app sees one consistent CPS.
+    """
+
+    def __init__(
+        self,
+        clicker: AutoClicker,
+        sampler: CookieSampler | None = None,
+        min_cps: int = MIN_CPS,
+        max_cps: int = MAX_CPS,
+        step_s: float = STEP_S,
+        on_step: Callable[[AutotuneStep], None] | None = None,
+    ):
+        self.clicker = clicker
+        self.sampler = sampler
+        self.min_cps = min_cps
+        self.max_cps = max_cps
+        self.step_s = step_s
+        self.on_step = on_step
+        self.cps = min(max(config.current().cps, min_cps), max_cps)
+        self.ceiling = max_cps
+        self.settled = False
+        self.trace: list[AutotuneStep] = []
+        self.started_ns = time.perf_counter_ns()
+        # (cps, return) where the current climb started, and of its last rate worth its clicks
+        self._origin: tuple[int, float] | None = None
+        self._previous: tuple[int, float] | None = None
+        self._settled_steps = 0
+
+    def _counters(self) -> tuple[int, int, int, int, int]:
+        """Read the click counters a measurement is the difference of."""
+        telemetry = self.clicker.telemetry
+        dispatcher = self.clicker.dispatcher
+        return (
+            time.perf_counter_ns(),
+            telemetry.clicks,
+            telemetry.dispatch.sum_ns,
+            telemetry.dispatch.total,
+            dispatcher.timeouts + dispatcher.dropped,
+        )
+
+    def measure(self, before: tuple[int, int, int, int, int]) -> Measurement:
+        """Measure the trial that started when the given counters were read."""
+        now_ns, clicks, sum_ns, total, failures = self._counters()
+        elapsed_s = (now_ns - before[0]) / 1_000_000_000
+        achieved = (clicks - before[1]) / elapsed_s if elapsed_s > 0 else 0.0
+        return_rate = achieved
+        sampler = self.sampler
+        if sampler is not None and sampler.samples >= 2:
+            return_rate = sampler.cookies_per_second(elapsed_s)
+        dispatched = total - before[3]
+        return Measurement(
+            cps=self.cps,
+            elapsed_s=elapsed_s,
+            achieved_cps=achieved,
+            return_rate=return_rate,
+            dispatch_mean_us=(sum_ns - before[2]) / dispatched / 1000 if dispatched else 0.0,
+            failures=failures - before[4],
+            hung=self.clicker.dispatcher.hung,
+        )
+
+    def saturated(self, measurement: Measurement) -> bool:
+        """Whether the game could not keep up with the measured rate."""
+        period_us = 1_000_000 / measurement.cps
+        # One click short is rounding at the edges of the trial, not the game falling behind
+        missing = (MIN_ACHIEVED_RATIO * measurement.cps - measurement.achieved_cps) * (
+            measurement.elapsed_s
+        )
+        return (
+            measurement.hung
+            or measurement.failures > 0
+            or measurement.dispatch_mean_us > MAX_DISPATCH_SHARE * period_us
+            or missing > 1
+        )
+
+    def _raised(self, cps: int) -> int:
+        """The next rate to try above a rate."""
+        return min(self.ceiling, max(cps + 1, round(cps * RAISE_FACTOR)))
+
+    def _settle(self, cps: int) -> tuple[str, int]:
+        """Stay at a rate until the next probe."""
+        self.settled = True
+        self._settled_steps = 0
+        return "settle", cps
+
+    def decide(self, measurement: Measurement) -> tuple[str, int]:
+        """Choose the next rate from a measurement, returning (action, next CPS)."""
+        cps, return_rate = measurement.cps, measurement.return_rate
+
+        if self.saturated(measurement):
+            lowered = max(self.min_cps, min(cps - 1, int(cps * BACK_OFF_FACTOR)))
+            self.ceiling = lowered
+            self._origin = self._previous = None
+            self._settle(lowered)
+            return "back_off", lowered
+
+        if self.settled:
+            self._settled_steps += 1
+            if self._settled_steps < REPROBE_STEPS or cps >= self.max_cps:
+                return "hold", cps
+            # Upgrades and buffs may have moved the saturation point since
+            self.settled = False
+            self.ceiling = self.max_cps
+            self._origin = self._previous = (cps, return_rate)
+            return "probe", self._raised(cps)
+
+        if self._previous is None:
+            self._origin = (cps, return_rate)
+        else:
+            # Compare against the whole climb, which is steadier than any single step
+            (origin_cps, origin_return), (previous_cps, previous_return) = (
+                self._origin,
+                self._previous,
+            )
+            marginal = (return_rate - previous_return) / (cps - previous_cps)
+            average = (
+                (previous_return - origin_return) / (previous_cps - origin_cps)
+                if previous_cps != origin_cps
+                else 0.0
+            )
+            if marginal <= 0 or marginal < MIN_MARGINAL_RETURN * average:
+                return self._settle(previous_cps)
+
+        self._previous = (cps, return_rate)
+        raised = self._raised(cps)
+        if raised <= cps:
+            return self._settle(cps)
+        return "raise", raised
+
+    def step(self, measurement: Measurement) -> AutotuneStep:
+        """Decide on one measurement, apply the new rate and record the step."""
+        action, next_cps = self.decide(measurement)
+        step = AutotuneStep(
+            at_s=(time.perf_counter_ns() - self.started_ns) / 1_000_000_000,
+            cps=measurement.cps,
+            achieved_cps=measurement.achieved_cps,
+            return_rate=measurement.return_rate,
+            dispatch_mean_us=measurement.dispatch_mean_us,
+            failures=measurement.failures,
+            action=action,
+            next_cps=next_cps,
+        )
+        self.trace.append(step)
+        if next_cps != self.cps:
+            self.cps = next_cps
+            config.update(cps=next_cps)
+            self.clicker.update_cps()
+        if self.on_step:
+            self.on_step(step)
+        return step
+
+    def run(self, stop_event: threading.Event):
+        """Run trials until the stop event is set."""
+        if self.cps != config.current().cps:
+            config.update(cps=self.cps)
+            self.clicker.update_cps()
+        while not stop_event.wait(self.step_s * SETTLE_FRACTION):
+            before = self._counters()
+            if stop_event.wait(self.step_s * (1 - SETTLE_FRACTION)):
+                break
+            self.step(self.measure(before))
+
+    def summary(self) -> dict:
+        """Build a JSON-serializable record of the convergence trace."""
+        return {
+            "final_cps": self.cps,
+            "settled": self.settled,
+            "steps": [dataclasses.asdict(step) for step in self.trace],
+        }
+
+    def write_trace(self, directory: Path = SESSIONS_DIR) -> Path:
+        """Write the convergence trace as JSON and return its path."""
+        return write_summary(self.summary(), directory, prefix="autotune")
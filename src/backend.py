@@ -0,0 +1,206 @@
+"""Module for the pluggable window-system backend.
+
+Everything that talks to the window system goes through a ``WindowBackend``.
+The default is the real Win32 API; tests and benchmarks can install an
+in-memory backend (see ``simulated.py``) and run on any platform.
+"""
+
+import ctypes
+from collections.abc import Callable
+from ctypes import wintypes
+from typing import Protocol
+
+
+# Window messages and flags used for clicking (winuser.h)
+WM_NULL = 0x0000
+WM_LBUTTONDOWN = 0x0201
+WM_LBUTTONUP = 0x0202
+WM_RBUTTONDOWN = 0x0204
+WM_RBUTTONUP = 0x0205
+WM_MBUTTONDOWN = 0x0207
+WM_MBUTTONUP = 0x0208
+MK_LBUTTON = 0x0001
+MK_RBUTTON = 0x0002
+MK_MBUTTON = 0x0010
+
+# SendMessageTimeout flags
+SMTO_ABORTIFHUNG = 0x0002
+PM_REMOVE = 0x0001
+
+
+class EventSource(Protocol):
+    """Delivers whole-window events to a handler as ``handler(event, hwnd)``."""
+
+    @property
+    def running(self) -> bool: ...
+
+    def add_hook(self, event_min: int, event_max: int, process_id: int = 0): ...
+
+    def start(self): ...
+
+    def stop(self): ...
+
+
+class WindowBackend(Protocol):
+    """The window-system operations the bot depends on."""
+
+    # All top-level windows as (hwnd, title, visible)
+    def enum_windows(self) -> list[tuple[int, str, bool]]: ...
+
+    def get_window_text(self, hwnd: int) -> str: ...
+
+    def is_window(self, hwnd: int) -> bool: ...
+
+    def is_window_visible(self, hwnd: int) -> bool: ...
+
+    def get_client_rect(self, hwnd: int) -> tuple[int, int, int, int]: ...
+
+    def client_to_screen(self, hwnd: int, point: tuple[int, int]) -> tuple[int, int]: ...
+
+    def get_window_process_id(self, hwnd: int) -> int: ...
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int: ...
+
+    # Returns False if the window is hung or did not answer within the timeout
+    def send_message_timeout(
+        self, hwnd: int, msg: int, wparam: int, lparam: int, timeout_ms: int
+    ) -> bool: ...
+
+    # Queues the message without waiting; on_done runs from process_async_replies()
+    def send_message_async(
+        self, hwnd: int, msg: int, wparam: int, lparam: int, on_done: Callable[[], None]
+    ) -> bool: ...
+
+    def process_async_replies(self): ...
+
+    def is_hung(self, hwnd: int) -> bool: ...
+
+    def create_event_source(self, handler: Callable[[int, int], None]) -> EventSource: ...
+
+    # A capture.FrameSource for the window's client area (needs the vision extra)
+    def create_frame_source(self, hwnd: int): ...
+
+
+class Win32Backend:
+    """Backend built on pywin32 and WinEvent hooks."""
+
+    def __init__(self):
+        # Imported here so the rest of the package can load on other platforms
+        import win32api
+        import win32gui
+        import win32process
+
+        self._win32gui = win32gui
+        self._win32process = win32process
+        self.get_window_text = win32gui.GetWindowText
+        self.is_window = win32gui.IsWindow
+        self.is_window_visible = win32gui.IsWindowVisible
+        self.get_client_rect = win32gui.GetClientRect
+        self.client_to_screen = win32gui.ClientToScreen
+        self.send_message = win32api.SendMessage
+
+        user32 = ctypes.windll.user32
+        self._send_message_timeout = user32.SendMessageTimeoutW
+        self._send_message_timeout.argtypes = [
+            wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM, wintypes.UINT,
+            wintypes.UINT, ctypes.POINTER(ctypes.c_size_t),
+        ]  # fmt: skip
+        self._send_message_timeout.restype = ctypes.c_size_t
+        self._send_message_callback = user32.SendMessageCallbackW
+        self._peek_message = user32.PeekMessageW
+        self._is_hung = user32.IsHungAppWindow
+        self._result = ctypes.c_size_t()
+        # SENDASYNCPROC(hwnd, msg, data, result); data indexes the pending callbacks
+        self._reply_proc = ctypes.WINFUNCTYPE(
+            None, wintypes.HWND, wintypes.UINT, ctypes.c_size_t, ctypes.c_size_t
+        )(self._on_reply)
+        self._send_message_callback.argtypes = [
+            wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+            type(self._reply_proc), ctypes.c_size_t,
+        ]  # fmt: skip
+        self._pending_replies: dict[int, Callable[[], None]] = {}
+        self._next_reply_id = 0
+        self._msg = wintypes.MSG()
+
+    def enum_windows(self) -> list[tuple[int, str, bool]]:
+        """List all top-level windows as (hwnd, title, visible)."""
+        get_text = self._win32gui.GetWindowText
+        is_visible = self._win32gui.IsWindowVisible
+
+        def enum_window_callback(hwnd, window_list):
+            window_list.append((hwnd, get_text(hwnd), bool(is_visible(hwnd))))
+
+        windows = []
+        self._win32gui.EnumWindows(enum_window_callback, windows)
+        return windows
+
+    def get_window_process_id(self, hwnd: int) -> int:
+        """Get the id of the process that owns a window."""
+        return self._win32process.GetWindowThreadProcessId(hwnd)[1]
+
+    def send_message_timeout(
+        self, hwnd: int, msg: int, wparam: int, lparam: int, timeout_ms: int
+    ) -> bool:
+        """Send a message, giving up if the window is hung or slower than the timeout."""
+        return bool(
+            self._send_message_timeout(
+                hwnd, msg, wparam, lparam, SMTO_ABORTIFHUNG, timeout_ms, ctypes.byref(self._result)
+            )
+        )
+
+    def send_message_async(
+        self, hwnd: int, msg: int, wparam: int, lparam: int, on_done: Callable[[], None]
+    ) -> bool:
+        """Send a message without waiting (SendMessageCallback)."""
+        reply_id = self._next_reply_id
+        self._next_reply_id += 1
+        self._pending_replies[reply_id] = on_done
+        if self._send_message_callback(hwnd, msg, wparam, lparam, self._reply_proc, reply_id):
+            return True
+        del self._pending_replies[reply_id]
+        return False
+
+    def _on_reply(self, _hwnd, _msg, reply_id, _result):
+        """Run the completion callback of an asynchronous message."""
+        on_done = self._pending_replies.pop(reply_id, None)
+        if on_done:
+            on_done()
+
+    def process_async_replies(self):
+        """Deliver pending SendMessageCallback replies (they run inside PeekMessage)."""
+        msg = ctypes.byref(self._msg)
+        while self._peek_message(msg, 0, 0, 0, PM_REMOVE):
+            pass
+
+    def is_hung(self, hwnd: int) -> bool:
+        """Check whether Windows considers the window's thread unresponsive."""
+        return bool(self._is_hung(hwnd))
+
+    def create_event_source(self, handler: Callable[[int, int], None]) -> EventSource:
+        """Create a WinEvent hook thread delivering events to the handler."""
+        from .win_events import WinEventThread
+
+        return WinEventThread(handler)
+
+    def create_frame_source(self, hwnd: int):
+        """Create a GDI frame source for the window's client area (needs NumPy)."""
+        from .capture import GdiFrameSource
+
+        return GdiFrameSource(hwnd, self)
+
+
+_backend: WindowBackend | None = None
+
+
+def get_backend() -> WindowBackend:
+    """Get the active backend, creating the Win32 one on first use."""
+    global _backend
+    if _backend is None:
+        _backend = Win32Backend()
+    return _backend
+
+
+def set_backend(backend: WindowBackend | None):
+    """Install a backend (None restores the Win32 default on next use)."""
+    global _backend
+    _backend = backend
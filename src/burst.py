@@ -0,0 +1,246 @@
+"""Module for clicking faster while a click buff is on.
+
+Click Frenzy and Dragonflight multiply what each click earns by hundreds for a
+few seconds; a fixed click rate leaves most of that on the table. The burst
+controller follows the cookie count in the window title and compares what each
+click earned since the title last changed with the median of recent updates. When
+consecutive title updates all show a jump, the clicker is switched to the
+burst rate for the buff's expected length and switched back afterwards.
+
+A burst ends early when the gain per click falls back for as many updates as
+it took to detect it, and is extended while the gain stays high past the
+expected end (upgrades lengthen buffs). A single jump, such as the lump of
+cookies from a Lucky golden cookie, never starts a burst.
+
+Each burst is reported with its detection latency (from the last title update
+before the jump) and the extra cookies it earned: the clicks sent beyond the
+normal rate, valued at what a click earned during the buff. Passive income is
+counted as if it came from clicks, which during a click buff is a small share.
+"""
+
+import dataclasses
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .clicker import AutoClicker
+from .cookies import CookieSampler
+from .telemetry import SESSIONS_DIR, write_summary
+
+
+# Gain per click over the baseline that marks a buff (Click Frenzy is x777)
+TRIGGER_RATIO = 10.0
+
+# Consecutive title updates past the trigger that start a burst, or below it that end one
+CONFIRM_UPDATES = 2
+
+# Title updates the baseline is the median of; a median ignores lumps and short buffs
+BASELINE_UPDATES = 200
+
+# Title updates the baseline must have seen before buffs are looked for
+MIN_BASELINE_UPDATES = 10
+
+# Time the burst is extended by while the gain stays high past the expected end
+EXTEND_S = 2.0
+
+# Interval at which the controller reads new samples
+POLL_S = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class BurstEvent:
+    """One change of the burst controller, as recorded in the trace."""
+
+    at_s: float  # Seconds since the controller started
+    action: str  # "start", "extend" or "end"
+    cps: int  # Rate after the change
+    ratio: float  # Gain per click over the baseline when the buff was detected
+    latency_s: float  # From the title update before the jump to the burst starting
+    duration_s: float  # Length of the burst so far
+    clicks: int  # Clicks sent during the burst
+    extra_clicks: int  # Clicks beyond what the normal rate would have sent
+    cookies: float  # Cookies gained during the burst
+    extra_cookies: float  # Estimated share of them owed to the extra clicks
+
+
+class BurstController:
+    """Raises the click rate while the cookie count shows a click buff.
+
+    The rate is published like a GUI change (``config.update`` then
+    ``clicker.update_cps``). The sampler should read the title often (see
+    ``config.BURST_SAMPLE_RATE``), since a buff is only seconds long.
+    """
+
+    def __init__(
+        self,
+        clicker: AutoClicker,
+        sampler: CookieSampler,
+        burst_cps: int | None = None,
+        duration_s: float = config.BURST_DURATION_S,
+        on_event: Callable[[BurstEvent], None] | None = None,
+    ):
+        self.clicker = clicker
+        self.sampler = sampler
+        self.burst_cps = burst_cps or config.current().burst_cps
+        self.duration_s = duration_s
+        self.on_event = on_event
+        self.trace: list[BurstEvent] = []
+        self.started_ns = time.perf_counter_ns()
+        # Gain per click of the recent title updates outside bursts
+        self.history: deque[float] = deque(maxlen=BASELINE_UPDATES)
+        self.baseline = 0.0
+        self.bursting = False
+        self._last_ns = 0  # Time of the last sample step read
+        self._last_update_ns = 0  # Time of the last update taken
+        self._pending_cookies = 0.0  # Gained since then
+        self._pending_clicks = 0  # Clicks sent since then
+        self._streak: list[tuple[int, float, int]] = []  # Updates past the trigger, or below it
+        self._streak_start_ns = 0  # Title update before the first one of the streak
+        # The burst in progress
+        self._base_cps = 0
+        self._ratio = 0.0
+        self._latency_s = 0.0
+        self._burst_start_ns = 0
+        self._burst_end_ns = 0
+        self._burst_cookies = 0.0
+        self._burst_click_count = 0  # Telemetry clicks when the burst started
+        self._elevated = False  # Whether the last title update during the burst was
+
+    def _elevated_by(self, cookies: float, clicks: int) -> float:
+        """Gain per click of a title update over the baseline (0 before there is one)."""
+        if len(self.history) < MIN_BASELINE_UPDATES or self.baseline <= 0:
+            return 0.0
+        return cookies / clicks / self.baseline
+
+    def _add_to_baseline(self, cookies: float, clicks: int):
+        """Add one title update to the baseline (what a click normally earns)."""
+        self.history.append(cookies / clicks)
+        self.baseline = statistics.median(self.history)
+
+    def poll(self):
+        """Read the samples taken since the last poll and start, extend or end a burst."""
+        for at_ns, cookies, clicks in self.sampler.gains(self._last_ns):
+            self._last_ns = at_ns
+            self._pending_cookies += cookies
+            self._pending_clicks += clicks
+            # Wait for the title to show a gain with clicks behind it: the title lags the
+            # bank, and passive income alone moves it between clicks
+            if self._pending_cookies <= 0 or self._pending_clicks <= 0:
+                continue
+            cookies, clicks = self._pending_cookies, self._pending_clicks
+            self._pending_cookies, self._pending_clicks = 0.0, 0
+            if self._last_update_ns:
+                self._on_update(at_ns, cookies, clicks)
+            self._last_update_ns = at_ns
+
+        if self.bursting and time.perf_counter_ns() >= self._burst_end_ns:
+            if self._elevated:
+                # Upgrades lengthen buffs: keep going while the gain stays high
+                self._burst_end_ns += int(EXTEND_S * 1e9)
+                self._record("extend")
+            else:
+                self._end()
+
+    def _on_update(self, at_ns: int, cookies: float, clicks: int):
+        """Follow one title update: the gain since the previous one over its clicks."""
+        ratio = self._elevated_by(cookies, clicks)
+        elevated = ratio >= TRIGGER_RATIO
+        if self.bursting:
+            self._burst_cookies += cookies
+            self._elevated = elevated
+            self._streak = [] if elevated else [*self._streak, (at_ns, cookies, clicks)]
+            if len(self._streak) >= CONFIRM_UPDATES:
+                self._end()  # The buff ended before its expected length
+            return
+
+        if not elevated:
+            # A lone jump (a Lucky golden cookie) is dropped, not folded into the baseline
+            self._streak = []
+            self._add_to_baseline(cookies, clicks)
+            return
+        if not self._streak:
+            self._streak_start_ns = self._last_update_ns
+        self._streak.append((at_ns, cookies, clicks))
+        if len(self._streak) >= CONFIRM_UPDATES:
+            self._start(ratio)
+
+    def _start(self, ratio: float):
+        """Switch the clicker to the burst rate."""
+        now_ns = time.perf_counter_ns()
+        self.bursting = True
+        self._ratio = ratio
+        self._latency_s = (now_ns - self._streak_start_ns) / 1e9
+        self._burst_start_ns = now_ns
+        self._burst_end_ns = self._streak_start_ns + int(self.duration_s * 1e9)
+        self._burst_cookies = sum(cookies for _, cookies, _ in self._streak)
+        self._burst_click_count = self.clicker.telemetry.clicks
+        self._elevated = True
+        self._streak = []
+        self._base_cps = config.current().cps
+        self._set_cps(max(self._base_cps, self.burst_cps))
+        self._record("start")
+
+    def _end(self):
+        """Switch the clicker back to the rate it had before the burst."""
+        self.bursting = False
+        self._streak = []
+        # A rate changed by hand during the burst is kept
+        if config.current().cps == max(self._base_cps, self.burst_cps):
+            self._set_cps(self._base_cps)
+        self._record("end")
+
+    def _set_cps(self, cps: int):
+        """Publish a new click rate and apply it to the running clicker."""
+        config.update(cps=cps)
+        self.clicker.update_cps()
+
+    def _record(self, action: str) -> BurstEvent:
+        """Record a change of the burst in the trace and report it."""
+        now_ns = time.perf_counter_ns()
+        duration_s = (now_ns - self._burst_start_ns) / 1e9
+        clicks = self.clicker.telemetry.clicks - self._burst_click_count
+        extra_clicks = max(0, clicks - round(self._base_cps * duration_s))
+        cookies = self._burst_cookies
+        event = BurstEvent(
+            at_s=(now_ns - self.started_ns) / 1e9,
+            action=action,
+            cps=config.current().cps,
+            ratio=self._ratio,
+            latency_s=self._latency_s,
+            duration_s=duration_s,
+            clicks=clicks,
+            extra_clicks=extra_clicks,
+            cookies=cookies,
+            extra_cookies=cookies * extra_clicks / clicks if clicks else 0.0,
+        )
+        self.trace.append(event)
+        if self.on_event:
+            self.on_event(event)
+        return event
+
+    def run(self, stop_event: threading.Event):
+        """Watch for buffs until the stop event is set, ending a burst in progress."""
+        while not stop_event.wait(POLL_S):
+            self.poll()
+        if self.bursting:
+            self._end()
+
+    def summary(self) -> dict:
+        """Build a JSON-serializable record of the bursts."""
+        ends = [event for event in self.trace if event.action == "end"]
+        return {
+            "bursts": len(ends),
+            "burst_cps": self.burst_cps,
+            "mean_latency_s": sum(e.latency_s for e in ends) / len(ends) if ends else None,
+            "extra_cookies": sum(event.extra_cookies for event in ends),
+            "events": [dataclasses.asdict(event) for event in self.trace],
+        }
+
+    def write_trace(self, directory: Path = SESSIONS_DIR) -> Path:
+        """Write the bursts as JSON and return the file's path."""
+        return write_summary(self.summary(), directory, prefix="burst")
@@ -0,0 +1,185 @@
+"""Module for locating the big cookie on screen instead of guessing its position.
+
+One captured frame is enough: cookie-colored pixels are grouped into blobs on a
+subsampled view, the largest blob's centroid is taken as the center, and a
+radial coverage profile around it gives the radius and a confidence. Results
+are cached per client size, so a window geometry is analyzed only once.
+
+Requires the optional ``vision`` extra (NumPy).
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .backend import WindowBackend
+from .capture import ScreenCapture, color_mask, tile_clusters
+
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Cookie calibration needs NumPy: pip install 'cookie-clicker-bot[vision]'"
+    ) from e
+
+
+# Inclusive BGR range of the big cookie's dough
+COOKIE_LOWER = (10, 50, 110)
+COOKIE_UPPER = (120, 175, 240)
+
+# Analyze every n-th pixel in both directions
+SAMPLE_STEP = 4
+
+# Tile size (in sampled pixels) used to group cookie-colored pixels into blobs
+BLOB_TILE = 8
+
+# The cookie's edge is where less than this fraction of a ring is cookie-colored
+EDGE_COVERAGE = 0.5
+
+# Results less certain or smaller than this are rejected
+MIN_CONFIDENCE = 0.6
+MIN_RADIUS = 12
+
+# A disc fills pi/4 of a square bounding box; a blob shaped otherwise (a building
+# row, a panel of similar color) is not the cookie
+MIN_ASPECT = 0.75  # Shorter side of the blob's bounding box over the longer one
+FILL_TOLERANCE = 0.15  # Allowed distance of its fill ratio from pi/4
+
+# Client sizes remembered; the oldest is forgotten first
+MAX_CALIBRATIONS = 64
+
+
+@dataclass(frozen=True, slots=True)
+class CookieLocation:
+    """Where the big cookie is in a frame."""
+
+    x: int
+    y: int
+    radius: int
+    confidence: float  # Fraction of the disc that is cookie-colored
+
+
+def _measure_disc(mask: np.ndarray, top: int, left: int, step: int) -> CookieLocation | None:
+    """Measure a blob of a sampled mask as a disc, or None if it is not round enough."""
+    ys, xs = np.nonzero(mask)
+    if not len(ys):
+        return None
+    height = int(ys.max() - ys.min()) + 1
+    width = int(xs.max() - xs.min()) + 1
+    if min(width, height) / max(width, height) < MIN_ASPECT:
+        return None
+    if abs(len(ys) / (width * height) - np.pi / 4) > FILL_TOLERANCE:
+        return None
+    center_y, center_x = ys.mean(), xs.mean()
+
+    # Radial profile: the share of each one-pixel ring that is cookie-colored
+    rows, cols = np.ogrid[: mask.shape[0], : mask.shape[1]]
+    distance = np.hypot(rows - center_y, cols - center_x).astype(np.int32)
+    ring_pixels = np.bincount(distance.ravel())
+    ring_cookie = np.bincount(distance[mask], minlength=len(ring_pixels))
+    coverage = ring_cookie / np.maximum(ring_pixels, 1)
+    edge = np.nonzero(coverage[1:] < EDGE_COVERAGE)[0]
+    radius = int(edge[0]) + 1 if len(edge) else len(coverage)
+    confidence = float(ring_cookie[:radius].sum() / max(ring_pixels[:radius].sum(), 1))
+
+    if radius * step < MIN_RADIUS or confidence < MIN_CONFIDENCE:
+        return None
+    return CookieLocation(
+        x=int((left + center_x) * step),
+        y=int((top + center_y) * step),
+        radius=radius * step,
+        confidence=confidence,
+    )
+
+
+def locate_big_cookie(
+    array: np.ndarray,
+    lower: tuple[int, int, int] = COOKIE_LOWER,
+    upper: tuple[int, int, int] = COOKIE_UPPER,
+    step: int = SAMPLE_STEP,
+) -> CookieLocation | None:
+    """Find the big cookie in a BGRA frame, or None if nothing cookie-like is there.
+
+    Cookie-colored blobs are tried largest first, and the first round one is
+    taken: near-square bounds, filled like a disc, and colored out to a clear
+    edge. A building row or a panel of similar color is passed over.
+    """
+    mask = color_mask(array[::step, ::step], lower, upper)
+    counts = np.add.reduceat(
+        np.add.reduceat(mask, np.arange(0, mask.shape[0], BLOB_TILE), axis=0, dtype=np.int32),
+        np.arange(0, mask.shape[1], BLOB_TILE),
+        axis=1,
+    )
+    blobs = tile_clusters(counts >= BLOB_TILE * BLOB_TILE // 4)
+    blobs.sort(key=lambda box: counts[box[0] : box[2], box[1] : box[3]].sum(), reverse=True)
+    for row0, col0, row1, col1 in blobs:
+        top, left = row0 * BLOB_TILE, col0 * BLOB_TILE
+        blob = mask[top : row1 * BLOB_TILE, left : col1 * BLOB_TILE]
+        location = _measure_disc(blob, top, left, step)
+        if location is not None:
+            return location
+    return None
+
+
+class Calibrator:
+    """Finds the click point for a window and remembers it per client size."""
+
+    def __init__(self, path: Path = config.CALIBRATION_FILE, backend: WindowBackend | None = None):
+        self.path = path
+        self.backend = backend
+        # (width, height) -> (relative_x, relative_y)
+        self._points: dict[tuple[int, int], tuple[float, float]] = {}
+
+    def load(self) -> "Calibrator":
+        """Load cached calibrations from disk; a missing file means none."""
+        self._points.clear()
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for size, point in data.get("calibrations", {}).items():
+                width, height = (int(value) for value in size.split("x"))
+                self._points[width, height] = (float(point[0]), float(point[1]))
+        return self
+
+    def save(self):
+        """Write the cached calibrations to disk atomically."""
+        calibrations = {f"{w}x{h}": list(point) for (w, h), point in self._points.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"calibrations": calibrations}, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def get(self, width: int, height: int) -> tuple[float, float] | None:
+        """Get the cached relative click point for a client size."""
+        return self._points.get((width, height))
+
+    def calibrate(
+        self, hwnd: int, width: int, height: int, force: bool = False
+    ) -> tuple[float, float] | None:
+        """Get the relative click point for a window, analyzing a frame only if needed.
+
+        The point is relative to the frame that was analyzed and cached under its
+        size, which differs from ``width`` x ``height`` if the window was resized
+        in between.
+        """
+        if not force and (width, height) in self._points:
+            return self._points[width, height]
+
+        capture = ScreenCapture(hwnd, self.backend)
+        try:
+            frame = capture.capture()
+            location = locate_big_cookie(frame.array) if frame else None
+            frame_height, frame_width = frame.array.shape[:2] if frame else (0, 0)
+        finally:
+            capture.close()
+        if location is None or not frame_width or not frame_height:
+            return None
+
+        size = frame_width, frame_height
+        self._points.pop(size, None)  # Re-inserted as the newest
+        self._points[size] = point = (location.x / frame_width, location.y / frame_height)
+        while len(self._points) > MAX_CALIBRATIONS:
+            del self._points[next(iter(self._points))]
+        self.save()
+        return point
@@ -0,0 +1,404 @@
+"""Module for capturing the game window's client area.
+
+Frames are grabbed into one preallocated buffer (a GDI DIB section on Windows)
+that holds a small ring of frame slots. Each slot is exposed as a zero-copy
+NumPy view, so vision code reads pixels where the blit wrote them. Frames that
+did not change since the last published one are detected with a cheap per-tile
+hash and never published.
+
+Requires the optional ``vision`` extra (NumPy).
+"""
+
+import ctypes
+import sys
+import threading
+import time
+import weakref
+from ctypes import wintypes
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+from .backend import WindowBackend, get_backend
+from .scheduler import NS_PER_SECOND, period_for, wait_until
+
+
+if TYPE_CHECKING:
+    from .simulated import SimulatedWindow
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("Screen capture needs NumPy: pip install 'cookie-clicker-bot[vision]'") from e
+
+
+# Frames kept for consumers; a frame stays valid for (slots - 1) newer captures
+DEFAULT_SLOTS = 3
+
+# Edge length in pixels of the tiles used for change detection
+DEFAULT_TILE = 32
+
+DEFAULT_FPS = 30
+
+# Pixels are 32-bit BGRA, as produced by a top-down 32 bpp DIB
+BYTES_PER_PIXEL = 4
+
+# GDI constants (wingdi.h)
+BI_RGB = 0
+DIB_RGB_COLORS = 0
+SRCCOPY = 0x00CC0020
+CAPTUREBLT = 0x40000000
+
+
+class FrameSource(Protocol):
+    """Copies pixels of one window into a buffer it allocated itself."""
+
+    def client_size(self) -> tuple[int, int]: ...
+
+    # A (height, width, 4) uint8 BGRA array backed by the source's own memory, which
+    # stays valid for as long as any view of the array exists
+    def allocate(self, width: int, height: int) -> np.ndarray: ...
+
+    # Copy the client rectangle (x, y, width, height) into rows dest_y.. of the buffer
+    def grab(self, dest_y: int, x: int, y: int, width: int, height: int): ...
+
+    def close(self): ...
+
+
+@dataclass(slots=True)
+class Frame:
+    """One slot of the capture ring."""
+
+    array: np.ndarray  # (height, width, 4) BGRA view into the capture buffer
+    region: tuple[int, int, int, int] = (0, 0, 0, 0)  # Client (x, y, width, height)
+    id: int = 0  # 0 while the slot is being overwritten
+    timestamp_ns: int = 0
+    changed: np.ndarray | None = None  # Bool mask of tiles changed since the previous frame
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureStats:
+    """Throughput of a ScreenCapture."""
+
+    frames_captured: int
+    frames_published: int
+    frames_skipped: int
+    bytes_copied: int
+    elapsed_s: float
+    captured_fps: float
+    published_fps: float
+
+
+def tile_hashes(array: np.ndarray, tile: int = DEFAULT_TILE) -> np.ndarray:
+    """Sum every tile of a BGRA frame into one 64-bit value per tile."""
+    height, width = array.shape[:2]
+    pixels = array.view(np.uint32).reshape(height, width)
+    rows = np.add.reduceat(pixels, np.arange(0, height, tile), axis=0, dtype=np.uint64)
+    return np.add.reduceat(rows, np.arange(0, width, tile), axis=1)
+
+
+def color_mask(
+    array: np.ndarray, lower: tuple[int, int, int], upper: tuple[int, int, int]
+) -> np.ndarray:
+    """Mark the pixels of a BGRA array whose color lies in an inclusive BGR range."""
+    mask = (array[..., 0] >= lower[0]) & (array[..., 0] <= upper[0])
+    mask &= (array[..., 1] >= lower[1]) & (array[..., 1] <= upper[1])
+    mask &= (array[..., 2] >= lower[2]) & (array[..., 2] <= upper[2])
+    return mask
+
+
+def tile_clusters(grid: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """Bounding boxes (row0, col0, row1, col1) of the 8-connected True cells of a small grid."""
+    seen = np.zeros_like(grid, dtype=bool)
+    rows, cols = grid.shape
+    boxes = []
+    for start in zip(*np.nonzero(grid), strict=True):
+        if seen[start]:
+            continue
+        seen[start] = True
+        stack = [start]
+        row0, col0, row1, col1 = start[0], start[1], start[0], start[1]
+        while stack:
+            row, col = stack.pop()
+            row0, row1 = min(row0, row), max(row1, row)
+            col0, col1 = min(col0, col), max(col1, col)
+            for r in range(max(row - 1, 0), min(row + 2, rows)):
+                for c in range(max(col - 1, 0), min(col + 2, cols)):
+                    if grid[r, c] and not seen[r, c]:
+                        seen[r, c] = True
+                        stack.append((r, c))
+        boxes.append((int(row0), int(col0), int(row1) + 1, int(col1) + 1))
+    return boxes
+
+
+class ScreenCapture:
+    """Grabs the client area (or a region of it) of one window into a frame ring.
+
+    A single thread captures; any number of threads may read ``latest()``. A
+    consumer that needs a frame for longer than ``slots - 1`` captures should
+    check that ``frame.id`` is unchanged after reading, or copy the array. A
+    resize replaces the ring; the frames of the old one keep their memory (and
+    their last pixels) until the last of them is dropped.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        backend: WindowBackend | None = None,
+        region: tuple[int, int, int, int] | None = None,
+        slots: int = DEFAULT_SLOTS,
+        tile: int = DEFAULT_TILE,
+    ):
+        self.hwnd = hwnd
+        self.source: FrameSource = (backend or get_backend()).create_frame_source(hwnd)
+        self.slots = max(2, slots)
+        self.tile = tile
+        self.region = region
+        self.frames_captured = 0
+        self.frames_published = 0
+        self.bytes_copied = 0
+        self.started_ns = time.perf_counter_ns()
+        self._frames: list[Frame] = []
+        self._latest: Frame | None = None
+        self._next = 0
+        self._sequence = 0
+        self._hashes: np.ndarray | None = None
+        self._allocate()
+
+    @property
+    def frames_skipped(self) -> int:
+        """Captured frames that were identical to the previous one."""
+        return self.frames_captured - self.frames_published
+
+    def _target_region(self) -> tuple[int, int, int, int]:
+        """The client rectangle to capture, clamped to the client area."""
+        client_width, client_height = self.source.client_size()
+        if self.region is None:
+            return 0, 0, client_width, client_height
+        x, y, width, height = self.region
+        x = min(max(x, 0), client_width)
+        y = min(max(y, 0), client_height)
+        return x, y, min(width, client_width - x), min(height, client_height - y)
+
+    def _allocate(self):
+        """(Re)build the frame ring for the current capture region."""
+        region = self._target_region()
+        width, height = max(region[2], 1), max(region[3], 1)
+        buffer = self.source.allocate(width, height * self.slots)
+        self._frames = [
+            Frame(buffer[index * height : (index + 1) * height], region)
+            for index in range(self.slots)
+        ]
+        self._latest = None
+        self._next = 0
+        self._hashes = None
+
+    def set_region(self, region: tuple[int, int, int, int] | None):
+        """Capture only a client rectangle (x, y, width, height), or None for everything."""
+        self.region = region
+        self._allocate()
+
+    def capture(self) -> Frame | None:
+        """Grab one frame; returns None if nothing changed since the last one."""
+        region = self._target_region()
+        if region != self._frames[0].region:
+            self._allocate()  # Window resized or region clamped differently
+
+        frame = self._frames[self._next]
+        frame.id = 0
+        x, y, width, height = region
+        self.source.grab(self._next * frame.array.shape[0], x, y, width, height)
+        self.frames_captured += 1
+        self.bytes_copied += width * height * BYTES_PER_PIXEL
+
+        hashes = tile_hashes(frame.array, self.tile)
+        previous = self._hashes
+        if previous is not None and np.array_equal(hashes, previous):
+            return None
+
+        frame.changed = hashes != previous if previous is not None else None
+        frame.timestamp_ns = time.perf_counter_ns()
+        self._hashes = hashes
+        self._sequence += 1
+        frame.id = self._sequence
+        self._latest = frame
+        self._next = (self._next + 1) % self.slots
+        self.frames_published += 1
+        return frame
+
+    def latest(self) -> Frame | None:
+        """Get the most recently published frame."""
+        return self._latest
+
+    def stats(self) -> CaptureStats:
+        """Get the capture throughput so far."""
+        elapsed_s = (time.perf_counter_ns() - self.started_ns) / NS_PER_SECOND
+        return CaptureStats(
+            frames_captured=self.frames_captured,
+            frames_published=self.frames_published,
+            frames_skipped=self.frames_skipped,
+            bytes_copied=self.bytes_copied,
+            elapsed_s=elapsed_s,
+            captured_fps=self.frames_captured / elapsed_s if elapsed_s > 0 else 0.0,
+            published_fps=self.frames_published / elapsed_s if elapsed_s > 0 else 0.0,
+        )
+
+    def run(self, stop_event: threading.Event, fps: float = DEFAULT_FPS):
+        """Capture at a fixed rate until the stop event is set."""
+        period_ns = period_for(fps)
+        deadline = time.perf_counter_ns()
+        while wait_until(deadline, stop_event, 0):
+            self.capture()
+            deadline = max(deadline + period_ns, time.perf_counter_ns())
+
+    def close(self):
+        """Release the capture buffer."""
+        self._frames = []
+        self._latest = None
+        self.source.close()
+
+
+class SimulatedFrameSource:
+    """Copies the surface of a simulated window, for headless tests and benchmarks."""
+
+    def __init__(self, window: "SimulatedWindow"):
+        self.window = window
+        self._buffer: np.ndarray | None = None
+
+    def client_size(self) -> tuple[int, int]:
+        """Get the window's client width and height."""
+        return self.window.width, self.window.height
+
+    def allocate(self, width: int, height: int) -> np.ndarray:
+        """Allocate a plain memory buffer."""
+        self._buffer = np.zeros((height, width, BYTES_PER_PIXEL), dtype=np.uint8)
+        return self._buffer
+
+    def grab(self, dest_y: int, x: int, y: int, width: int, height: int):
+        """Copy a client rectangle of the window's surface into the buffer."""
+        window = self.window
+        surface = np.frombuffer(window.surface(), dtype=np.uint8).reshape(
+            window.height, window.width, BYTES_PER_PIXEL
+        )
+        self._buffer[dest_y : dest_y + height, :width] = surface[y : y + height, x : x + width]
+
+    def close(self):
+        """Drop the buffer."""
+        self._buffer = None
+
+
+class _BitmapInfo(ctypes.Structure):
+    """BITMAPINFO with room for the (unused) color table of a 32 bpp DIB."""
+
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+        ("bmiColors", wintypes.DWORD * 3),
+    ]
+
+
+class GdiFrameSource:
+    """Captures a window with BitBlt into a top-down 32 bpp DIB section."""
+
+    def __init__(self, hwnd: int, backend: WindowBackend):
+        if sys.platform != "win32":
+            raise OSError("GDI capture is only available on Windows")
+        self.hwnd = hwnd
+        self.backend = backend
+        self._user32 = user32 = ctypes.WinDLL("user32")
+        self._gdi32 = gdi32 = ctypes.WinDLL("gdi32")
+        user32.GetDC.restype = wintypes.HDC
+        user32.GetDC.argtypes = [wintypes.HWND]
+        user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+        gdi32.CreateDIBSection.argtypes = [
+            wintypes.HDC, ctypes.POINTER(_BitmapInfo), wintypes.UINT,
+            ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD,
+        ]  # fmt: skip
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        gdi32.DeleteDC.argtypes = [wintypes.HDC]
+        gdi32.BitBlt.argtypes = [
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD,
+        ]  # fmt: skip
+        self._memory_dc = None
+        self._pixels = None  # The current DIB's pixels; the DIB is freed with the last view
+
+    def client_size(self) -> tuple[int, int]:
+        """Get the window's client width and height."""
+        _, _, width, height = self.backend.get_client_rect(self.hwnd)
+        return width, height
+
+    def allocate(self, width: int, height: int) -> np.ndarray:
+        """Create the DIB section and return a NumPy view of its pixels."""
+        self.close()
+        gdi32 = self._gdi32
+        info = _BitmapInfo()
+        info.biSize = ctypes.sizeof(_BitmapInfo) - ctypes.sizeof(wintypes.DWORD * 3)
+        info.biWidth = width
+        info.biHeight = -height  # Negative height: top-down rows, like a NumPy array
+        info.biPlanes = 1
+        info.biBitCount = 32
+        info.biCompression = BI_RGB
+        bits = ctypes.c_void_p()
+
+        screen_dc = self._user32.GetDC(None)
+        try:
+            memory_dc = gdi32.CreateCompatibleDC(screen_dc)
+            bitmap = gdi32.CreateDIBSection(
+                screen_dc, ctypes.byref(info), DIB_RGB_COLORS, ctypes.byref(bits), None, 0
+            )
+        finally:
+            self._user32.ReleaseDC(None, screen_dc)
+        if not bitmap or not bits.value:
+            _free_dib(gdi32, memory_dc, bitmap, None)
+            raise OSError("CreateDIBSection failed")
+        previous = gdi32.SelectObject(memory_dc, bitmap)
+
+        size = width * height * BYTES_PER_PIXEL
+        pixels = (ctypes.c_uint8 * size).from_address(bits.value)
+        # Frames handed out before a resize may still be read, so the DIB is freed when the
+        # last NumPy view of it is collected rather than when it is replaced
+        weakref.finalize(pixels, _free_dib, gdi32, memory_dc, bitmap, previous)
+        self._memory_dc, self._pixels = memory_dc, pixels
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, BYTES_PER_PIXEL)
+
+    def grab(self, dest_y: int, x: int, y: int, width: int, height: int):
+        """Blit a client rectangle of the window into the DIB."""
+        window_dc = self._user32.GetDC(self.hwnd)
+        try:
+            ok = self._gdi32.BitBlt(
+                self._memory_dc, 0, dest_y, width, height, window_dc, x, y, SRCCOPY | CAPTUREBLT
+            )
+        finally:
+            self._user32.ReleaseDC(self.hwnd, window_dc)
+        if not ok:
+            raise OSError("BitBlt failed")
+
+    def close(self):
+        """Let go of the DIB section; it is freed once no frame refers to it."""
+        self._memory_dc = self._pixels = None
+
+
+def _free_dib(
+    gdi32: "ctypes.WinDLL", memory_dc: int | None, bitmap: int | None, previous: int | None
+):
+    """Free a DIB section and the memory DC it was selected into."""
+    if memory_dc:
+        if previous:
+            gdi32.SelectObject(memory_dc, previous)
+        gdi32.DeleteDC(memory_dc)
+    if bitmap:
+        gdi32.DeleteObject(bitmap)
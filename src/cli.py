@@ -0,0 +1,739 @@
+"""Headless command-line runner for the autoclicker.
+
+Drives the click engine straight from settings given on the command line or in a
+profile, without importing tkinter or customtkinter, so it starts faster and
+stays smaller than the GUI. Global hotkeys pause, resume and stop it; the
+keyboard hook only queues a command, and the main thread acts on it at once.
+Other threads (the remote-control agent) queue functions the same way.
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import functools
+import logging
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from . import __version__, config, logs
+from .autotune import Autotuner, AutotuneStep
+from .burst import BurstController, BurstEvent
+from .clicker import AutoClicker
+from .cookies import CookieSampler, format_count
+from .dispatch import DispatchMode
+from .engine import MultiWindowClicker
+from .geometry import GeometryTracker
+from .macro import MacroClicker, Routine, load_routine
+from .metrics import MetricsServer
+from .profiles import ProfileStore
+from .recorder import SessionRecorder
+from .sampling import SamplingProfiler
+from .scheduler import SchedulerStats
+from .window_finder import WindowRegistry
+
+
+if TYPE_CHECKING:
+    from .shimmer import Detection
+
+
+# Settings a running clicker takes without restarting; other changes start a new session
+LIVE_FIELDS = frozenset({"cps", "relative_x", "relative_y"})
+
+# How long the main thread waits for a command before checking the deadline again;
+# short enough that Ctrl+C is handled promptly on Windows
+POLL_S = 0.2
+
+# Named, not __name__: run with ``python -m src.cli`` this module is __main__,
+# outside the package logger that logs.setup() routes
+logger = logging.getLogger(f"{logs.LOGGER_NAME}.cli")
+
+
+def register_hotkeys(bindings: dict[str, Callable[[], None]]) -> Callable[[], None] | None:
+    """Register global hotkeys, returning a function that removes them.
+
+    Returns None when the ``keyboard`` hook is unavailable (not installed, or not
+    allowed to read the keyboard on this system); the runner then only stops on
+    Ctrl+C or its time limit.
+    """
+    try:
+        import keyboard
+    except ImportError as e:
+        logger.warning("⚠️ Global hotkeys unavailable: %s", e)
+        return None
+
+    handles = []
+    try:
+        for key, callback in bindings.items():
+            handles.append(keyboard.add_hotkey(key, callback, suppress=False))
+    except (ImportError, OSError, ValueError) as e:
+        # On Linux the hook needs root and raises ImportError on first use
+        logger.warning("⚠️ Global hotkeys unavailable: %s", e)
+        for handle in handles:
+            keyboard.remove_hotkey(handle)
+        return None
+
+    def unregister():
+        """Remove the registered hotkeys."""
+        for handle in handles:
+            keyboard.remove_hotkey(handle)
+
+    return unregister
+
+
+class HeadlessRunner:
+    """Runs the autoclicker without a GUI, driven by commands from hotkeys or the caller.
+
+    ``toggle``, ``stop`` and ``submit`` are safe to call from any thread; they only
+    queue a command for ``run`` to act on.
+    """
+
+    def __init__(
+        self,
+        profiles: ProfileStore | None = None,
+        use_profiles: bool = True,
+        routine: Routine | None = None,
+        sampling: bool = False,
+    ):
+        self.profiles = profiles or ProfileStore()
+        self.use_profiles = use_profiles
+        self.routine = routine
+        self.sampling = sampling  # Profile every session while set
+        self.profiler: SamplingProfiler | None = None
+        self.registry = WindowRegistry()
+        self.geometry_tracker = GeometryTracker()
+        self.commands: queue.SimpleQueue[str | Callable[[], None]] = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        self.clicker = None
+        self.clicker_thread: threading.Thread | None = None
+        self.sessions: list[Path] = []
+        self.calibrator = None  # Loaded on first use (needs NumPy)
+        self.autotuner: Autotuner | None = None
+        self.burst_controller: BurstController | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the clicker is currently running."""
+        return self.clicker_thread is not None and self.clicker_thread.is_alive()
+
+    def toggle(self):
+        """Pause the clicker if it runs, resume it otherwise."""
+        self.commands.put("toggle")
+
+    def stop(self):
+        """Stop the clicker and end ``run``."""
+        self.commands.put("stop")
+
+    def toggle_sampling(self):
+        """Switch the profiler on or off."""
+        self.commands.put("sample")
+
+    def submit(self, function: Callable[[], object]) -> Future:
+        """Run a function on the thread executing ``run``, returning its future result."""
+        future = Future()
+
+        def call():
+            """Run the function and hand its outcome to the future."""
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(function())
+            except Exception as e:
+                future.set_exception(e)
+
+        self.commands.put(call)
+        return future
+
+    def apply_settings(self, settings: config.Settings):
+        """Publish new settings, applying them to a running clicker (``run`` thread only).
+
+        Raises ValueError, with nothing published, for an invalid value; if the
+        session cannot be restarted with valid ones, the previous settings are
+        restored and the session resumed with them before the error is raised.
+        """
+        previous = config.current()
+        config.set_current(settings.validate())
+        if not self.running:
+            return
+        changed = {
+            field.name
+            for field in dataclasses.fields(settings)
+            if getattr(settings, field.name) != getattr(previous, field.name)
+        }
+        if changed <= LIVE_FIELDS:
+            self.clicker.update_cps()
+            self.clicker.update_position()
+        else:
+            # The engine, delivery or recording changed: start a new session with them
+            self.pause()
+            error = None
+            try:
+                started = self.start()
+            except Exception as e:
+                started, error = False, e
+            if not started:
+                config.set_current(previous)
+                self.start()
+                reason = error or "game window not found"
+                raise ValueError(
+                    f"Settings not applied, previous ones restored: {reason}"
+                ) from error
+
+    def set_sampling(self, enabled: bool):
+        """Profile the running session from now on, or stop and report (``run`` thread only)."""
+        self.sampling = enabled
+        if not self.running:
+            logger.info("🔬 Profiling %s", "on from the next start" if enabled else "off")
+        elif enabled:
+            self._start_profiler()
+        else:
+            self._finish_profiler()
+
+    def _start_profiler(self):
+        """Sample the click thread and this one while the session runs."""
+        if self.profiler is not None:
+            return
+        self.profiler = SamplingProfiler()
+        self.profiler.add_thread("clicker", self.clicker_thread)
+        self.profiler.add_thread("main")
+        self.profiler.start()
+        logger.info("🔬 Profiling every %g ms", self.profiler.interval_s * 1000)
+
+    def _finish_profiler(self):
+        """Stop the profiler, log its hot spots and write the collapsed stacks."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+        profiler.stop()
+        for line in profiler.report():
+            logger.info(line)
+        try:
+            path = profiler.write_collapsed()
+        except OSError as e:
+            logger.warning("⚠️ Profile not written: %s", e)
+            return
+        logger.info(
+            "🔬 %d samples (%.1f µs each): %s", profiler.samples, profiler.sample_cost_us, path
+        )
+
+    def status(self) -> dict:
+        """Describe the runner: whether it clicks, its settings and the session's telemetry."""
+        telemetry = self.clicker.telemetry.snapshot() if self.clicker else None
+        return {
+            "running": self.running,
+            "hwnd": getattr(self.clicker, "hwnd", None),
+            "settings": dataclasses.asdict(config.current()),
+            "telemetry": dataclasses.asdict(telemetry) if telemetry else None,
+            "sessions": len(self.sessions),
+            "sampling": self.sampling,
+        }
+
+    def start(self) -> bool:
+        """Find the game window and start clicking, returning whether it started."""
+        if self.running:
+            return True
+
+        self.registry.start()
+        hwnd = self.registry.find_window()
+        if not hwnd:
+            logger.error("❌ Game window not found")
+            return False
+
+        # Pick the profile bound to this window size, like the GUI does
+        geometry = self.geometry_tracker.track(hwnd)
+        match = (
+            self.profiles.for_client_size(geometry.width, geometry.height)
+            if self.use_profiles
+            else None
+        )
+        if match:
+            name, settings = match
+            config.set_current(settings)
+            logger.info("📐 Profile '%s' matched %dx%d", name, geometry.width, geometry.height)
+        elif self.use_profiles and config.current().auto_calibrate:
+            # A position chosen on the command line or by a controller is kept as given
+            self._calibrate(hwnd)
+
+        self.stop_event = threading.Event()
+        self.clicker = self._create_clicker(hwnd)
+        self._start_watchers(hwnd)
+        self.clicker_thread = threading.Thread(target=self._run_clicker, daemon=True)
+        self.clicker_thread.start()
+        if self.sampling:
+            self._start_profiler()
+        if self.routine:
+            logger.info(
+                "🧩 Playing routine '%s' (%d steps, %.1f clicks/s)",
+                self.routine.name,
+                len(self.routine.steps),
+                self.routine.steps_per_second,
+            )
+        else:
+            logger.info("🖱️ Autoclicker started (%d CPS)", config.current().cps)
+        return True
+
+    def _create_clicker(self, hwnd: int):
+        """Create the clicker the current settings ask for."""
+        settings = config.current()
+        if self.routine:
+            # A routine plays on the window it was found on, in this process
+            return MacroClicker(
+                hwnd,
+                self.stop_event,
+                self.routine,
+                geometry_tracker=self.geometry_tracker,
+                recorder=self._create_recorder() if settings.record_session else None,
+            )
+        if settings.record_session and (settings.click_all_windows or settings.isolate_engine):
+            logger.warning("⚠️ Recording needs a single window and no process isolation")
+        if settings.click_all_windows:
+            clicker = MultiWindowClicker(
+                self.stop_event,
+                finder=self.registry,
+                on_change=logger.info,
+                geometry_tracker=self.geometry_tracker,
+            )
+            clicker.add_window(hwnd)
+            return clicker
+        if settings.isolate_engine:
+            # Loaded on demand: shared memory and the process machinery slow every other start
+            from .process_host import ProcessClicker
+
+            return ProcessClicker(hwnd, self.stop_event, geometry_tracker=self.geometry_tracker)
+        return AutoClicker(
+            hwnd,
+            self.stop_event,
+            geometry_tracker=self.geometry_tracker,
+            recorder=self._create_recorder() if settings.record_session else None,
+        )
+
+    def _calibrate(self, hwnd: int):
+        """Locate the big cookie (or reuse the result for this window size) and click there."""
+        if self.calibrator is None:
+            try:
+                from .calibration import Calibrator
+            except ImportError as e:
+                # On by default: say so once and turn it off, rather than warn on every start
+                logger.warning("⚠️ Auto-calibration turned off: %s", e)
+                config.update(auto_calibrate=False)
+                return
+            self.calibrator = Calibrator()
+            # A broken cache only means calibrating again
+            with contextlib.suppress(OSError, ValueError):
+                self.calibrator.load()
+
+        geometry = self.geometry_tracker.track(hwnd)
+        try:
+            point = self.calibrator.calibrate(hwnd, geometry.width, geometry.height)
+        except OSError as e:
+            logger.error("❌ Calibration failed: %s", e)
+            return
+        if point is None:
+            logger.error("❌ Big cookie not found, keeping the current position")
+            return
+        config.update(relative_x=point[0], relative_y=point[1])
+        logger.info(
+            "🎯 Big cookie at (%.2f, %.2f) for %dx%d",
+            point[0],
+            point[1],
+            geometry.width,
+            geometry.height,
+        )
+
+    def _start_watchers(self, hwnd: int):
+        """Start the golden cookie watcher, auto-tuner or burst controller the settings ask for."""
+        settings = config.current()
+        self.autotuner = None
+        self.burst_controller = None
+        if settings.click_shimmers:
+            self._start_shimmer_watcher(hwnd)
+        if not (settings.autotune or settings.burst_mode):
+            return
+        if type(self.clicker) is not AutoClicker:
+            logger.warning("⚠️ Auto-tune and burst mode only drive a single in-process clicker")
+            return
+
+        sampler = CookieSampler(
+            hwnd, clicks=functools.partial(getattr, self.clicker.telemetry, "clicks")
+        )
+        # A click buff lasts seconds, so burst mode reads the count more often
+        rate = config.COOKIE_SAMPLE_RATE
+        if settings.burst_mode and not settings.autotune:
+            rate = max(rate, config.BURST_SAMPLE_RATE)
+        threading.Thread(target=sampler.run, args=(self.stop_event, rate), daemon=True).start()
+        if settings.autotune:
+            if settings.burst_mode:
+                logger.warning("⚠️ Burst mode is off while auto-tuning (both set CPS)")
+            self.autotuner = Autotuner(self.clicker, sampler, on_step=self._on_autotune_step)
+            threading.Thread(
+                target=self.autotuner.run, args=(self.stop_event,), daemon=True
+            ).start()
+            logger.info("🧭 Auto-tuning CPS")
+        else:
+            self.burst_controller = BurstController(
+                self.clicker, sampler, on_event=self._on_burst_event
+            )
+            threading.Thread(
+                target=self.burst_controller.run, args=(self.stop_event,), daemon=True
+            ).start()
+            logger.info(
+                "⚡ Watching for click buffs (%d CPS during them)", self.burst_controller.burst_cps
+            )
+
+    def _start_shimmer_watcher(self, hwnd: int):
+        """Watch the game for golden cookies and feed them to the running clicker."""
+        try:
+            from .shimmer import ShimmerWatcher
+        except ImportError as e:
+            logger.error("❌ %s", e)
+            return
+
+        if isinstance(self.clicker, MultiWindowClicker):
+            click = functools.partial(self.clicker.inject_click, hwnd)
+        elif isinstance(self.clicker, AutoClicker):
+            click = self.clicker.inject_click
+        else:
+            logger.warning("⚠️ Golden cookies are not clicked in a separate process")
+            return
+
+        watcher = ShimmerWatcher(hwnd, click, on_click=self._on_shimmer_click)
+        threading.Thread(target=watcher.run, args=(self.stop_event,), daemon=True).start()
+        logger.info("🌟 Watching for golden cookies")
+
+    @staticmethod
+    def _on_shimmer_click(hit: "Detection"):
+        """Log a clicked golden cookie (watcher thread)."""
+        logger.info(
+            "🌟 Golden cookie clicked at (%d, %d)",
+            hit.x,
+            hit.y,
+            extra={"data": dataclasses.asdict(hit)},
+        )
+
+    @staticmethod
+    def _on_autotune_step(step: AutotuneStep):
+        """Log one auto-tune decision (tuner thread)."""
+        # Holding happens every trial; keep it out of the console unless asked for
+        logger.log(
+            logging.DEBUG if step.action == "hold" else logging.INFO,
+            "🧭 %d → %d CPS (%s): %.1f achieved, %s/s return, dispatch %.2f ms",
+            step.cps,
+            step.next_cps,
+            step.action,
+            step.achieved_cps,
+            format_count(step.return_rate),
+            step.dispatch_mean_us / 1000,
+            extra={"data": dataclasses.asdict(step)},
+        )
+
+    @staticmethod
+    def _on_burst_event(event: BurstEvent):
+        """Log a burst starting, extended or ending (burst thread)."""
+        if event.action == "start":
+            message = (
+                f"⚡ Click buff (x{event.ratio:.0f} per click) detected in "
+                f"{event.latency_s:.2f} s, clicking at {event.cps} CPS"
+            )
+        elif event.action == "extend":
+            message = f"⚡ Click buff still on after {event.duration_s:.1f} s, bursting longer"
+        else:
+            message = (
+                f"⚡ Burst over after {event.duration_s:.1f} s: +{event.extra_clicks} clicks, "
+                f"+{format_count(event.extra_cookies)} cookies, back to {event.cps} CPS"
+            )
+        logger.info(message, extra={"data": dataclasses.asdict(event)})
+
+    @staticmethod
+    def _create_recorder() -> SessionRecorder | None:
+        """Start recording the session's clicks, if the data folder is writable."""
+        try:
+            return SessionRecorder.create()
+        except OSError as e:
+            logger.warning("⚠️ Session not recorded: %s", e)
+            return None
+
+    def _run_clicker(self):
+        """Run the clicker until its stop event is set, then write the session summary."""
+        stats = self.clicker.run()
+        try:
+            summary_path = self.clicker.telemetry.write_summary()
+        except OSError:
+            summary_path = None
+        self._log_stats(stats)
+        if summary_path:
+            self.sessions.append(summary_path)
+            logger.info("📝 Session summary: %s", summary_path)
+        recorder = getattr(self.clicker, "recorder", None)
+        if recorder is not None:
+            logger.info("🎞️ Recording: %s (%d clicks)", recorder.path, recorder.count)
+        try:
+            if self.autotuner and self.autotuner.trace:
+                logger.info("🧭 Auto-tune trace: %s", self.autotuner.write_trace())
+            if self.burst_controller and self.burst_controller.trace:
+                logger.info("⚡ Bursts: %s", self.burst_controller.write_trace())
+        except OSError as e:
+            logger.warning("⚠️ Trace not written: %s", e)
+
+    @staticmethod
+    def _log_stats(stats: SchedulerStats | None):
+        """Log what a finished run achieved."""
+        if stats and stats.clicks:
+            logger.info(
+                "📊 %d clicks at %.2f/%d CPS (jitter %.2f ms, skipped %d)",
+                stats.clicks,
+                stats.achieved_cps,
+                stats.target_cps,
+                stats.jitter_us / 1000,
+                stats.skipped,
+            )
+
+    def pause(self):
+        """Stop clicking and wait for the session summary to be written."""
+        if self.clicker_thread is None:
+            return
+        self.stop_event.set()
+        self.clicker_thread.join()
+        self.clicker_thread = None
+        self._finish_profiler()
+
+    def run(self, duration_s: float | None = None, paused: bool = False) -> int:
+        """Act on commands until stopped or the duration has passed; returns an exit code."""
+        if not paused and not self.start():
+            self.registry.stop()
+            return 1
+        deadline = time.monotonic() + duration_s if duration_s is not None else None
+        try:
+            while True:
+                timeout = POLL_S
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    timeout = min(timeout, remaining)
+                try:
+                    command = self.commands.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if callable(command):
+                    command()
+                    continue
+                if command == "stop":
+                    break
+                if command == "sample":
+                    self.set_sampling(not self.sampling)
+                    continue
+                if self.running:
+                    self.pause()
+                    logger.info("⏸️ Autoclicker paused")
+                else:
+                    self.start()
+        except KeyboardInterrupt:
+            logger.info("⌨️ Interrupted")
+        finally:
+            self.pause()
+            self.registry.stop()
+            logger.info("✅ Autoclicker stopped")
+        return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
+    parser = argparse.ArgumentParser(
+        prog="cookie-clicker-headless",
+        description="Run the Cookie Clicker autoclicker without a GUI.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--profile", help="start from a saved profile instead of the defaults")
+    parser.add_argument(
+        "--macro",
+        metavar="ROUTINE",
+        help="play a click routine (a name in the macros folder or a .json path) instead",
+    )
+    parser.add_argument("--cps", type=int, help="clicks per second")
+    parser.add_argument("--x", type=float, help="click X as a fraction of the window width")
+    parser.add_argument("--y", type=float, help="click Y as a fraction of the window height")
+    parser.add_argument(
+        "--dispatch", choices=[mode.value for mode in DispatchMode], help="how clicks are delivered"
+    )
+    parser.add_argument(
+        "--all-windows",
+        action=argparse.BooleanOptionalAction,
+        help="click every open game window",
+    )
+    parser.add_argument(
+        "--isolate",
+        action=argparse.BooleanOptionalAction,
+        help="run the click engine in its own process",
+    )
+    parser.add_argument(
+        "--record",
+        action=argparse.BooleanOptionalAction,
+        help="record every click for python -m src.analyzer",
+    )
+    parser.add_argument(
+        "--metrics",
+        action=argparse.BooleanOptionalAction,
+        help="serve click metrics for Prometheus on localhost",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=config.METRICS_PORT,
+        help="port of the metrics endpoint (one per instance; 0 picks a free one)",
+    )
+    parser.add_argument(
+        "--listen",
+        type=int,
+        nargs="?",
+        const=config.AGENT_PORT,
+        metavar="PORT",
+        help=f"take commands from python -m src.remote on this port (default {config.AGENT_PORT})",
+    )
+    parser.add_argument(
+        "--duration", type=float, help="stop after this many seconds (default: until stopped)"
+    )
+    parser.add_argument(
+        "--paused", action="store_true", help="wait for the pause key before clicking"
+    )
+    parser.add_argument("--stop-key", default=config.STOP_KEY, help="global hotkey that stops")
+    parser.add_argument(
+        "--pause-key", default=config.PAUSE_KEY, help="global hotkey that pauses and resumes"
+    )
+    parser.add_argument(
+        "--sample-key",
+        default=config.SAMPLING_KEY,
+        help="global hotkey that switches the profiler on and off",
+    )
+    parser.add_argument(
+        "--sample",
+        action="store_true",
+        help="profile the click and main threads from the start (collapsed stacks on stop)",
+    )
+    parser.add_argument("--no-hotkeys", action="store_true", help="do not hook the keyboard")
+    parser.add_argument("--log-level", default=config.LOG_LEVEL, choices=logs.LEVELS)
+    parser.add_argument(
+        "--simulated",
+        action="store_true",
+        help="click a simulated game window (for trying the runner on any platform)",
+    )
+    return parser
+
+
+def overrides_from_args(args: argparse.Namespace) -> dict:
+    """Get the settings given explicitly on the command line."""
+    changes = {
+        "cps": args.cps,
+        "relative_x": args.x,
+        "relative_y": args.y,
+        "dispatch_mode": args.dispatch,
+        "click_all_windows": args.all_windows,
+        "isolate_engine": args.isolate,
+        "record_session": args.record,
+        "serve_metrics": args.metrics,
+    }
+    return {field: value for field, value in changes.items() if value is not None}
+
+
+def settings_from_args(args: argparse.Namespace, profiles: ProfileStore) -> config.Settings:
+    """Build the settings snapshot from a profile and the options that override it."""
+    settings = config.current()
+    if args.profile:
+        profile = profiles.get(args.profile)
+        if profile is None:
+            raise ValueError(f"Profile '{args.profile}' not found")
+        settings = profile
+    # The GUI owns the overlay
+    return settings.replace(show_overlay=False, **overrides_from_args(args)).validate()
+
+
+def start_metrics_server(port: int) -> MetricsServer | None:
+    """Serve the metrics endpoint, or log why it cannot be."""
+    server = MetricsServer(port)
+    try:
+        server.start()
+    except OSError as e:
+        logger.warning("⚠️ Metrics not served: %s", e)
+        return None
+    logger.info("📈 Metrics at %s", server.url)
+    return server
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the headless autoclicker from command-line arguments."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.cps is not None and args.cps < 1:
+        parser.error("--cps must be at least 1")
+    logs.setup(level=args.log_level, console=True)
+
+    if args.simulated:
+        if args.isolate:
+            parser.error("--isolate cannot reach a simulated window from another process")
+        from .backend import set_backend
+        from .simulated import SimulatedBackend
+
+        backend = SimulatedBackend()
+        backend.create_game_window()
+        set_backend(backend)
+
+    profiles = ProfileStore()
+    try:
+        settings = settings_from_args(args, profiles.load())
+        routine = load_routine(args.macro) if args.macro else None
+    except ValueError as e:
+        logger.error("❌ %s", e)
+        return 2
+    config.set_current(settings)
+
+    # Settings chosen on the command line win over a profile bound to the window size
+    runner = HeadlessRunner(
+        profiles,
+        use_profiles=not args.profile and not overrides_from_args(args),
+        routine=routine,
+        sampling=args.sample,
+    )
+    metrics_server = start_metrics_server(args.metrics_port) if settings.serve_metrics else None
+    agent = None
+    if args.listen is not None:
+        from .remote import Agent
+
+        agent = Agent(runner, args.listen)
+        try:
+            agent.start()
+        except OSError as e:
+            logger.error("❌ Cannot listen on port %d: %s", args.listen, e)
+            return 1
+    unregister = None
+    if not args.no_hotkeys:
+        unregister = register_hotkeys(
+            {
+                args.stop_key: runner.stop,
+                args.pause_key: runner.toggle,
+                args.sample_key: runner.toggle_sampling,
+            }
+        )
+        if unregister:
+            logger.info(
+                "⌨️ %s pauses/resumes, %s profiles, %s stops",
+                args.pause_key,
+                args.sample_key,
+                args.stop_key,
+            )
+    try:
+        return runner.run(args.duration, paused=args.paused)
+    finally:
+        if unregister:
+            unregister()
+        if metrics_server:
+            metrics_server.stop()
+        if agent:
+            agent.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
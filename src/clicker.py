@@ -2,53 +2,142 @@
 
 import threading
 import time
+from collections import deque
+from collections.abc import Callable
 
-import win32api
-import win32con
-import win32gui
-
-from . import config
+from . import config, metrics
+from .backend import MK_LBUTTON, WM_LBUTTONDOWN, WM_LBUTTONUP, WindowBackend, get_backend
+from .dispatch import ClickDispatcher, HangEvent, pack_point
+from .geometry import GeometryTracker, WindowGeometry
+from .recorder import KIND_INJECTED, SessionRecorder
+from .scheduler import CatchUpPolicy, ClickScheduler, SchedulerStats, high_resolution_timer
+from .telemetry import ClickTelemetry
 
 
 class AutoClicker:
     """Responsible for sending automatic clicks to the game window."""
 
-    def __init__(self, hwnd: int, stop_event: threading.Event):
+    def __init__(
+        self,
+        hwnd: int,
+        stop_event: threading.Event,
+        policy: CatchUpPolicy = CatchUpPolicy.SKIP,
+        geometry_tracker: GeometryTracker | None = None,
+        backend: WindowBackend | None = None,
+        on_dispatch_event: Callable[[HangEvent], None] | None = None,
+        recorder: SessionRecorder | None = None,
+    ):
         self.hwnd = hwnd
         self.stop_event = stop_event
-        self.click_delay = 1.0 / config.CPS
-        self.click_x, self.click_y = self._calculate_cookie_position()
+        self.backend = backend or get_backend()
+        self.geometry_tracker = geometry_tracker or GeometryTracker(self.backend)
+        self._geometry = self.geometry_tracker.track(hwnd)
+        settings = config.current()
+        self.click_delay = 1.0 / settings.cps
+        # (x, y) in client coordinates, swapped as one tuple so a click never mixes old and new
+        self.click_point = self._calculate_cookie_position()
+        # The click point packed into a message lParam once, not on every click
+        self.l_param = pack_point(*self.click_point)
+        self.dispatcher = ClickDispatcher(
+            hwnd, self.backend, settings.dispatch_mode, on_event=on_dispatch_event
+        )
+        self.scheduler = ClickScheduler(self.send_click, settings.cps, stop_event, policy)
+        self.telemetry = ClickTelemetry(settings.cps)
+        # One-off clicks (x, y, requested_ns) sent ahead of the next regular click
+        self.injected: deque[tuple[int, int, int]] = deque()
+        # Every click is appended here when recording; the recording ends with run()
+        self.recorder = recorder
+        metrics.REGISTRY.add_clicker(self)
+
+    @property
+    def geometry(self) -> WindowGeometry:
+        """Latest geometry of the game window."""
+        return self.geometry_tracker.get(self.hwnd) or self._geometry
+
+    @property
+    def click_x(self) -> int:
+        """Client X coordinate of the click point."""
+        return self.click_point[0]
+
+    @property
+    def click_y(self) -> int:
+        """Client Y coordinate of the click point."""
+        return self.click_point[1]
 
     def _calculate_cookie_position(self) -> tuple[int, int]:
         """Calculate the position of the 'big cookie' using relative coordinates."""
-        client_rect = win32gui.GetClientRect(self.hwnd)
-        x = int(client_rect[2] * config.BIG_COOKIE_RELATIVE_X)
-        y = int(client_rect[3] * config.BIG_COOKIE_RELATIVE_Y)
-        return x, y
+        settings = config.current()
+        return self.geometry.client_point(settings.relative_x, settings.relative_y)
+
+    def _on_geometry_changed(self, geometry: WindowGeometry):
+        """Follow the cookie when the game window is moved or resized."""
+        if geometry.hwnd == self.hwnd:
+            self.update_position()
 
     def update_position(self):
         """Update the click position based on current configuration."""
-        self.click_x, self.click_y = self._calculate_cookie_position()
+        self.click_point = point = self._calculate_cookie_position()
+        self.l_param = pack_point(*point)
 
     def update_cps(self):
         """Update the delay between clicks based on current configuration."""
-        self.click_delay = 1.0 / config.CPS
+        cps = config.current().cps
+        self.click_delay = 1.0 / cps
+        self.scheduler.set_cps(cps)
+        self.telemetry.set_target_cps(cps)
 
     def get_screen_position(self) -> tuple[int, int]:
         """Get the screen coordinates of the click point."""
-        return win32gui.ClientToScreen(self.hwnd, (self.click_x, self.click_y))
+        return self.geometry.to_screen(*self.click_point)
+
+    def inject_click(self, x: int, y: int, requested_ns: int | None = None):
+        """Queue a one-off click at client coordinates (safe to call from any thread)."""
+        self.injected.append((x, y, requested_ns or time.perf_counter_ns()))
+
+    def _send_injected(self):
+        """Send the queued one-off clicks."""
+        injected = self.injected
+        while injected:
+            x, y, requested_ns = injected.popleft()
+            start_ns = time.perf_counter_ns()
+            delivered = self.dispatcher.click(x, y)
+            if delivered:
+                self.telemetry.record_injected(requested_ns, start_ns)
+            if self.recorder is not None:
+                self.recorder.record(
+                    start_ns,
+                    self.hwnd,
+                    pack_point(x, y),
+                    time.perf_counter_ns() - start_ns,
+                    delivered,
+                    KIND_INJECTED,
+                )
 
     def send_click(self):
         """Send a click to the cookie position."""
-        # Client coordinates (relative to the window)
-        l_param = (self.click_y << 16) | self.click_x
+        if self.injected:
+            self._send_injected()
+        l_param = self.l_param
+        start_ns = time.perf_counter_ns()
+        delivered = self.dispatcher.send(WM_LBUTTONDOWN, MK_LBUTTON, WM_LBUTTONUP, l_param)
+        end_ns = time.perf_counter_ns()
+        # Only clicks the game actually handled count towards the achieved rate
+        if delivered:
+            self.telemetry.record_click(start_ns, end_ns)
+        if self.recorder is not None:
+            self.recorder.record(start_ns, self.hwnd, l_param, end_ns - start_ns, delivered)
 
-        # Use SendMessage to ensure the message is processed immediately
-        win32api.SendMessage(self.hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, l_param)
-        win32api.SendMessage(self.hwnd, win32con.WM_LBUTTONUP, 0, l_param)
+    def get_stats(self) -> SchedulerStats:
+        """Get the achieved click rate and timing jitter."""
+        return self.scheduler.stats()
 
-    def run(self):
+    def run(self) -> SchedulerStats:
         """Execute the main autoclicker loop."""
-        while not self.stop_event.is_set():
-            self.send_click()
-            time.sleep(self.click_delay)
+        self.geometry_tracker.listeners.append(self._on_geometry_changed)
+        try:
+            with high_resolution_timer():
+                return self.scheduler.run()
+        finally:
+            self.geometry_tracker.listeners.remove(self._on_geometry_changed)
+            if self.recorder is not None:
+                self.recorder.close()
@@ -1,10 +1,125 @@
 """Configuration settings for the Cookie Clicker autoclicker."""
 
+import dataclasses
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
 # ======================
 # MAIN CONFIGURATION
 # ======================
 CPS = 15  # Clicks per second (adjustable)
 BIG_COOKIE_RELATIVE_X = 0.15  # Relative X position of the big cookie (15% of width)
 BIG_COOKIE_RELATIVE_Y = 0.39  # Relative Y position of the big cookie (39% of height)
+CLICK_ALL_WINDOWS = False  # Drive every matching game window instead of the first one
+DISPATCH_MODE = "timeout"  # "sync", "timeout" (bounded wait) or "async" (never blocks)
+DISPATCH_MODES = ("sync", "timeout", "async")
+DISPATCH_TIMEOUT_MS = 50  # Clicks slower than this mark the game window as unresponsive
+ISOLATE_ENGINE = False  # Run the click loop in its own process, away from the GUI
+CLICK_SHIMMERS = False  # Watch the screen for golden cookies and click them (needs NumPy)
+AUTO_CALIBRATE = True  # Locate the big cookie on screen when a window size is new (needs NumPy)
+AUTOTUNE = False  # Find the highest CPS the game still rewards, instead of a fixed CPS
+BURST_MODE = False  # Click at BURST_CPS while a click buff (Click Frenzy, Dragonflight) is on
+BURST_CPS = 50  # Click rate during a click buff
+BURST_DURATION_S = 13.0  # Expected length of a click buff (Click Frenzy without upgrades)
+BURST_SAMPLE_RATE = 10.0  # Cookie count reads per second while burst mode watches for buffs
+RECORD_SESSION = False  # Record every click to a binary file for offline analysis
+SERVE_METRICS = False  # Serve click metrics for Prometheus on localhost
+METRICS_HOST = "127.0.0.1"  # Only reachable from this machine
+METRICS_PORT = 9464  # Give each bot instance on a machine its own port
+AGENT_HOST = "127.0.0.1"  # Remote-control agents only accept local controllers
+AGENT_PORT = 9470  # Default port of a remote-control agent
+COOKIE_SAMPLE_RATE = 2.0  # Times per second the cookie count is read from the window title
 SHOW_OVERLAY = True  # Show visual overlay with click point
-STOP_KEY = "f1"  # Key to stop the autoclicker
+STOP_KEY = "f1"  # Global hotkey that stops the headless runner
+PAUSE_KEY = "f2"  # Global hotkey that pauses and resumes the headless runner
+SAMPLING_KEY = "f3"  # Global hotkey that switches the headless runner's profiler on and off
+SAMPLING_INTERVAL_MS = 10  # Interval at which the profiler samples the click and GUI threads
+
+# ======================
+# USER DATA
+# ======================
+DATA_DIR = Path.home() / ".cookie-clicker-bot"  # Profiles, logs and session data
+PROFILES_FILE = DATA_DIR / "profiles.json"
+CALIBRATION_FILE = DATA_DIR / "calibration.json"
+MACROS_DIR = DATA_DIR / "macros"  # Click routines, one JSON file each
+
+# ======================
+# LOGGING
+# ======================
+LOG_LEVEL = "INFO"  # Lowest level shown in the GUI log
+LOG_FILE_LEVEL = "DEBUG"  # Lowest level written to the log file
+LOG_FILE = DATA_DIR / "logs" / "bot.jsonl"  # JSON lines, rotated by size
+LOG_FILE_MAX_BYTES = 1_000_000
+LOG_FILE_BACKUPS = 3
+LOG_RING_SIZE = 500  # Lines kept in memory and in the GUI log
+LOG_QUEUE_SIZE = 10_000  # Records waiting for the file writer before new ones are dropped
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable snapshot of the runtime settings.
+
+    Settings are never mutated in place: a change builds a new snapshot that is
+    published with a single reference swap, so a reader always sees a complete,
+    consistent set of values.
+    """
+
+    cps: int = CPS
+    relative_x: float = BIG_COOKIE_RELATIVE_X
+    relative_y: float = BIG_COOKIE_RELATIVE_Y
+    show_overlay: bool = SHOW_OVERLAY
+    click_all_windows: bool = CLICK_ALL_WINDOWS
+    dispatch_mode: str = DISPATCH_MODE
+    isolate_engine: bool = ISOLATE_ENGINE
+    click_shimmers: bool = CLICK_SHIMMERS
+    auto_calibrate: bool = AUTO_CALIBRATE
+    autotune: bool = AUTOTUNE
+    burst_mode: bool = BURST_MODE
+    burst_cps: int = BURST_CPS
+    record_session: bool = RECORD_SESSION
+    serve_metrics: bool = SERVE_METRICS
+
+    def replace(self, **changes) -> "Settings":
+        """Return a copy of the snapshot with some values changed."""
+        return dataclasses.replace(self, **changes)
+
+    def validate(self) -> "Settings":
+        """Check the type and range of every value, raising ValueError for the first bad one."""
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            # A flag must be a bool, and a number must not be one (bool is an int)
+            expected = (int, float) if field.type is float else field.type
+            if isinstance(value, bool) != (field.type is bool) or not isinstance(value, expected):
+                raise ValueError(f"{field.name} must be {field.type.__name__}, not {value!r}")
+        if self.cps < 1 or self.burst_cps < 1:
+            raise ValueError("cps and burst_cps must be at least 1")
+        if not (0 <= self.relative_x <= 1 and 0 <= self.relative_y <= 1):
+            raise ValueError("relative_x and relative_y must be between 0 and 1")
+        if self.dispatch_mode not in DISPATCH_MODES:
+            raise ValueError(f"dispatch_mode must be one of {', '.join(DISPATCH_MODES)}")
+        return self
+
+
+_current = Settings()
+_write_lock = threading.Lock()
+
+
+def current() -> Settings:
+    """Get the current settings snapshot (lock-free, a single reference load)."""
+    return _current
+
+
+def set_current(settings: Settings) -> Settings:
+    """Publish a complete settings snapshot."""
+    global _current
+    _current = settings
+    return settings
+
+
+def update(**changes) -> Settings:
+    """Publish a new snapshot with some values changed."""
+    # Writers serialize so concurrent updates don't lose each other's changes
+    with _write_lock:
+        return set_current(_current.replace(**changes))
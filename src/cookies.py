@@ -0,0 +1,257 @@
+"""Module for reading the cookie count from the game's window title.
+
+The game keeps its title at "<count> cookies - Cookie Clicker", so the bank can
+be followed without looking at the screen. Counts are written either in full
+("1,234,567") or with a suffix ("72.197 million", "1.5 Qa", "3.2 quindecillion"),
+using "," or "." as the thousands separator depending on the locale.
+"""
+
+import math
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from . import config
+from .backend import WindowBackend, get_backend
+from .scheduler import period_for, wait_until
+
+
+def _suffixes(first: list[str], prefixes: list[str], tens: list[str]) -> list[str]:
+    """Build the suffix list the way the game does: named powers, then prefix x tens."""
+    return first + [prefix + ten for ten in tens for prefix in prefixes]
+
+
+# Suffixes for 10^3, 10^6, 10^9... in the order the game uses them
+LONG_SUFFIXES = _suffixes(
+    [
+        "thousand", "million", "billion", "trillion", "quadrillion",
+        "quintillion", "sextillion", "septillion", "octillion", "nonillion",
+    ],
+    ["", "un", "duo", "tre", "quattuor", "quin", "sex", "septen", "octo", "novem"],
+    [
+        "decillion", "vigintillion", "trigintillion", "quadragintillion", "quinquagintillion",
+        "sexagintillion", "septuagintillion", "octogintillion", "nonagintillion",
+    ],
+)  # fmt: skip
+SHORT_SUFFIXES = _suffixes(
+    ["k", "M", "B", "T", "Qa", "Qi", "Sx", "Sp", "Oc", "No"],
+    ["", "Un", "Do", "Tr", "Qa", "Qi", "Sx", "Sp", "Oc", "No"],
+    ["D", "V", "T", "Qa", "Qi", "Sx", "Sp", "O", "N"],
+)
+
+
+def _multipliers() -> dict[str, float]:
+    """Map every suffix to its value (a short one the game reuses, like "T", keeps the smallest)."""
+    multipliers: dict[str, float] = {}
+    for suffixes in (LONG_SUFFIXES, SHORT_SUFFIXES):
+        for power, suffix in enumerate(suffixes, start=1):
+            multipliers.setdefault(suffix, 10.0 ** (3 * power))
+    return multipliers
+
+
+MULTIPLIERS = _multipliers()
+
+# "[G] 72.197 million cookies - Cookie Clicker", with the optional pieces the game adds:
+# bracketed flags, "Ascending!", scientific notation and the April fools' "Cookie Baker".
+# Any word is accepted as a suffix here (one alternation of every suffix is several times
+# slower to match) and checked against MULTIPLIERS when parsing.
+TITLE_PATTERN = re.compile(
+    r"^(?:\[\w+\]\s*)*(?:Ascending!\s*)?"
+    r"(?P<number>\d[\d,.]*)(?:e\+?(?P<exponent>\d+))?\s*"
+    r"(?P<suffix>[a-z]+)?"
+    r"\s*cookies?\s*-\s*Cookie (?:Clicker|Baker)$",
+    re.IGNORECASE,
+)
+
+# Samples kept by default, and the span rates are measured over
+DEFAULT_CAPACITY = 1024
+DEFAULT_WINDOW_S = 10.0
+
+
+def parse_number(text: str, has_suffix: bool = False) -> float:
+    """Parse a number written with either "," or "." as the thousands separator.
+
+    When both appear, the last one is the decimal point. A single separator is a
+    decimal point before a suffix ("72.197 million") or when it is not followed by
+    exactly three digits; otherwise ("1,234" or "1.234") it separates thousands.
+    """
+    last_comma, last_dot = text.rfind(","), text.rfind(".")
+    decimal = None
+    if last_comma >= 0 and last_dot >= 0:
+        decimal = "," if last_comma > last_dot else "."
+    elif text.count(",") + text.count(".") == 1:
+        position = max(last_comma, last_dot)
+        if has_suffix or len(text) - position - 1 != 3:
+            decimal = text[position]
+    if decimal is None:
+        return float(text.replace(",", "").replace(".", ""))
+    thousands = "." if decimal == "," else ","
+    return float(text.replace(thousands, "").replace(decimal, "."))
+
+
+def parse_cookie_count(title: str) -> float | None:
+    """Get the number of cookies shown in a game window title, or None if it shows none."""
+    match = TITLE_PATTERN.match(title)
+    if match is None:
+        return None
+    number, exponent, suffix = match.group("number", "exponent", "suffix")
+    value = parse_number(number, has_suffix=suffix is not None or exponent is not None)
+    if exponent:
+        value *= 10.0 ** int(exponent)
+    if suffix:
+        multiplier = MULTIPLIERS.get(suffix) or MULTIPLIERS.get(suffix.lower())
+        if multiplier is None:
+            return None  # Not a suffix the game writes
+        value *= multiplier
+    return value
+
+
+def format_count(value: float) -> str:
+    """Format a cookie count compactly with the game's short suffixes."""
+    if value < 1_000_000:
+        return f"{value:,.0f}"
+    if math.isinf(value):
+        return "Infinity"
+    power = int(math.log10(value)) // 3
+    if power > len(SHORT_SUFFIXES):
+        return f"{value:.3e}"
+    return f"{value / 10.0 ** (3 * power):.3f} {SHORT_SUFFIXES[power - 1]}"
+
+
+@dataclass(frozen=True, slots=True)
+class CookieStats:
+    """Point-in-time view of the sampled cookie count."""
+
+    cookies: float
+    cookies_per_second: float  # Cookies gained per second (spending is not subtracted)
+    cookies_per_click: float  # Cookies gained per click sent, passive income included
+    samples: int
+    unreadable: int  # Titles that held no cookie count
+
+
+class CookieSampler:
+    """Polls a game window's title into a fixed-size ring of (time, count, clicks) samples.
+
+    ``clicks`` returns the number of clicks sent so far (for example
+    ``ClickTelemetry.clicks``); without it the gain per click is not measured.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        backend: WindowBackend | None = None,
+        clicks: Callable[[], int] | None = None,
+        capacity: int = DEFAULT_CAPACITY,
+    ):
+        self.hwnd = hwnd
+        self.backend = backend or get_backend()
+        self.clicks = clicks
+        self.capacity = capacity
+        self._times = array("q", bytes(8 * capacity))
+        self._counts = array("d", bytes(8 * capacity))
+        self._clicks = array("q", bytes(8 * capacity))
+        self.samples = 0  # Total ever taken; the ring holds the last `capacity`
+        self.unreadable = 0
+        self._title = ""
+        self._count: float | None = None
+
+    def sample(self) -> float | None:
+        """Read the title once and store the count, returning it (None if unreadable)."""
+        title = self.backend.get_window_text(self.hwnd)
+        if title != self._title:
+            # Titles only change when the bank does, so most samples skip the parse
+            self._title = title
+            self._count = parse_cookie_count(title)
+        if self._count is None:
+            self.unreadable += 1
+            return None
+        index = self.samples % self.capacity
+        self._times[index] = time.perf_counter_ns()
+        self._counts[index] = self._count
+        self._clicks[index] = self.clicks() if self.clicks else 0
+        self.samples += 1
+        return self._count
+
+    def run(self, stop_event: threading.Event, rate: float = config.COOKIE_SAMPLE_RATE):
+        """Sample the title at the given rate (per second) until the stop event is set."""
+        period_ns = period_for(rate)
+        deadline = time.perf_counter_ns()
+        while wait_until(deadline, stop_event, 0):
+            self.sample()
+            deadline = max(deadline + period_ns, time.perf_counter_ns())
+
+    def series(self) -> list[tuple[int, float]]:
+        """Get the stored samples as (perf_counter_ns, cookies), oldest first."""
+        return [(self._times[i], self._counts[i]) for i in self._indices(0)]
+
+    def _indices(self, since_ns: int) -> list[int]:
+        """Ring indices of the stored samples taken at or after a time, oldest first."""
+        count = min(self.samples, self.capacity)
+        start = self.samples - count
+        indices = [(start + offset) % self.capacity for offset in range(count)]
+        first = bisect_left(indices, since_ns, key=self._times.__getitem__)
+        return indices[min(first, count - 1) :]
+
+    def gains(self, since_ns: int = 0) -> list[tuple[int, float, int]]:
+        """Get (perf_counter_ns, cookies gained, clicks sent) from each stored sample to the next.
+
+        Only steps ending after ``since_ns`` are returned, oldest first, so a
+        caller can follow the count by passing the time of the last step it saw.
+        Losses (purchases) count as no gain.
+        """
+        indices = self._indices(0)
+        times, counts, clicks = self._times, self._counts, self._clicks
+        first = max(1, bisect_right(indices, since_ns, key=times.__getitem__))
+        return [
+            (
+                times[current],
+                max(0.0, counts[current] - counts[previous]),
+                clicks[current] - clicks[previous],
+            )
+            for previous, current in zip(indices[first - 1 :], indices[first:], strict=False)
+        ]
+
+    def _gain(self, window_s: float) -> tuple[float, float, int]:
+        """Cookies gained, seconds elapsed and clicks sent over the most recent window.
+
+        Only increases count as gains, so buying something does not read as a loss
+        of income.
+        """
+        if self.samples < 2:
+            return 0.0, 0.0, 0
+        newest = (self.samples - 1) % self.capacity
+        indices = self._indices(self._times[newest] - int(window_s * 1_000_000_000))
+        counts = self._counts
+        gained = sum(
+            max(0.0, counts[current] - counts[previous])
+            for previous, current in zip(indices, indices[1:], strict=False)
+        )
+        first, last = indices[0], indices[-1]
+        elapsed_s = (self._times[last] - self._times[first]) / 1_000_000_000
+        return gained, elapsed_s, self._clicks[last] - self._clicks[first]
+
+    def cookies_per_second(self, window_s: float = DEFAULT_WINDOW_S) -> float:
+        """Cookies gained per second over the most recent window."""
+        gained, elapsed_s, _ = self._gain(window_s)
+        return gained / elapsed_s if elapsed_s > 0 else 0.0
+
+    def cookies_per_click(self, window_s: float = DEFAULT_WINDOW_S) -> float:
+        """Cookies gained per click sent over the most recent window."""
+        gained, _, clicks = self._gain(window_s)
+        return gained / clicks if clicks > 0 else 0.0
+
+    def snapshot(self, window_s: float = DEFAULT_WINDOW_S) -> CookieStats:
+        """Get the latest count and the rates derived from it."""
+        gained, elapsed_s, clicks = self._gain(window_s)
+        latest = self._counts[(self.samples - 1) % self.capacity] if self.samples else 0.0
+        return CookieStats(
+            cookies=latest,
+            cookies_per_second=gained / elapsed_s if elapsed_s > 0 else 0.0,
+            cookies_per_click=gained / clicks if clicks > 0 else 0.0,
+            samples=self.samples,
+            unreadable=self.unreadable,
+        )
@@ -0,0 +1,194 @@
+"""Module for delivering clicks without letting a stalled game block the bot."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+from . import config
+from .backend import MK_LBUTTON, WM_LBUTTONDOWN, WM_LBUTTONUP, WindowBackend
+
+
+# Clicks that may be in flight at once in ASYNC mode
+DEFAULT_MAX_OUTSTANDING = 4
+
+# Retry interval while the window is unresponsive: doubles up to the maximum
+BACKOFF_MIN_NS = 50_000_000
+BACKOFF_MAX_NS = 2_000_000_000
+
+# Number of hang/recovery events kept for inspection
+EVENT_HISTORY = 64
+
+
+def pack_point(x: int, y: int) -> int:
+    """Pack client coordinates into a mouse message's lParam."""
+    return (y << 16) | x
+
+
+class DispatchMode(StrEnum):
+    """How click messages are delivered to the game window."""
+
+    SYNC = "sync"  # SendMessage: blocks for as long as the game takes
+    TIMEOUT = "timeout"  # SendMessageTimeout with abort-if-hung
+    ASYNC = "async"  # SendMessageCallback with a cap on clicks in flight
+
+
+@dataclass(frozen=True, slots=True)
+class HangEvent:
+    """The game window stopped or resumed answering."""
+
+    kind: str  # "hang" or "recover"
+    hwnd: int
+    at_ns: int  # perf_counter_ns timestamp
+    duration_ms: float = 0.0  # For "recover": how long the window was unresponsive
+
+
+class ClickDispatcher:
+    """Delivers clicks to one window and backs off while it is unresponsive.
+
+    ``click()`` never blocks for longer than the timeout (TIMEOUT mode) or at all
+    (ASYNC mode). While the window is hung, clicks are dropped instead of piling
+    up, and a single probe click is retried on an exponential backoff.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        backend: WindowBackend,
+        mode: DispatchMode = DispatchMode.TIMEOUT,
+        timeout_ms: int = config.DISPATCH_TIMEOUT_MS,
+        max_outstanding: int = DEFAULT_MAX_OUTSTANDING,
+        on_event: Callable[[HangEvent], None] | None = None,
+    ):
+        self.hwnd = hwnd
+        self.backend = backend
+        self.mode = DispatchMode(mode)
+        self.timeout_ms = timeout_ms
+        self.max_outstanding = max(1, max_outstanding)
+        self.on_event = on_event
+        self.events: deque[HangEvent] = deque(maxlen=EVENT_HISTORY)
+
+        self.delivered = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.hangs = 0
+        self.recoveries = 0
+
+        self.hung = False
+        self._hung_since_ns = 0
+        self._backoff_ns = BACKOFF_MIN_NS
+        self._next_probe_ns = 0
+        # Send times of the ASYNC clicks still in flight, oldest first
+        self._in_flight: deque[int] = deque()
+
+    @property
+    def outstanding(self) -> int:
+        """Number of ASYNC clicks not yet handled by the window."""
+        return len(self._in_flight)
+
+    def click(self, x: int, y: int) -> bool:
+        """Deliver one left click; returns False if it was dropped or timed out."""
+        return self.send(WM_LBUTTONDOWN, MK_LBUTTON, WM_LBUTTONUP, pack_point(x, y))
+
+    def send(self, down: int, buttons: int, up: int, l_param: int) -> bool:
+        """Deliver one press/release pair with ready-made message parameters.
+
+        ``down`` and ``up`` are the button messages, ``buttons`` the key-state flags
+        sent with the press and ``l_param`` the packed client coordinates.
+        """
+        now = time.perf_counter_ns()
+        if self.hung and now < self._next_probe_ns:
+            self.dropped += 1
+            return False
+
+        if self.mode is DispatchMode.SYNC:
+            ok = self._click_sync(down, buttons, up, l_param)
+        elif self.mode is DispatchMode.TIMEOUT:
+            ok = self._click_timeout(down, buttons, up, l_param)
+        else:
+            ok = self._click_async(down, buttons, up, l_param, now)
+            if ok is None:
+                self.dropped += 1
+                return False
+
+        if ok:
+            self.delivered += 1
+            if self.hung:
+                self._recover(time.perf_counter_ns())
+        else:
+            self._fail(time.perf_counter_ns())
+        return ok
+
+    def _click_sync(self, down: int, buttons: int, up: int, l_param: int) -> bool:
+        """Blocking delivery: SendMessage waits for as long as the game takes."""
+        send_message = self.backend.send_message
+        send_message(self.hwnd, down, buttons, l_param)
+        send_message(self.hwnd, up, 0, l_param)
+        return True
+
+    def _click_timeout(self, down: int, buttons: int, up: int, l_param: int) -> bool:
+        """Timeout-bounded delivery that returns at once if the window is hung."""
+        send = self.backend.send_message_timeout
+        pressed = send(self.hwnd, down, buttons, l_param, self.timeout_ms)
+        # Always release the button, but don't wait long if the press already failed
+        released = send(self.hwnd, up, 0, l_param, self.timeout_ms if pressed else 0)
+        if not (pressed and released):
+            self.timeouts += 1
+            return False
+        return True
+
+    def _click_async(self, down: int, buttons: int, up: int, l_param: int, now: int) -> bool | None:
+        """Non-blocking delivery with a cap on clicks in flight.
+
+        Returns None when the click was shed because the window is merely busy.
+        """
+        backend = self.backend
+        backend.process_async_replies()
+
+        in_flight = self._in_flight
+        if len(in_flight) >= self.max_outstanding:
+            # Saturated: the window is hung if the oldest click has waited too long
+            if (now - in_flight[0]) // 1_000_000 >= self.timeout_ms:
+                self.timeouts += 1
+                return False
+            return None
+
+        if not backend.send_message_async(self.hwnd, down, buttons, l_param, _noop):
+            return False
+        if not backend.send_message_async(self.hwnd, up, 0, l_param, in_flight.popleft):
+            # Always release a pressed button: send the release with a bounded wait instead
+            backend.send_message_timeout(self.hwnd, up, 0, l_param, self.timeout_ms)
+            self.timeouts += 1
+            return False
+        in_flight.append(now)
+        return True
+
+    def _fail(self, now: int):
+        """Record an unanswered click and schedule the next probe."""
+        if not self.hung:
+            self.hung = True
+            self.hangs += 1
+            self._hung_since_ns = now
+            self._backoff_ns = BACKOFF_MIN_NS
+            self._emit(HangEvent("hang", self.hwnd, now))
+        else:
+            self._backoff_ns = min(self._backoff_ns * 2, BACKOFF_MAX_NS)
+        self._next_probe_ns = now + self._backoff_ns
+
+    def _recover(self, now: int):
+        """The window answered again: resume normal clicking."""
+        self.hung = False
+        self.recoveries += 1
+        duration_ms = (now - self._hung_since_ns) / 1_000_000
+        self._emit(HangEvent("recover", self.hwnd, now, duration_ms))
+
+    def _emit(self, event: HangEvent):
+        """Store an event and notify the listener."""
+        self.events.append(event)
+        if self.on_event:
+            self.on_event(event)
+
+
+def _noop():
+    """Completion callback for the button-down half of an ASYNC click."""
@@ -0,0 +1,281 @@
+"""Module for driving every matching Cookie Clicker window from a single click loop."""
+
+import heapq
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from . import config, metrics
+from .backend import WindowBackend, get_backend
+from .dispatch import ClickDispatcher, HangEvent
+from .geometry import GeometryTracker, WindowGeometry
+from .scheduler import (
+    DEFAULT_SPIN_NS,
+    NS_PER_SECOND,
+    CatchUpPolicy,
+    SchedulerStats,
+    TimingStats,
+    advance_deadline,
+    high_resolution_timer,
+    period_for,
+    wait_until,
+)
+from .telemetry import ClickTelemetry
+from .window_finder import CookieClickerWindowFinder
+
+
+# How often the engine looks for game windows that appeared or closed
+RESCAN_INTERVAL_S = 2.0
+
+
+@dataclass(slots=True)
+class ClickTarget:
+    """A game window driven by the engine, with its own position and rate."""
+
+    hwnd: int
+    title: str
+    # Per-window overrides; None follows the global configuration
+    relative_x: float | None = None
+    relative_y: float | None = None
+    cps: float | None = None
+    click_point: tuple[int, int] = (0, 0)
+    period_ns: int = 0
+    deadline_ns: int = 0
+    geometry: WindowGeometry | None = None
+    dispatcher: ClickDispatcher | None = None
+    timing: TimingStats = field(default_factory=TimingStats)
+    # One-off clicks (x, y, requested_ns) sent ahead of the next regular click
+    injected: deque[tuple[int, int, int]] = field(default_factory=deque)
+
+    def effective_cps(self) -> float:
+        """Get the click rate for this window."""
+        return self.cps if self.cps is not None else config.current().cps
+
+
+class MultiWindowClicker:
+    """Clicks every matching game window from one thread using a deadline heap.
+
+    Exposes the same control surface as AutoClicker so the GUI can drive either.
+    """
+
+    def __init__(
+        self,
+        stop_event: threading.Event,
+        finder: CookieClickerWindowFinder | None = None,
+        policy: CatchUpPolicy = CatchUpPolicy.SKIP,
+        rescan_interval: float = RESCAN_INTERVAL_S,
+        on_change: Callable[[str], None] | None = None,
+        geometry_tracker: GeometryTracker | None = None,
+        backend: WindowBackend | None = None,
+        on_dispatch_event: Callable[[HangEvent], None] | None = None,
+    ):
+        self.stop_event = stop_event
+        self.backend = backend or get_backend()
+        self.geometry_tracker = geometry_tracker or GeometryTracker(self.backend)
+        self.finder = finder or CookieClickerWindowFinder(self.backend)
+        self.policy = CatchUpPolicy(policy)
+        self.rescan_interval_ns = int(rescan_interval * NS_PER_SECOND)
+        self.on_change = on_change
+        self.on_dispatch_event = on_dispatch_event
+        self.targets: dict[int, ClickTarget] = {}
+        # Windows this engine started tracking; others stay tracked for the rest of the app
+        self._tracked: set[int] = set()
+        self.timing = TimingStats()
+        self.telemetry = ClickTelemetry()
+        # Min-heap of (deadline_ns, hwnd); stale entries are discarded lazily
+        self._heap: list[tuple[int, int]] = []
+        metrics.REGISTRY.add_clicker(self)
+
+    def _notify(self, message: str):
+        """Report a change in the set of driven windows."""
+        if self.on_change:
+            self.on_change(message)
+
+    def _calculate_position(self, target: ClickTarget):
+        """Calculate the click point of a target from its relative position."""
+        settings = config.current()
+        rel_x = target.relative_x if target.relative_x is not None else settings.relative_x
+        rel_y = target.relative_y if target.relative_y is not None else settings.relative_y
+        target.geometry = self.geometry_tracker.get(target.hwnd) or target.geometry
+        target.click_point = target.geometry.client_point(rel_x, rel_y)
+
+    def _on_geometry_changed(self, geometry: WindowGeometry):
+        """Follow the cookie when a driven window is moved or resized."""
+        target = self.targets.get(geometry.hwnd)
+        if target:
+            self._calculate_position(target)
+
+    def add_window(self, hwnd: int, title: str = "") -> ClickTarget:
+        """Start driving a window; its first click is scheduled immediately."""
+        target = self.targets.get(hwnd)
+        if target:
+            return target
+
+        target = ClickTarget(hwnd=hwnd, title=title)
+        target.period_ns = period_for(target.effective_cps())
+        if self.geometry_tracker.get(hwnd) is None:
+            self._tracked.add(hwnd)
+        target.geometry = self.geometry_tracker.track(hwnd)
+        # One dispatcher per window, so a hung game never holds up the others
+        target.dispatcher = ClickDispatcher(
+            hwnd, self.backend, config.current().dispatch_mode, on_event=self.on_dispatch_event
+        )
+        self._calculate_position(target)
+        target.deadline_ns = target.timing.started_ns = time.perf_counter_ns()
+        self.targets[hwnd] = target
+        self.telemetry.set_target_cps(self._total_cps())
+        heapq.heappush(self._heap, (target.deadline_ns, hwnd))
+        self._notify(f"➕ Window added: '{title}' (HWND: {hwnd})")
+        return target
+
+    def remove_window(self, hwnd: int):
+        """Stop driving a window; its pending heap entry is dropped lazily."""
+        target = self.targets.pop(hwnd, None)
+        if target:
+            if hwnd in self._tracked:
+                self._tracked.discard(hwnd)
+                self.geometry_tracker.untrack(hwnd)
+            target.timing.stopped_ns = time.perf_counter_ns()
+            self._notify(f"➖ Window closed: '{target.title}' (HWND: {hwnd})")
+
+    def configure_window(
+        self,
+        hwnd: int,
+        relative_x: float | None = None,
+        relative_y: float | None = None,
+        cps: float | None = None,
+    ):
+        """Override the position and/or rate of a single window."""
+        target = self.targets[hwnd]
+        if relative_x is not None:
+            target.relative_x = relative_x
+        if relative_y is not None:
+            target.relative_y = relative_y
+        if cps is not None:
+            target.cps = cps
+            target.period_ns = period_for(cps)
+        self._calculate_position(target)
+
+    def inject_click(self, hwnd: int, x: int, y: int, requested_ns: int | None = None):
+        """Queue a one-off click for a driven window (safe to call from any thread)."""
+        target = self.targets.get(hwnd)
+        if target:
+            target.injected.append((x, y, requested_ns or time.perf_counter_ns()))
+
+    def _send_injected(self, target: ClickTarget):
+        """Send the queued one-off clicks of a window."""
+        injected = target.injected
+        while injected:
+            x, y, requested_ns = injected.popleft()
+            start_ns = time.perf_counter_ns()
+            if target.dispatcher.click(x, y):
+                self.telemetry.record_injected(requested_ns, start_ns)
+
+    def rescan(self):
+        """Add newly opened game windows and drop the ones that closed."""
+        found = dict(self.finder.find_windows())
+
+        for hwnd in list(self.targets):
+            if hwnd not in found or not self.backend.is_window(hwnd):
+                self.remove_window(hwnd)
+
+        for hwnd, title in found.items():
+            if hwnd not in self.targets:
+                self.add_window(hwnd, title)
+
+    def update_position(self):
+        """Recalculate click points of windows that follow the global position."""
+        for target in list(self.targets.values()):
+            self._calculate_position(target)
+
+    def update_cps(self):
+        """Apply the global CPS to windows without a rate override."""
+        period_ns = period_for(config.current().cps)
+        for target in list(self.targets.values()):
+            if target.cps is None:
+                target.period_ns = period_ns
+        self.telemetry.set_target_cps(self._total_cps())
+
+    def get_screen_position(self) -> tuple[int, int]:
+        """Get the screen coordinates of the first window's click point."""
+        target = next(iter(self.targets.values()), None)
+        if target is None:
+            return 0, 0
+        return target.geometry.to_screen(*target.click_point)
+
+    def get_stats(self) -> SchedulerStats:
+        """Get the combined rate and jitter across all windows."""
+        return self.timing.snapshot(self._total_cps())
+
+    def _total_cps(self) -> float:
+        """Combined target rate of all driven windows."""
+        return sum(t.effective_cps() for t in list(self.targets.values()))
+
+    def run(self) -> SchedulerStats:
+        """Execute the click loop until the stop event is set."""
+        self.geometry_tracker.listeners.append(self._on_geometry_changed)
+        try:
+            with high_resolution_timer():
+                self._run()
+        finally:
+            self.geometry_tracker.listeners.remove(self._on_geometry_changed)
+        return self.get_stats()
+
+    def _run(self):
+        """Pop the earliest deadline, click that window and reschedule it."""
+        perf_counter_ns = time.perf_counter_ns
+        stop_event = self.stop_event
+        heap = self._heap
+        targets = self.targets
+
+        self.timing = timing = TimingStats()
+        timing.started_ns = perf_counter_ns()
+        next_rescan = 0
+
+        while not stop_event.is_set():
+            now = perf_counter_ns()
+            if now >= next_rescan:
+                self.rescan()
+                next_rescan = perf_counter_ns() + self.rescan_interval_ns
+
+            if not heap:
+                if not wait_until(next_rescan, stop_event, DEFAULT_SPIN_NS):
+                    break
+                continue
+
+            deadline, hwnd = heap[0]
+            if deadline > next_rescan:
+                # A rescan is due before the next click
+                if not wait_until(next_rescan, stop_event, DEFAULT_SPIN_NS):
+                    break
+                continue
+
+            if not wait_until(deadline, stop_event, DEFAULT_SPIN_NS):
+                break
+            heapq.heappop(heap)
+
+            target = targets.get(hwnd)
+            if target is None or target.deadline_ns != deadline:
+                continue  # Window was removed or re-added since this entry was queued
+
+            if target.injected:
+                self._send_injected(target)
+
+            start_ns = perf_counter_ns()
+            lateness = start_ns - deadline
+            x, y = target.click_point
+            if target.dispatcher.click(x, y):
+                self.telemetry.record_click(start_ns, perf_counter_ns())
+            target.timing.record(start_ns, lateness)
+            timing.record(start_ns, lateness)
+
+            target.deadline_ns, skipped = advance_deadline(
+                deadline, target.period_ns, perf_counter_ns(), self.policy
+            )
+            target.timing.skipped += skipped
+            timing.skipped += skipped
+            heapq.heappush(heap, (target.deadline_ns, hwnd))
+
+        timing.stopped_ns = perf_counter_ns()
@@ -0,0 +1,119 @@
+"""Module for tracking the client geometry of game windows."""
+
+import dataclasses
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .backend import WindowBackend, get_backend
+from .win_events import EVENT_OBJECT_LOCATIONCHANGE
+
+
+@dataclass(frozen=True, slots=True)
+class WindowGeometry:
+    """Client size and screen origin of one window, as measured at one time.
+
+    A change publishes a new snapshot instead of editing this one, so a reader
+    never pairs a new size with an old origin.
+    """
+
+    hwnd: int
+    width: int = 0
+    height: int = 0
+    origin_x: int = 0
+    origin_y: int = 0
+    version: int = 0  # Incremented every time the geometry actually changes
+
+    def client_point(self, relative_x: float, relative_y: float) -> tuple[int, int]:
+        """Convert a relative position into client coordinates."""
+        return int(self.width * relative_x), int(self.height * relative_y)
+
+    def to_screen(self, x: int, y: int) -> tuple[int, int]:
+        """Convert client coordinates into screen coordinates."""
+        return self.origin_x + x, self.origin_y + y
+
+
+class GeometryTracker:
+    """Caches window geometry and refreshes it only on real move/size events.
+
+    Reading a geometry costs no Win32 call; a window is re-measured (one
+    GetClientRect plus one ClientToScreen) only when Windows reports that it
+    moved or was resized, and listeners are told only if something changed.
+    Geometries are immutable snapshots: hold the tracker (or the hwnd), not a
+    snapshot, to follow a window.
+    """
+
+    def __init__(self, backend: WindowBackend | None = None):
+        self.backend = backend or get_backend()
+        self._geometries: dict[int, WindowGeometry] = {}
+        self._lock = threading.Lock()
+        self._events = self.backend.create_event_source(self._handle_event)
+        # Called as listener(geometry) after a window moved or was resized
+        self.listeners: list[Callable[[WindowGeometry], None]] = []
+
+    def track(self, hwnd: int) -> WindowGeometry:
+        """Start tracking a window and return its current geometry."""
+        with self._lock:
+            geometry = self._geometries.get(hwnd)
+            if geometry:
+                return geometry
+            geometry = self._geometries[hwnd] = WindowGeometry(hwnd)
+
+        self.refresh(hwnd)
+        geometry = self._geometries.get(hwnd, geometry)
+
+        # Only listen to location changes from the game's own process
+        process_id = self.backend.get_window_process_id(hwnd)
+        self._events.add_hook(EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE, process_id)
+        self._events.start()
+        return geometry
+
+    def untrack(self, hwnd: int):
+        """Stop tracking a window."""
+        with self._lock:
+            self._geometries.pop(hwnd, None)
+
+    def get(self, hwnd: int) -> WindowGeometry | None:
+        """Get the latest geometry of a tracked window."""
+        return self._geometries.get(hwnd)
+
+    def refresh(self, hwnd: int) -> bool:
+        """Re-measure a window; returns True if its geometry changed."""
+        geometry = self._geometries.get(hwnd)
+        backend = self.backend
+        if geometry is None or not backend.is_window(hwnd):
+            return False
+
+        _, _, width, height = backend.get_client_rect(hwnd)
+        origin_x, origin_y = backend.client_to_screen(hwnd, (0, 0))
+        with self._lock:
+            geometry = self._geometries.get(hwnd)
+            if geometry is None or (width, height, origin_x, origin_y) == (
+                geometry.width,
+                geometry.height,
+                geometry.origin_x,
+                geometry.origin_y,
+            ):
+                return False
+            # Published with one assignment, so readers see all of it or none of it
+            geometry = self._geometries[hwnd] = dataclasses.replace(
+                geometry,
+                width=width,
+                height=height,
+                origin_x=origin_x,
+                origin_y=origin_y,
+                version=geometry.version + 1,
+            )
+        # A copy: other threads add and remove listeners while events arrive
+        for listener in list(self.listeners):
+            listener(geometry)
+        return True
+
+    def stop(self):
+        """Stop listening for window events."""
+        self._events.stop()
+
+    def _handle_event(self, _event: int, hwnd: int):
+        """Re-measure a tracked window that reported a location change."""
+        if hwnd in self._geometries:
+            self.refresh(hwnd)
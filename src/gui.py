@@ -1,15 +1,52 @@
 """Graphical interface to control the autoclicker."""
 
+import contextlib
+import dataclasses
+import functools
+import logging
 import threading
-import tomllib
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import customtkinter as ctk
 
-from . import config
+from . import __author__, __license__, __version__, config, logs
+from .autotune import Autotuner, AutotuneStep
+from .burst import BurstController, BurstEvent
 from .clicker import AutoClicker
+from .cookies import CookieSampler, CookieStats, format_count
+from .dispatch import DispatchMode, HangEvent
+from .engine import MultiWindowClicker
+from .geometry import GeometryTracker, WindowGeometry
+from .metrics import MetricsServer
 from .overlay import ClickOverlay
-from .window_finder import CookieClickerWindowFinder
+from .process_host import ProcessClicker
+from .profiles import ProfileStore
+from .recorder import SessionRecorder
+from .sampling import SamplingProfiler
+from .scheduler import SchedulerStats
+from .telemetry import TelemetrySnapshot
+from .throttle import CoalescingUpdater
+from .window_finder import WindowRegistry
+
+
+if TYPE_CHECKING:
+    from .calibration import Calibrator
+    from .shimmer import Detection
+
+
+# Refresh interval of the live stats panel
+STATS_REFRESH_MS = 250
+
+# Interval at which new log lines are moved into the log box, one insert per batch
+LOG_FLUSH_MS = 100
+
+# Time the game window's size must stay put before the cookie is located again
+RECALIBRATE_SETTLE_MS = 400
+
+# Named, not __name__: run with ``python -m src.gui`` this module is __main__,
+# outside the package logger that logs.setup() routes
+logger = logging.getLogger(f"{logs.LOGGER_NAME}.gui")
 
 
 class AutoClickerGUI:
@@ -21,18 +58,18 @@ class AutoClickerGUI:
         ctk.set_default_color_theme("blue")
 
         self.root = ctk.CTk()
+        self.log_ring = logs.setup()
 
-        # Load project metadata from pyproject.toml
-        pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
-        with pyproject_path.open("rb") as f:
-            data = tomllib.load(f)
-        self.version = data["project"]["version"]
-        self.author = data["project"]["authors"][0]["name"]
-        self.license_text = data["project"]["license"]["text"]
+        # Project metadata
+        self.version = __version__
+        self.author = __author__
+        self.license_text = __license__
 
         self.root.title(f"Cookie Clicker Autoclicker v{self.version}")
-        self.root.geometry("450x650")
-        self.root.resizable(False, False)
+        self.root.geometry("450x820")
+        # Taller windows show more of the options; the options scroll in shorter ones
+        self.root.minsize(450, 700)
+        self.root.resizable(False, True)
 
         # Set window icon
         icon_path = Path(__file__).parent.parent / "cookie.ico"
@@ -45,14 +82,49 @@ class AutoClickerGUI:
         self.clicker_thread = None
         self.overlay = None
         self.clicker = None
+        self.cookie_sampler = None
+        self.autotuner = None
+        self.burst_controller = None
+        self.metrics_server = None
+        self.profiler = None
+        self.registry = WindowRegistry()
+        self.geometry_tracker = GeometryTracker()
+        self.geometry_tracker.listeners.append(self._on_window_geometry_changed)
+        self.position_updater = CoalescingUpdater(self.root, self._apply_position_update)
+
+        self.hwnd = None
+        self.calibrator = None  # Created on first use (needs NumPy)
+        self._calibrated_size: tuple[int, int] | None = None
+        self._recalibration_job: str | None = None  # Pending Tk after() id
+        self._recalibrating = False  # A background calibration is running
+        self._failed_size: tuple[int, int] | None = None  # Not tried again until it changes
+        self.profiles = ProfileStore()
+        # A broken profiles file must not prevent the GUI from starting
+        with contextlib.suppress(OSError, ValueError, TypeError):
+            self.profiles.load()
 
         # Configuration variables
-        self.cps_var = ctk.StringVar(value=str(config.CPS))
-        self.pos_x_var = ctk.DoubleVar(value=config.BIG_COOKIE_RELATIVE_X)
-        self.pos_y_var = ctk.DoubleVar(value=config.BIG_COOKIE_RELATIVE_Y)
-        self.show_overlay_var = ctk.BooleanVar(value=config.SHOW_OVERLAY)
+        settings = config.current()
+        self.cps_var = ctk.StringVar(value=str(settings.cps))
+        self.pos_x_var = ctk.DoubleVar(value=settings.relative_x)
+        self.pos_y_var = ctk.DoubleVar(value=settings.relative_y)
+        self.show_overlay_var = ctk.BooleanVar(value=settings.show_overlay)
+        self.all_windows_var = ctk.BooleanVar(value=settings.click_all_windows)
+        self.dispatch_mode_var = ctk.StringVar(value=settings.dispatch_mode)
+        self.isolate_var = ctk.BooleanVar(value=settings.isolate_engine)
+        self.shimmers_var = ctk.BooleanVar(value=settings.click_shimmers)
+        self.auto_calibrate_var = ctk.BooleanVar(value=settings.auto_calibrate)
+        self.autotune_var = ctk.BooleanVar(value=settings.autotune)
+        self.burst_var = ctk.BooleanVar(value=settings.burst_mode)
+        self.record_var = ctk.BooleanVar(value=settings.record_session)
+        self.metrics_var = ctk.BooleanVar(value=settings.serve_metrics)
+        self.sampling_var = ctk.BooleanVar(value=False)
+        self.profile_var = ctk.StringVar(value="")
+        self.log_level_var = ctk.StringVar(value=config.LOG_LEVEL)
+        self._log_lines = 0
 
         self._create_widgets()
+        self.root.after(LOG_FLUSH_MS, self._flush_log)
 
     def _create_widgets(self):
         """Create the interface widgets."""
@@ -72,7 +144,13 @@ class AutoClickerGUI:
         self.status_label = ctk.CTkLabel(
             main_frame, text="Status: Stopped", font=ctk.CTkFont(size=10)
         )
-        self.status_label.pack(pady=(0, 10))
+        self.status_label.pack(pady=(0, 5))
+
+        # Live click statistics
+        self.stats_label = ctk.CTkLabel(
+            main_frame, text=self._format_stats(None), font=ctk.CTkFont(size=10), justify="left"
+        )
+        self.stats_label.pack(pady=(0, 5))
 
         # Separator
         sep1 = ctk.CTkFrame(main_frame, height=2, fg_color="gray")
@@ -132,11 +210,114 @@ class AutoClickerGUI:
         self.y_display.pack(side="left", padx=(5, 0))
         self.pos_y_var.trace_add("write", self._update_y_display)
 
+        # Locate the big cookie instead of positioning it by eye
+        calibrate_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        calibrate_frame.pack(fill="x", pady=(0, 5))
+
+        self.auto_calibrate_checkbox = ctk.CTkCheckBox(
+            calibrate_frame, text="Auto-calibrate position", variable=self.auto_calibrate_var
+        )
+        self.auto_calibrate_checkbox.pack(side="left")
+
+        self.calibrate_button = ctk.CTkButton(
+            calibrate_frame, text="🎯 Calibrate", command=self._calibrate_now, width=100
+        )
+        self.calibrate_button.pack(side="right")
+
+        # Feature switches, in a scrolling list so the window does not grow with every one
+        options_frame = ctk.CTkScrollableFrame(main_frame, label_text="Options", height=160)
+        options_frame.pack(fill="both", expand=True, pady=(10, 5))
+
         # Show overlay
         self.overlay_checkbox = ctk.CTkCheckBox(
-            main_frame, text="Show visual overlay", variable=self.show_overlay_var
+            options_frame, text="Show visual overlay", variable=self.show_overlay_var
+        )
+        self.overlay_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Drive every game window
+        self.all_windows_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Click all game windows", variable=self.all_windows_var
+        )
+        self.all_windows_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Keep the click loop away from GUI load
+        self.isolate_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Run clicker in a separate process", variable=self.isolate_var
+        )
+        self.isolate_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Golden cookies
+        self.shimmers_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Click golden cookies", variable=self.shimmers_var
+        )
+        self.shimmers_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Adaptive click rate
+        self.autotune_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Auto-tune CPS", variable=self.autotune_var
+        )
+        self.autotune_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Faster clicking during click buffs
+        self.burst_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Click faster during click buffs", variable=self.burst_var
+        )
+        self.burst_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Click-by-click recording for offline analysis
+        self.record_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Record session", variable=self.record_var
         )
-        self.overlay_checkbox.pack(anchor="w", pady=10)
+        self.record_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Prometheus endpoint on localhost
+        self.metrics_checkbox = ctk.CTkCheckBox(
+            options_frame, text="Serve metrics", variable=self.metrics_var
+        )
+        self.metrics_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Sampling profiler, switched on and off during a live session
+        self.sampling_checkbox = ctk.CTkCheckBox(
+            options_frame,
+            text="Profile click and GUI threads",
+            variable=self.sampling_var,
+            command=self._on_sampling_toggled,
+        )
+        self.sampling_checkbox.pack(anchor="w", pady=(5, 5))
+
+        # Click delivery
+        dispatch_frame = ctk.CTkFrame(options_frame, fg_color="transparent")
+        dispatch_frame.pack(fill="x", pady=(0, 10))
+
+        dispatch_label = ctk.CTkLabel(dispatch_frame, text="Click delivery:")
+        dispatch_label.pack(side="left")
+
+        self.dispatch_menu = ctk.CTkOptionMenu(
+            dispatch_frame,
+            values=[mode.value for mode in DispatchMode],
+            variable=self.dispatch_mode_var,
+            width=100,
+        )
+        self.dispatch_menu.pack(side="right")
+
+        # Profiles
+        profile_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        profile_frame.pack(fill="x", pady=(0, 5))
+
+        self.profile_combo = ctk.CTkComboBox(
+            profile_frame, values=self.profiles.names(), variable=self.profile_var, width=200
+        )
+        self.profile_combo.pack(side="left")
+
+        self.profile_load_button = ctk.CTkButton(
+            profile_frame, text="Load", command=self._load_profile, width=60
+        )
+        self.profile_load_button.pack(side="left", padx=5)
+
+        self.profile_save_button = ctk.CTkButton(
+            profile_frame, text="Save", command=self._save_profile, width=60
+        )
+        self.profile_save_button.pack(side="left")
 
         # Separator
         sep2 = ctk.CTkFrame(main_frame, height=2, fg_color="gray")
@@ -157,8 +338,20 @@ class AutoClickerGUI:
         self.stop_button.pack(side="left", padx=5)
 
         # Log
-        log_label = ctk.CTkLabel(main_frame, text="Log:", font=ctk.CTkFont(size=10, weight="bold"))
-        log_label.pack(anchor="w", pady=(10, 5))
+        log_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        log_frame.pack(fill="x", pady=(10, 5))
+
+        log_label = ctk.CTkLabel(log_frame, text="Log:", font=ctk.CTkFont(size=10, weight="bold"))
+        log_label.pack(side="left")
+
+        self.log_level_menu = ctk.CTkOptionMenu(
+            log_frame,
+            values=list(logs.LEVELS),
+            variable=self.log_level_var,
+            command=lambda level: logs.set_level(self.log_ring, level),
+            width=100,
+        )
+        self.log_level_menu.pack(side="right")
 
         self.log_text = ctk.CTkTextbox(main_frame, height=100, width=400, state="disabled")
         self.log_text.pack(pady=(0, 10))
@@ -184,49 +377,114 @@ class AutoClickerGUI:
     def _increase_cps(self):
         """Increase the CPS value by 1."""
         try:
-            current_cps = int(self.cps_var.get())
-            new_cps = current_cps + 1
-            self.cps_var.set(str(new_cps))
-
-            # If the clicker is running, update in real-time
-            if self.is_running and self.clicker:
-                config.CPS = new_cps
-                self.clicker.update_cps()
+            new_cps = int(self.cps_var.get()) + 1
         except ValueError:
-            new_cps = config.CPS + 1
-            self.cps_var.set(str(new_cps))
-            if self.is_running and self.clicker:
-                config.CPS = new_cps
-                self.clicker.update_cps()
+            new_cps = config.current().cps + 1
+        self._set_cps(new_cps)
 
     def _decrease_cps(self):
         """Decrease the CPS value by 1, minimum 1."""
         try:
-            current_cps = int(self.cps_var.get())
-            new_cps = max(1, current_cps - 1)
-            self.cps_var.set(str(new_cps))
-
-            # If the clicker is running, update in real-time
-            if self.is_running and self.clicker:
-                config.CPS = new_cps
-                self.clicker.update_cps()
+            new_cps = max(1, int(self.cps_var.get()) - 1)
         except ValueError:
-            new_cps = max(1, config.CPS - 1)
-            self.cps_var.set(str(new_cps))
-            if self.is_running and self.clicker:
-                config.CPS = new_cps
-                self.clicker.update_cps()
+            new_cps = max(1, config.current().cps - 1)
+        self._set_cps(new_cps)
 
-    def _update_x_display(self, *args):
-        """Update the X position display."""
-        self.x_display.configure(text=f"{self.pos_x_var.get():.2f}")
+    def _set_cps(self, new_cps: int):
+        """Show a new CPS value and publish it to the clicker."""
+        self.cps_var.set(str(new_cps))
 
         # If the clicker is running, update in real-time
         if self.is_running and self.clicker:
-            self._update_position_realtime()
+            config.update(cps=new_cps)
+            self.clicker.update_cps()
+
+    def _read_settings(self) -> config.Settings:
+        """Build a settings snapshot from the widget values."""
+        current = config.current()
+        cps_text = self.cps_var.get()
+        return current.replace(
+            cps=int(cps_text) if cps_text.isdigit() else current.cps,
+            relative_x=self.pos_x_var.get(),
+            relative_y=self.pos_y_var.get(),
+            show_overlay=self.show_overlay_var.get(),
+            click_all_windows=self.all_windows_var.get(),
+            dispatch_mode=self.dispatch_mode_var.get(),
+            isolate_engine=self.isolate_var.get(),
+            click_shimmers=self.shimmers_var.get(),
+            auto_calibrate=self.auto_calibrate_var.get(),
+            autotune=self.autotune_var.get(),
+            burst_mode=self.burst_var.get(),
+            record_session=self.record_var.get(),
+            serve_metrics=self.metrics_var.get(),
+        )
+
+    def _publish_settings(self) -> config.Settings:
+        """Publish the widget values as the current settings snapshot."""
+        return config.set_current(self._read_settings())
+
+    def _show_settings(self, settings: config.Settings):
+        """Copy a settings snapshot into the widgets."""
+        self.cps_var.set(str(settings.cps))
+        self.pos_x_var.set(settings.relative_x)
+        self.pos_y_var.set(settings.relative_y)
+        self.show_overlay_var.set(settings.show_overlay)
+        self.all_windows_var.set(settings.click_all_windows)
+        self.dispatch_mode_var.set(settings.dispatch_mode)
+        self.isolate_var.set(settings.isolate_engine)
+        self.shimmers_var.set(settings.click_shimmers)
+        self.auto_calibrate_var.set(settings.auto_calibrate)
+        self.autotune_var.set(settings.autotune)
+        self.burst_var.set(settings.burst_mode)
+        self.record_var.set(settings.record_session)
+        self.metrics_var.set(settings.serve_metrics)
+
+    def _load_profile(self):
+        """Apply the selected profile, in real-time if the clicker is running."""
+        name = self.profile_var.get().strip()
+        settings = self.profiles.get(name)
+        if settings is None:
+            self._log(f"❌ Profile '{name}' not found", logging.ERROR)
+            return
+
+        self._show_settings(settings)
+        self.profiles.activate(name)
+        if self.is_running and self.clicker:
+            self.clicker.update_cps()
+            self.clicker.update_position()
+            self._refresh_overlay_position()
+        self._log(f"📂 Profile '{name}' loaded")
+
+    def _save_profile(self):
+        """Save the current values as a profile bound to the game window size."""
+        name = self.profile_var.get().strip()
+        if not name:
+            self._log("❌ Enter a profile name first", logging.ERROR)
+            return
+
+        geometry = self.geometry_tracker.get(self.hwnd) if self.hwnd else None
+        client_size = (geometry.width, geometry.height) if geometry else None
+        try:
+            self.profiles.put(name, self._read_settings(), client_size)
+        except OSError as e:
+            self._log(f"❌ Could not save profile: {e}", logging.ERROR)
+            return
+
+        self.profile_combo.configure(values=self.profiles.names())
+        size_text = f" for {client_size[0]}x{client_size[1]}" if client_size else ""
+        self._log(f"💾 Profile '{name}' saved{size_text}")
+
+    def _update_x_display(self, *args):
+        """Queue an X position update (coalesced to one per frame)."""
+        self.position_updater.submit(None)
 
     def _update_y_display(self, *args):
-        """Update the Y position display."""
+        """Queue a Y position update (coalesced to one per frame)."""
+        self.position_updater.submit(None)
+
+    def _apply_position_update(self, _value=None):
+        """Apply the latest slider values to the displays, clicker and overlay."""
+        self.x_display.configure(text=f"{self.pos_x_var.get():.2f}")
         self.y_display.configure(text=f"{self.pos_y_var.get():.2f}")
 
         # If the clicker is running, update in real-time
@@ -235,23 +493,166 @@ class AutoClickerGUI:
 
     def _update_position_realtime(self):
         """Update the clicker and overlay position in real-time."""
-        config.BIG_COOKIE_RELATIVE_X = self.pos_x_var.get()
-        config.BIG_COOKIE_RELATIVE_Y = self.pos_y_var.get()
+        config.update(relative_x=self.pos_x_var.get(), relative_y=self.pos_y_var.get())
 
         # Update the clicker position
         self.clicker.update_position()
 
         # Update the overlay position
-        if self.overlay and self.overlay.running:
+        self._refresh_overlay_position()
+
+    def _on_window_geometry_changed(self, geometry: WindowGeometry):
+        """Move the overlay when the game window is moved or resized (event thread)."""
+        if self.is_running and self.overlay:
+            self.root.after(0, self._refresh_overlay_position)
+        calibrated = self._calibrated_size
+        resized = calibrated and (geometry.width, geometry.height) != calibrated
+        if self.is_running and geometry.hwnd == self.hwnd and resized:
+            # Every step of a drag-resize lands here; only the size it settles at matters
+            self.root.after(0, self._schedule_recalibration)
+
+    def _schedule_recalibration(self):
+        """(Re)start the wait for the window size to settle before calibrating again."""
+        if self._recalibration_job is not None:
+            self.root.after_cancel(self._recalibration_job)
+        self._recalibration_job = self.root.after(
+            RECALIBRATE_SETTLE_MS, self._recalibrate_after_resize
+        )
+
+    def _get_calibrator(self, automatic: bool = False):
+        """Get the big cookie calibrator, or None if NumPy is not installed."""
+        if self.calibrator is None:
+            try:
+                from .calibration import Calibrator
+            except ImportError as e:
+                if not automatic:
+                    self._log(f"❌ {e}", logging.ERROR)
+                elif self.auto_calibrate_var.get():
+                    # On by default: say so once and turn it off, rather than fail every start
+                    self._log(f"⚠️ Auto-calibration turned off: {e}", logging.WARNING)
+                    self.auto_calibrate_var.set(False)
+                return None
+            self.calibrator = Calibrator()
+            # A broken cache only means calibrating again
+            with contextlib.suppress(OSError, ValueError):
+                self.calibrator.load()
+        return self.calibrator
+
+    def _calibrate(self, hwnd: int, force: bool = False) -> bool:
+        """Locate the big cookie (or reuse the result for this window size) and apply it."""
+        calibrator = self._get_calibrator(automatic=not force)
+        if calibrator is None:
+            return False
+        result = self._locate_cookie(calibrator, hwnd, force)
+        if result is None:
+            return False
+        self._apply_calibration(*result)
+        return True
+
+    def _locate_cookie(
+        self, calibrator: "Calibrator", hwnd: int, force: bool = False
+    ) -> tuple[tuple[int, int], tuple[float, float]] | None:
+        """Find the click point for the window's current size as (size, point) (any thread)."""
+        geometry = self.geometry_tracker.track(hwnd)
+        size = geometry.width, geometry.height
+        try:
+            point = calibrator.calibrate(hwnd, *size, force=force)
+        except OSError as e:
+            self._log(f"❌ Calibration failed: {e}", logging.ERROR)
+            return None
+        if point is None:
+            self._log("❌ Big cookie not found, keeping the current position", logging.ERROR)
+            return None
+        return size, point
+
+    def _apply_calibration(self, size: tuple[int, int], point: tuple[float, float]):
+        """Move the click point to a calibration result."""
+        self._calibrated_size = size
+        # The slider traces apply the new point to a running clicker
+        self.pos_x_var.set(point[0])
+        self.pos_y_var.set(point[1])
+        self._log(f"🎯 Big cookie at ({point[0]:.2f}, {point[1]:.2f}) for {size[0]}x{size[1]}")
+
+    def _calibrate_now(self):
+        """Calibrate against the game window, ignoring any cached result."""
+        hwnd = self.hwnd or self.registry.find_window()
+        if not hwnd:
+            self._log("❌ Game window not found", logging.ERROR)
+            return
+        self.hwnd = hwnd
+        self._calibrate(hwnd, force=True)
+
+    def _recalibrate_after_resize(self):
+        """Calibrate again, off the Tk thread, once the game window settled at a new size."""
+        self._recalibration_job = None
+        if not (self.is_running and self.hwnd and self.auto_calibrate_var.get()):
+            return
+        if self._recalibrating:
+            return  # Checked again when the running one finishes
+        geometry = self.geometry_tracker.get(self.hwnd)
+        size = (geometry.width, geometry.height) if geometry else None
+        if size is None or size in (self._calibrated_size, self._failed_size):
+            return
+        calibrator = self._get_calibrator(automatic=True)
+        if calibrator is None:
+            return
+        self._recalibrating = True
+        threading.Thread(
+            target=self._recalibrate_in_background,
+            args=(calibrator, self.hwnd, size),
+            daemon=True,
+        ).start()
+
+    def _recalibrate_in_background(
+        self, calibrator: "Calibrator", hwnd: int, size: tuple[int, int]
+    ):
+        """Capture and analyze a frame (calibration thread), then apply it on the Tk thread."""
+        result = None
+        try:
+            result = self._locate_cookie(calibrator, hwnd)
+        finally:
+            self.root.after(0, self._finish_recalibration, size, result)
+
+    def _finish_recalibration(
+        self,
+        size: tuple[int, int],
+        result: tuple[tuple[int, int], tuple[float, float]] | None,
+    ):
+        """Apply a background calibration, and start another if the size moved on meanwhile."""
+        self._recalibrating = False
+        if result is None:
+            self._failed_size = size
+        else:
+            self._failed_size = None
+            self._apply_calibration(*result)
+        self._recalibrate_after_resize()
+
+    def _refresh_overlay_position(self):
+        """Place the overlay on the clicker's current screen position."""
+        if self.clicker and self.overlay and self.overlay.running:
             screen_x, screen_y = self.clicker.get_screen_position()
             self.overlay.update_position(screen_x, screen_y)
 
-    def _log(self, message: str):
-        """Add a message to the log."""
-        self.log_text.configure(state="normal")
-        self.log_text.insert("end", f"{message}\n")
-        self.log_text.see("end")
-        self.log_text.configure(state="disabled")
+    def _log(self, message: str, level: int = logging.INFO, **data):
+        """Add a message to the log, with optional structured data (safe from any thread)."""
+        logger.log(level, message, extra={"data": data} if data else None)
+
+    def _flush_log(self):
+        """Move the lines logged since the last flush into the log box."""
+        records = self.log_ring.drain()
+        if records:
+            text = self.log_text
+            text.configure(state="normal")
+            text.insert("end", "".join(f"{record.getMessage()}\n" for record in records))
+            # Keep the box as bounded as the ring behind it
+            self._log_lines += len(records)
+            excess = self._log_lines - config.LOG_RING_SIZE
+            if excess > 0:
+                text.delete("1.0", f"{excess + 1}.0")
+                self._log_lines -= excess
+            text.see("end")
+            text.configure(state="disabled")
+        self.root.after(LOG_FLUSH_MS, self._flush_log)
 
     def _start_clicker(self):
         """Start the autoclicker."""
@@ -260,44 +661,85 @@ class AutoClickerGUI:
 
         self._log("🔍 Searching for Cookie Clicker window...")
 
-        # Find the window
-        finder = CookieClickerWindowFinder()
-        hwnd = finder.find_window()
+        # Find the window (the registry keeps itself current from window events)
+        self.registry.start()
+        hwnd = self.registry.find_window()
 
         if not hwnd:
-            self._log("❌ Game window not found")
+            self._log("❌ Game window not found", logging.ERROR)
             return
 
         self._log("✅ Window found")
-
-        # Update config with GUI values
-        config.CPS = int(self.cps_var.get()) if self.cps_var.get().isdigit() else config.CPS
-        config.BIG_COOKIE_RELATIVE_X = self.pos_x_var.get()
-        config.BIG_COOKIE_RELATIVE_Y = self.pos_y_var.get()
+        self.hwnd = hwnd
+
+        # Pick the profile bound to this window size, if there is one
+        geometry = self.geometry_tracker.track(hwnd)
+        match = self.profiles.for_client_size(geometry.width, geometry.height)
+        if match:
+            name, settings = match
+            self._show_settings(settings)
+            self.profile_var.set(name)
+            self._log(f"📐 Profile '{name}' matched {geometry.width}x{geometry.height}")
+        elif self.auto_calibrate_var.get():
+            self._calibrate(hwnd)
+
+        # Publish the GUI values as one consistent snapshot
+        self._publish_settings()
+        self._update_metrics_server()
 
         # Create overlay if enabled
         if self.show_overlay_var.get():
-            self.overlay = ClickOverlay(parent=self.root)
+            self.overlay = ClickOverlay(parent=self.root, rate=self._overlay_rate)
             self._log("🎯 Visual overlay activated")
 
         # Reset stop event
         self.stop_event = threading.Event()
+        self.position_updater.reset_counters()
 
         # Start the autoclicker thread
         self.clicker_thread = threading.Thread(target=self._run_clicker, args=(hwnd,), daemon=True)
         self.clicker_thread.start()
+        if self.sampling_var.get():
+            self._start_profiler()
 
         # Update UI
         self.is_running = True
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
         self.status_label.configure(text="Status: ✅ Running")
-        self._log(f"🖱️ Autoclicker started ({config.CPS} CPS)")
+        self.root.after(STATS_REFRESH_MS, self._refresh_stats)
+        self._log(f"🖱️ Autoclicker started ({config.current().cps} CPS)")
 
     def _run_clicker(self, hwnd: int):
         """Execute the autoclicker in a separate thread."""
         # Create the autoclicker
-        self.clicker = AutoClicker(hwnd, self.stop_event)
+        settings = config.current()
+        if settings.click_all_windows:
+            self.clicker = MultiWindowClicker(
+                self.stop_event,
+                finder=self.registry,
+                on_change=self._log,
+                geometry_tracker=self.geometry_tracker,
+                on_dispatch_event=self._on_dispatch_event,
+            )
+            self.clicker.add_window(hwnd)
+        elif settings.isolate_engine:
+            self.clicker = ProcessClicker(
+                hwnd,
+                self.stop_event,
+                geometry_tracker=self.geometry_tracker,
+                on_dispatch_event=self._on_dispatch_event,
+            )
+        else:
+            self.clicker = AutoClicker(
+                hwnd,
+                self.stop_event,
+                geometry_tracker=self.geometry_tracker,
+                on_dispatch_event=self._on_dispatch_event,
+                recorder=self._create_recorder() if settings.record_session else None,
+            )
+        if settings.record_session and not isinstance(self.clicker, AutoClicker):
+            self._log("⚠️ Recording needs a single window and no process isolation", logging.WARNING)
 
         # Configure the overlay
         if self.show_overlay_var.get() and self.overlay:
@@ -307,11 +749,213 @@ class AutoClickerGUI:
             # Create the overlay in the main thread using after
             self.root.after(0, self._create_overlay)
 
+        if settings.click_shimmers:
+            self._start_shimmer_watcher(hwnd)
+        self._start_cookie_sampler(hwnd, settings)
+        self.autotuner = None
+        self.burst_controller = None
+        if settings.autotune:
+            self._start_autotuner()
+            if settings.burst_mode:
+                self._log("⚠️ Burst mode is off while auto-tuning (both set CPS)", logging.WARNING)
+        elif settings.burst_mode:
+            self._start_burst_controller()
+
         # Execute the autoclicker
-        self.clicker.run()
+        stats = self.clicker.run()
+
+        # Write the session summary off the Tk thread
+        try:
+            summary_path = self.clicker.telemetry.write_summary()
+            recorder = getattr(self.clicker, "recorder", None)
+            if recorder is not None:
+                self._log(f"🎞️ Recording: {recorder.path} ({recorder.count} clicks)")
+            if self.autotuner and self.autotuner.trace:
+                trace_path = self.autotuner.write_trace()
+                self._log(f"🧭 Auto-tune trace: {trace_path}")
+            if self.burst_controller and self.burst_controller.trace:
+                trace_path = self.burst_controller.write_trace()
+                self._log(f"⚡ Bursts: {trace_path}")
+        except OSError:
+            summary_path = None
 
         # Cleanup when finished
-        self.root.after(0, self._on_clicker_stopped)
+        self.root.after(0, self._on_clicker_stopped, stats, summary_path)
+
+    def _update_metrics_server(self):
+        """Start or stop the metrics endpoint to match the settings."""
+        wanted = config.current().serve_metrics
+        if wanted and self.metrics_server is None:
+            server = MetricsServer()
+            try:
+                server.start()
+            except OSError as e:
+                self._log(f"⚠️ Metrics not served: {e}", logging.WARNING)
+                return
+            self.metrics_server = server
+            self._log(f"📈 Metrics at {server.url}")
+        elif not wanted and self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+            self._log("📈 Metrics endpoint stopped")
+
+    def _on_sampling_toggled(self):
+        """Start or stop profiling the running session."""
+        if not self.is_running:
+            return
+        if self.sampling_var.get():
+            self._start_profiler()
+        else:
+            self._finish_profiler()
+
+    def _start_profiler(self):
+        """Sample the click thread and the Tk thread (the caller) while the session runs."""
+        if self.profiler is not None:
+            return
+        self.profiler = SamplingProfiler()
+        self.profiler.add_thread("clicker", self.clicker_thread)
+        self.profiler.add_thread("tk")
+        self.profiler.start()
+        self._log(f"🔬 Profiling every {self.profiler.interval_s * 1000:g} ms")
+
+    def _finish_profiler(self):
+        """Stop the profiler, log its hot spots and write the collapsed stacks."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+        profiler.stop()
+        for line in profiler.report():
+            self._log(line)
+        try:
+            path = profiler.write_collapsed()
+        except OSError as e:
+            self._log(f"⚠️ Profile not written: {e}", logging.WARNING)
+            return
+        self._log(f"🔬 {profiler.samples} samples ({profiler.sample_cost_us:.1f} µs each): {path}")
+
+    def _create_recorder(self) -> SessionRecorder | None:
+        """Start recording the session's clicks, if the data folder is writable."""
+        try:
+            return SessionRecorder.create()
+        except OSError as e:
+            self._log(f"⚠️ Session not recorded: {e}", logging.WARNING)
+            return None
+
+    def _start_shimmer_watcher(self, hwnd: int):
+        """Watch the game for golden cookies and feed them to the running clicker."""
+        try:
+            from .shimmer import ShimmerWatcher
+        except ImportError as e:
+            self._log(f"❌ {e}", logging.ERROR)
+            return
+
+        if isinstance(self.clicker, MultiWindowClicker):
+            click = functools.partial(self.clicker.inject_click, hwnd)
+        elif isinstance(self.clicker, AutoClicker):
+            click = self.clicker.inject_click
+        else:
+            self._log("⚠️ Golden cookies are not clicked in a separate process", logging.WARNING)
+            return
+
+        watcher = ShimmerWatcher(
+            hwnd,
+            click,
+            on_click=self._on_shimmer_click,
+        )
+        threading.Thread(target=watcher.run, args=(self.stop_event,), daemon=True).start()
+        self._log("🌟 Watching for golden cookies")
+
+    def _on_shimmer_click(self, hit: "Detection"):
+        """Report a clicked golden cookie (watcher thread)."""
+        self._log(f"🌟 Golden cookie clicked at ({hit.x}, {hit.y})", **dataclasses.asdict(hit))
+        overlay = self.overlay
+        if overlay:
+            overlay.notify_hit()
+
+    def _start_cookie_sampler(self, hwnd: int, settings: config.Settings):
+        """Follow the cookie count in the game's title while the clicker runs."""
+        # Clicks of other windows would inflate the gain per click, so only count one window's
+        clicks = None
+        if not isinstance(self.clicker, MultiWindowClicker):
+            clicks = functools.partial(getattr, self.clicker.telemetry, "clicks")
+        self.cookie_sampler = CookieSampler(hwnd, clicks=clicks)
+        # A click buff lasts seconds, so burst mode reads the count more often
+        rate = config.COOKIE_SAMPLE_RATE
+        if settings.burst_mode:
+            rate = max(rate, config.BURST_SAMPLE_RATE)
+        threading.Thread(
+            target=self.cookie_sampler.run, args=(self.stop_event, rate), daemon=True
+        ).start()
+
+    def _start_autotuner(self):
+        """Tune the click rate from the game's response while the clicker runs."""
+        if type(self.clicker) is not AutoClicker:
+            self._log("⚠️ Auto-tune only drives a single in-process clicker", logging.WARNING)
+            return
+        self.autotuner = Autotuner(
+            self.clicker, self.cookie_sampler, on_step=self._on_autotune_step
+        )
+        threading.Thread(target=self.autotuner.run, args=(self.stop_event,), daemon=True).start()
+        self._log("🧭 Auto-tuning CPS")
+
+    def _start_burst_controller(self):
+        """Raise the click rate during click buffs while the clicker runs."""
+        if type(self.clicker) is not AutoClicker:
+            self._log("⚠️ Burst mode only drives a single in-process clicker", logging.WARNING)
+            return
+        self.burst_controller = BurstController(
+            self.clicker, self.cookie_sampler, on_event=self._on_burst_event
+        )
+        threading.Thread(
+            target=self.burst_controller.run, args=(self.stop_event,), daemon=True
+        ).start()
+        self._log(
+            f"⚡ Watching for click buffs ({self.burst_controller.burst_cps} CPS during them)"
+        )
+
+    def _on_burst_event(self, event: BurstEvent):
+        """Log a burst starting, extended or ending (burst thread)."""
+        if event.action == "start":
+            message = (
+                f"⚡ Click buff (x{event.ratio:.0f} per click) detected in "
+                f"{event.latency_s:.2f} s, clicking at {event.cps} CPS"
+            )
+        elif event.action == "extend":
+            message = f"⚡ Click buff still on after {event.duration_s:.1f} s, bursting longer"
+        else:
+            message = (
+                f"⚡ Burst over after {event.duration_s:.1f} s: +{event.extra_clicks} clicks, "
+                f"+{format_count(event.extra_cookies)} cookies, back to {event.cps} CPS"
+            )
+        self._log(message, **dataclasses.asdict(event))
+
+    def _on_autotune_step(self, step: AutotuneStep):
+        """Log one auto-tune decision and show the new rate (tuner thread)."""
+        message = (
+            f"🧭 {step.cps} → {step.next_cps} CPS ({step.action}): "
+            f"{step.achieved_cps:.1f} achieved, {format_count(step.return_rate)}/s return, "
+            f"dispatch {step.dispatch_mean_us / 1000:.2f} ms"
+        )
+        # Holding happens every trial; keep it out of the log box unless asked for
+        level = logging.DEBUG if step.action == "hold" else logging.INFO
+        self._log(message, level, **dataclasses.asdict(step))
+        if step.next_cps != step.cps:
+            self.root.after(0, self.cps_var.set, str(step.next_cps))
+
+    def _on_dispatch_event(self, event: HangEvent):
+        """Report a game window that stopped or resumed answering (clicker thread)."""
+        if event.kind == "hang":
+            message = f"⚠️ Game window not responding (HWND: {event.hwnd}), pausing clicks"
+            level = logging.WARNING
+        else:
+            message = f"✅ Game window responding again after {event.duration_ms:.0f} ms"
+            level = logging.INFO
+        self._log(message, level, **dataclasses.asdict(event))
+
+    def _overlay_rate(self) -> tuple[float, float]:
+        """Achieved and target CPS for the overlay's pulse arc."""
+        snapshot = self.clicker.telemetry.snapshot() if self.clicker else None
+        return (snapshot.achieved_cps, snapshot.target_cps) if snapshot else (0.0, 0.0)
 
     def _create_overlay(self):
         """Create the overlay in the main thread."""
@@ -335,13 +979,75 @@ class AutoClickerGUI:
             finally:
                 self.overlay = None
 
-    def _on_clicker_stopped(self):
+    @staticmethod
+    def _format_stats(
+        snapshot: TelemetrySnapshot | None, cookies: CookieStats | None = None
+    ) -> str:
+        """Format the telemetry for the stats panel."""
+        if snapshot is None:
+            return "CPS: -\nDispatch p50/p99: - | Jitter p50/p99: -\nCookies: -"
+        text = (
+            f"CPS: {snapshot.achieved_cps:.1f}/{snapshot.target_cps}\n"
+            f"Dispatch p50/p99: {snapshot.dispatch_p50_us / 1000:.2f}/"
+            f"{snapshot.dispatch_p99_us / 1000:.2f} ms | "
+            f"Jitter p50/p99: {snapshot.jitter_p50_us / 1000:.2f}/"
+            f"{snapshot.jitter_p99_us / 1000:.2f} ms"
+        )
+        if cookies is None or not cookies.samples:
+            return f"{text}\nCookies: -"
+        return (
+            f"{text}\nCookies: {format_count(cookies.cookies)} | "
+            f"+{format_count(cookies.cookies_per_second)}/s | "
+            f"{format_count(cookies.cookies_per_click)} per click"
+        )
+
+    def _stats_text(self) -> str:
+        """Format the running clicker's telemetry and cookie count."""
+        cookies = self.cookie_sampler.snapshot() if self.cookie_sampler else None
+        return self._format_stats(self.clicker.telemetry.snapshot(), cookies)
+
+    def _refresh_stats(self):
+        """Refresh the stats panel at a bounded rate while the clicker runs."""
+        if not self.is_running:
+            return
+        if self.clicker:
+            self.stats_label.configure(text=self._stats_text())
+        self.root.after(STATS_REFRESH_MS, self._refresh_stats)
+
+    def _on_clicker_stopped(
+        self, stats: SchedulerStats | None = None, summary_path: Path | None = None
+    ):
         """Callback when the autoclicker stops."""
         self.is_running = False
         self.start_button.configure(state="normal")
         self.stop_button.configure(state="disabled")
         self.status_label.configure(text="Status: ⏹️ Stopped")
         self._log("✅ Autoclicker stopped")
+        self._finish_profiler()
+
+        updater = self.position_updater
+        if updater.submitted:
+            self._log(f"🎚️ Slider updates: {updater.applied} applied, {updater.dropped} coalesced")
+
+        if self.clicker:
+            self.stats_label.configure(text=self._stats_text())
+        if summary_path:
+            self._log(f"📝 Session summary: {summary_path}")
+
+        cookies = self.cookie_sampler.snapshot() if self.cookie_sampler else None
+        if cookies and cookies.samples:
+            self._log(
+                f"🍪 {format_count(cookies.cookies)} cookies "
+                f"(+{format_count(cookies.cookies_per_second)}/s)"
+            )
+        elif cookies and cookies.unreadable:
+            self._log("⚠️ No cookie count found in the game window title", logging.WARNING)
+
+        if stats and stats.clicks:
+            self._log(
+                f"📊 {stats.clicks} clicks at {stats.achieved_cps:.2f}/{stats.target_cps} CPS "
+                f"(jitter {stats.jitter_us / 1000:.2f} ms, skipped {stats.skipped})"
+            )
 
     def run(self):
         """Start the graphical interface."""
@@ -0,0 +1,180 @@
+"""Module for the bot's log: a bounded ring for the GUI and a rotating JSON lines file.
+
+Modules log through the standard ``logging`` package under their ``__name__``.
+Every record is appended to a fixed-size ring that the GUI drains on a timer,
+and put on a bounded queue that a background thread writes to a rotating file,
+one JSON object per line. Logging therefore costs a deque append and a queue
+put, however long the session runs. Disk I/O never happens on the caller's thread.
+"""
+
+import atexit
+import json
+import logging
+import queue
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from . import config
+
+
+# Parent logger of every module in the package
+LOGGER_NAME = __name__.rpartition(".")[0] or __name__
+
+# Levels offered for filtering, lowest first
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+_listener: QueueListener | None = None
+_queue_handler: "DroppingQueueHandler | None" = None
+
+
+class LogRing(logging.Handler):
+    """Keeps the most recent records in a fixed-size ring for periodic draining."""
+
+    def __init__(self, capacity: int = config.LOG_RING_SIZE, level: int | str = logging.NOTSET):
+        super().__init__(level)
+        self.records: deque[logging.LogRecord] = deque(maxlen=capacity)
+        self.emitted = 0
+        self._drained = 0
+
+    def emit(self, record: logging.LogRecord):
+        """Store a record (called with the handler lock held)."""
+        self.records.append(record)
+        self.emitted += 1
+
+    def drain(self) -> list[logging.LogRecord]:
+        """Get the records stored since the last drain; older ones than the ring holds are lost."""
+        with self.lock:
+            new = min(self.emitted - self._drained, len(self.records))
+            self._drained = self.emitted
+            return list(self.records)[len(self.records) - new :] if new else []
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queues records for the file writer, dropping them when the writer falls behind."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Hand the record over as is; the writer thread formats it, not the caller."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """Queue a record without blocking the caller."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """Queue listener whose stop waits for room in a full queue instead of failing."""
+
+    def enqueue_sentinel(self):
+        """Queue the stop marker behind the records still waiting to be written."""
+        self.queue.put(self._sentinel)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object, with the record's ``data`` extra if there is one."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as a JSON line."""
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data:
+            entry["data"] = data
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup(
+    level: str = config.LOG_LEVEL,
+    file_level: str = config.LOG_FILE_LEVEL,
+    path: Path | None = config.LOG_FILE,
+    console: bool = False,
+) -> LogRing:
+    """Route the package's logging to a ring, a background file writer and optionally stderr.
+
+    Returns the ring, for the GUI to drain. Calling it again replaces the previous setup.
+    """
+    global _listener, _queue_handler
+    shutdown()
+    _queue_handler = None
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.propagate = False
+
+    ring = LogRing(level=level)
+    logger.addHandler(ring)
+    levels = [ring.level]
+
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                path,
+                maxBytes=config.LOG_FILE_MAX_BYTES,
+                backupCount=config.LOG_FILE_BACKUPS,
+                encoding="utf-8",
+                delay=True,
+            )
+        except OSError:
+            file_handler = None  # A read-only profile directory must not stop the bot
+        if file_handler:
+            file_handler.setFormatter(JsonFormatter())
+            log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+            queue_handler = DroppingQueueHandler(log_queue)
+            queue_handler.setLevel(file_level)
+            logger.addHandler(queue_handler)
+            levels.append(queue_handler.level)
+            _queue_handler = queue_handler
+            _listener = DrainingQueueListener(log_queue, file_handler)
+            _listener.start()
+
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setLevel(level)
+        logger.addHandler(stream_handler)
+        levels.append(stream_handler.level)
+
+    # The logger lets through what at least one handler wants
+    logger.setLevel(min(levels))
+    return ring
+
+
+def set_level(ring: LogRing, level: str):
+    """Change the level a ring keeps, widening the logger's level if needed."""
+    ring.setLevel(level)
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(min([handler.level for handler in logger.handlers]))
+
+
+def dropped() -> int:
+    """Records the file writer could not keep up with since the last setup."""
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+def shutdown():
+    """Stop the file writer after it has written every queued record."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(shutdown)
@@ -0,0 +1,204 @@
+"""Module for click macros: routines of clicks at several points of the game window.
+
+A routine is a list of steps, each a click at a position relative to the client
+area followed by a delay, for example the big cookie, then a store button, then
+an upgrade slot. Before it runs, a routine is compiled against the window's size
+into a tuple of ready-made message parameters, so playing a step is one tuple
+unpack and one dispatch; it is compiled again only when the window is resized.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import config
+from .backend import (
+    MK_LBUTTON,
+    MK_MBUTTON,
+    MK_RBUTTON,
+    WM_LBUTTONDOWN,
+    WM_LBUTTONUP,
+    WM_MBUTTONDOWN,
+    WM_MBUTTONUP,
+    WM_RBUTTONDOWN,
+    WM_RBUTTONUP,
+)
+from .clicker import AutoClicker
+from .dispatch import pack_point
+from .geometry import WindowGeometry
+from .scheduler import CatchUpPolicy
+
+
+# Press message, key-state flags and release message of each button
+BUTTONS = {
+    "left": (WM_LBUTTONDOWN, MK_LBUTTON, WM_LBUTTONUP),
+    "right": (WM_RBUTTONDOWN, MK_RBUTTON, WM_RBUTTONUP),
+    "middle": (WM_MBUTTONDOWN, MK_MBUTTON, WM_MBUTTONUP),
+}
+
+# Shortest delay after a step; the scheduler needs a positive period
+MIN_DELAY_MS = 1.0
+
+# One compiled step: (press message, key-state flags, release message, lParam, delay in ns)
+CompiledStep = tuple[int, int, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class MacroStep:
+    """One click of a routine, at a position relative to the client area."""
+
+    x: float  # 0.0-1.0 of the client width
+    y: float  # 0.0-1.0 of the client height
+    button: str = "left"
+    delay_ms: float = 100.0  # Wait after this click before the next step
+
+    def __post_init__(self):
+        """Reject steps the clicker cannot play."""
+        if not (0.0 <= self.x <= 1.0 and 0.0 <= self.y <= 1.0):
+            raise ValueError(f"Step position ({self.x}, {self.y}) is outside the window")
+        if self.button not in BUTTONS:
+            raise ValueError(f"Unknown button '{self.button}', expected one of {sorted(BUTTONS)}")
+        if self.delay_ms < MIN_DELAY_MS:
+            raise ValueError(f"Step delay must be at least {MIN_DELAY_MS} ms, got {self.delay_ms}")
+
+
+@dataclass(frozen=True, slots=True)
+class Routine:
+    """A named sequence of clicks, played in a loop."""
+
+    name: str
+    steps: tuple[MacroStep, ...]
+
+    def __post_init__(self):
+        """Reject a routine without steps."""
+        if not self.steps:
+            raise ValueError(f"Routine '{self.name}' has no steps")
+
+    @property
+    def duration_ms(self) -> float:
+        """Length of one pass through the routine."""
+        return sum(step.delay_ms for step in self.steps)
+
+    @property
+    def steps_per_second(self) -> float:
+        """Average rate the routine clicks at."""
+        return len(self.steps) * 1000 / self.duration_ms
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Routine":
+        """Build a routine from its JSON form; raises ValueError if it is malformed."""
+        try:
+            steps = tuple(MacroStep(**step) for step in data["steps"])
+            return cls(str(data.get("name", "")), steps)
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Malformed routine: {e}") from e
+
+    def to_dict(self) -> dict:
+        """Get the JSON form of the routine."""
+        return {
+            "name": self.name,
+            "steps": [
+                {"x": step.x, "y": step.y, "button": step.button, "delay_ms": step.delay_ms}
+                for step in self.steps
+            ],
+        }
+
+
+def routine_path(name: str, directory: Path = config.MACROS_DIR) -> Path:
+    """Get the file a routine name refers to; an existing file path is used as is."""
+    path = Path(name)
+    if path.suffix == ".json" and path.exists():
+        return path
+    return directory / f"{name}.json"
+
+
+def load_routine(name: str, directory: Path = config.MACROS_DIR) -> Routine:
+    """Load a routine by name or path; raises ValueError if it is missing or malformed."""
+    path = routine_path(name, directory)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except OSError as e:
+        raise ValueError(f"Routine '{name}' not found at {path}") from e
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Routine file {path} is not valid JSON: {e}") from e
+    routine = Routine.from_dict(data)
+    return routine if routine.name else Routine(path.stem, routine.steps)
+
+
+def save_routine(routine: Routine, directory: Path = config.MACROS_DIR) -> Path:
+    """Write a routine to its file and return the path."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{routine.name}.json"
+    path.write_text(json.dumps(routine.to_dict(), indent=2), encoding="utf-8")
+    return path
+
+
+def compile_routine(routine: Routine, geometry: WindowGeometry) -> tuple[CompiledStep, ...]:
+    """Turn a routine into ready-made message parameters for a window's current size."""
+    compiled = []
+    for step in routine.steps:
+        down, buttons, up = BUTTONS[step.button]
+        l_param = pack_point(*geometry.client_point(step.x, step.y))
+        compiled.append((down, buttons, up, l_param, round(step.delay_ms * 1_000_000)))
+    return tuple(compiled)
+
+
+class MacroClicker(AutoClicker):
+    """Plays a routine in a loop on the click scheduler instead of clicking one point.
+
+    Each step returns its delay to the scheduler, which keeps the same absolute
+    deadlines, catch-up policy and statistics as for regular clicking. The CPS
+    setting does not apply; the routine's delays set the pace.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        stop_event: threading.Event,
+        routine: Routine,
+        policy: CatchUpPolicy = CatchUpPolicy.SKIP,
+        **kwargs,
+    ):
+        super().__init__(hwnd, stop_event, policy=policy, **kwargs)
+        self.routine = routine
+        self.program = compile_routine(routine, self.geometry)
+        self.compilations = 1
+        self.passes = 0
+        self._index = 0
+        self._expected_ns: int | None = None
+        self.scheduler.set_cps(routine.steps_per_second)
+        self.telemetry.set_target_cps(routine.steps_per_second)
+
+    def update_position(self):
+        """Recompile the routine for the window's current size."""
+        super().update_position()
+        # Swapped as one tuple, so a step never mixes positions from two sizes
+        self.program = compile_routine(self.routine, self.geometry)
+        self.compilations += 1
+
+    def update_cps(self):
+        """Ignore CPS changes: the routine's delays set the pace."""
+
+    def send_click(self) -> int:
+        """Play the next step and return the nanoseconds until the one after it."""
+        if self.injected:
+            self._send_injected()
+        program = self.program
+        index = self._index
+        down, buttons, up, l_param, delay_ns = program[index]
+        index += 1
+        if index == len(program):
+            index = 0
+            self.passes += 1
+        self._index = index
+        start_ns = time.perf_counter_ns()
+        delivered = self.dispatcher.send(down, buttons, up, l_param)
+        end_ns = time.perf_counter_ns()
+        if delivered:
+            self.telemetry.record_click(start_ns, end_ns, self._expected_ns)
+        if self.recorder is not None:
+            self.recorder.record(start_ns, self.hwnd, l_param, end_ns - start_ns, delivered)
+        self._expected_ns = delay_ns
+        return delay_ns
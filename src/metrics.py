@@ -0,0 +1,399 @@
+"""Module for exporting click metrics in the Prometheus text format.
+
+Nothing is added to the click path: a scrape reads the counters the clickers
+already keep (telemetry histograms, dispatcher counts) and formats them then.
+Clickers and window registries add themselves to ``REGISTRY`` when they are
+created and are held weakly, so a finished session drops out once it is gone.
+A clicker exports what it keeps: a ``MultiWindowClicker`` reports its clicks
+once for all windows and its dispatcher counts per window, and a
+``ProcessClicker`` only what its engine publishes in the control block (no
+latency buckets, injected clicks or failed-click counts).
+Values are read without locks; a scrape racing a click may count it in one
+metric and not yet in another, which the next scrape makes up for.
+
+The server binds to localhost only; each bot instance on a machine takes its
+own port.
+"""
+
+import itertools
+import logging
+import threading
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+
+from . import __version__, config
+from .telemetry import ClickTelemetry, LatencyHistogram
+
+
+if TYPE_CHECKING:
+    from .clicker import AutoClicker
+    from .engine import MultiWindowClicker
+    from .process_host import ProcessClicker
+    from .window_finder import WindowRegistry
+
+    Clicker = AutoClicker | MultiWindowClicker | ProcessClicker
+
+
+PREFIX = "cookie_bot"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Quantiles of the dispatch latency summary
+QUANTILES = (0.5, 0.9, 0.99)
+
+logger = logging.getLogger(__name__)
+
+# A metric sample: name suffix, label text ('{a="b"}' or ""), value
+Sample = tuple[str, str, float]
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus parses it."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(**labels: str) -> str:
+    """Format a label set."""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def _family(lines: list[str], name: str, kind: str, help_text: str, samples: Iterable[Sample]):
+    """Append one metric family with its HELP and TYPE lines."""
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+    lines.extend(
+        f"{PREFIX}_{name}{suffix}{labels} {_format_value(value)}"
+        for suffix, labels, value in samples
+    )
+
+
+def _summary_samples(histogram: LatencyHistogram, labels: dict[str, str]) -> list[Sample]:
+    """Quantiles (estimated from the buckets), sum and count of a latency histogram, in seconds."""
+    samples = [
+        ("", _labels(**labels, quantile=str(q)), histogram.percentile(q * 100) / 1e6)
+        for q in QUANTILES
+    ]
+    text = _labels(**labels)
+    samples.append(("_sum", text, histogram.sum_ns / 1e9))
+    samples.append(("_count", text, histogram.total))
+    return samples
+
+
+def _histogram_samples(histogram: LatencyHistogram, labels: dict[str, str]) -> list[Sample]:
+    """Cumulative buckets, sum and count of a latency histogram, in seconds."""
+    samples = []
+    cumulative = 0
+    bounds = [*histogram.bounds_us, None]
+    for bound_us, count in zip(bounds, histogram.counts, strict=True):
+        cumulative += count
+        le = "+Inf" if bound_us is None else repr(bound_us / 1_000_000)
+        samples.append(("_bucket", _labels(**labels, le=le), cumulative))
+    text = _labels(**labels)
+    samples.append(("_sum", text, histogram.sum_ns / 1e9))
+    samples.append(("_count", text, cumulative))
+    return samples
+
+
+@dataclass(slots=True)
+class _ClickerReading:
+    """What a scrape reads from a clicker's telemetry; None where it is not kept."""
+
+    labels: dict[str, str]
+    clicks: int
+    target_cps: float
+    achieved_cps: float
+    injected: int | None = None
+    dispatch: LatencyHistogram | None = None
+
+
+@dataclass(slots=True)
+class _DispatchReading:
+    """What a scrape reads from one window's dispatcher; None where it is not kept."""
+
+    labels: dict[str, str]
+    hangs: int
+    hung: bool
+    timeouts: int | None = None
+    dropped: int | None = None
+
+
+def _read_clicker(label: str, clicker: "Clicker") -> tuple[_ClickerReading, list[_DispatchReading]]:
+    """Read a clicker's telemetry and the dispatcher of each window it drives."""
+    targets = getattr(clicker, "targets", None)
+    if targets is not None:
+        # One telemetry for every window, one dispatcher per window
+        labels = {"clicker": label}
+        dispatchers = [
+            _DispatchReading(
+                {"clicker": label, "hwnd": f"0x{target.hwnd:x}"},
+                target.dispatcher.hangs,
+                target.dispatcher.hung,
+                target.dispatcher.timeouts,
+                target.dispatcher.dropped,
+            )
+            for target in list(targets.values())
+        ]
+    elif isinstance(clicker.telemetry, ClickTelemetry):
+        labels = {"clicker": label, "hwnd": f"0x{clicker.hwnd:x}"}
+        dispatcher = clicker.dispatcher
+        dispatchers = [
+            _DispatchReading(
+                labels, dispatcher.hangs, dispatcher.hung, dispatcher.timeouts, dispatcher.dropped
+            )
+        ]
+    else:
+        # The engine runs in another process and only publishes its hang counters
+        labels = {"clicker": label, "hwnd": f"0x{clicker.hwnd:x}"}
+        hung, hangs, _ = clicker.dispatch_counts()
+        dispatchers = [_DispatchReading(labels, hangs, bool(hung))]
+
+    telemetry = clicker.telemetry
+    if isinstance(telemetry, ClickTelemetry):
+        reading = _ClickerReading(
+            labels,
+            telemetry.clicks,
+            telemetry.target_cps,
+            telemetry.achieved_cps(),
+            telemetry.injection.total,
+            telemetry.dispatch,
+        )
+    else:
+        snapshot = telemetry.snapshot()
+        reading = _ClickerReading(
+            labels, snapshot.clicks, snapshot.target_cps, snapshot.achieved_cps
+        )
+    return reading, dispatchers
+
+
+class MetricsRegistry:
+    """Weakly tracks the clickers and window registries of the process and renders their metrics.
+
+    Each clicker gets a sequence number as its ``clicker`` label, so a session
+    that replaced another on the same window still has distinct series.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clickers: weakref.WeakKeyDictionary[Clicker, str] = weakref.WeakKeyDictionary()
+        self._registries: weakref.WeakSet[WindowRegistry] = weakref.WeakSet()
+        self._ids = itertools.count(1)
+
+    def add_clicker(self, clicker: "Clicker"):
+        """Export a clicker's metrics for as long as it exists."""
+        with self._lock:
+            self._clickers[clicker] = str(next(self._ids))
+
+    def add_registry(self, registry: "WindowRegistry"):
+        """Count a window registry's re-discoveries for as long as it exists."""
+        with self._lock:
+            self._registries.add(registry)
+
+    def clickers(self) -> list[tuple[str, "Clicker"]]:
+        """The live clickers with their labels, oldest first."""
+        with self._lock:
+            items = list(self._clickers.items())
+        return sorted(((label, clicker) for clicker, label in items), key=lambda item: int(item[0]))
+
+    def render(self) -> str:
+        """Format every metric in the Prometheus text format."""
+        readings = [_read_clicker(label, clicker) for label, clicker in self.clickers()]
+        clickers = [reading for reading, _ in readings]
+        dispatchers = [
+            dispatcher for _, window_dispatchers in readings for dispatcher in window_dispatchers
+        ]
+        with self._lock:
+            registries = list(self._registries)
+
+        lines = []
+        _family(
+            lines,
+            "build_info",
+            "gauge",
+            "Version of the bot.",
+            [("", _labels(version=__version__), 1)],
+        )
+        _family(lines, "clickers", "gauge", "Clickers in the process.", [("", "", len(clickers))])
+        _family(
+            lines,
+            "window_rediscoveries_total",
+            "counter",
+            "Times the game window was found again after it was lost.",
+            [("", "", sum(registry.rediscoveries for registry in registries))],
+        )
+        _family(
+            lines,
+            "clicks_total",
+            "counter",
+            "Clicks the game handled.",
+            [("", _labels(**reading.labels), reading.clicks) for reading in clickers],
+        )
+        _family(
+            lines,
+            "clicks_failed_total",
+            "counter",
+            "Clicks not delivered: timed out, or dropped while the window was unresponsive.",
+            [
+                sample
+                for dispatcher in dispatchers
+                if dispatcher.timeouts is not None
+                for sample in (
+                    ("", _labels(**dispatcher.labels, reason="timeout"), dispatcher.timeouts),
+                    ("", _labels(**dispatcher.labels, reason="dropped"), dispatcher.dropped),
+                )
+            ],
+        )
+        _family(
+            lines,
+            "injected_clicks_total",
+            "counter",
+            "One-off clicks delivered, such as golden cookies.",
+            [
+                ("", _labels(**reading.labels), reading.injected)
+                for reading in clickers
+                if reading.injected is not None
+            ],
+        )
+        _family(
+            lines,
+            "target_cps",
+            "gauge",
+            "Configured clicks per second.",
+            [("", _labels(**reading.labels), reading.target_cps) for reading in clickers],
+        )
+        _family(
+            lines,
+            "achieved_cps",
+            "gauge",
+            "Clicks per second over the most recent clicks.",
+            [("", _labels(**reading.labels), reading.achieved_cps) for reading in clickers],
+        )
+        _family(
+            lines,
+            "dispatch_seconds",
+            "summary",
+            "Time to deliver a click, quantiles estimated from the histogram buckets.",
+            [
+                sample
+                for reading in clickers
+                if reading.dispatch is not None
+                for sample in _summary_samples(reading.dispatch, reading.labels)
+            ],
+        )
+        _family(
+            lines,
+            "dispatch_latency_seconds",
+            "histogram",
+            "Time to deliver a click.",
+            [
+                sample
+                for reading in clickers
+                if reading.dispatch is not None
+                for sample in _histogram_samples(reading.dispatch, reading.labels)
+            ],
+        )
+        _family(
+            lines,
+            "stalls_total",
+            "counter",
+            "Times the game window stopped answering clicks.",
+            [("", _labels(**dispatcher.labels), dispatcher.hangs) for dispatcher in dispatchers],
+        )
+        _family(
+            lines,
+            "window_unresponsive",
+            "gauge",
+            "Whether the game window is not answering clicks right now.",
+            [
+                ("", _labels(**dispatcher.labels), int(dispatcher.hung))
+                for dispatcher in dispatchers
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry's metrics on GET /metrics."""
+
+    server: "MetricsServer._Server"
+
+    def do_GET(self):
+        """Answer a scrape."""
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        """Keep scrapes out of the session log."""
+        logger.debug(format, *args)
+
+
+class MetricsServer:
+    """HTTP endpoint for Prometheus, answering on a daemon thread."""
+
+    class _Server(ThreadingHTTPServer):
+        """HTTP server that knows which registry to render."""
+
+        daemon_threads = True
+        registry: MetricsRegistry
+
+    def __init__(
+        self,
+        port: int = config.METRICS_PORT,
+        host: str = config.METRICS_HOST,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.host = host
+        self.requested_port = port
+        self.registry = registry
+        self._server: MetricsServer._Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the endpoint is serving."""
+        return self._server is not None
+
+    @property
+    def port(self) -> int:
+        """Port the endpoint listens on (the one picked by the system if 0 was requested)."""
+        return self._server.server_address[1] if self._server else self.requested_port
+
+    @property
+    def url(self) -> str:
+        """Address to scrape."""
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self):
+        """Bind the port and start serving; raises OSError if the port is taken."""
+        if self._server is not None:
+            return
+        server = self._Server((self.host, self.requested_port), _MetricsHandler)
+        server.registry = self.registry
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving and release the port."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,309 @@
+"""Module for planning purchases offline by best payback time.
+
+The planner simulates a game from a ``GameState``: income accrues until the
+best-ranked purchase is affordable, it is bought, and the ranking is updated.
+Candidates are every building and every unlocked tier upgrade (each doubles
+one building type's output), ranked in a heap by the strategy's key, by
+default payback time (cost / CpS gain).
+
+A purchase only changes the cost or the gain of candidates of the same
+building type, so each purchase re-ranks that type's handful of entries
+instead of re-scoring the whole catalog; outdated heap entries are recognized
+by a per-type version and skipped when they surface. Thousands of purchases
+are planned per second.
+
+Tier upgrades use the game's unlock thresholds and approximately its prices.
+Upgrades with cross-building effects (cursor fingers, grandma synergies,
+kittens, ...) are not modeled.
+
+Usage:
+    python -m src.optimizer SAVE_FILE [--purchases N] [--strategy payback|cheapest]
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+
+from .cookies import format_count
+from .savegame import BUILDINGS, GameState, parse_save
+
+
+# Price of a building rises by this factor with every one owned
+PRICE_GROWTH = 1.15
+
+# Buildings of a type owned to unlock each tier upgrade, and its price in base prices
+TIER_UNLOCKS = (1, 5, 25, 50, 100, 150, 200, 250, 300, 350, 400, 450, 500, 550, 600)
+TIER_PRICES = (
+    10, 50, 500, 5e4, 5e6, 5e8, 5e11, 5e14, 5e17, 5e20, 5e23, 5e26, 5e29, 5e32, 5e35,
+)  # fmt: skip
+
+# Candidate kinds, as stored in heap entries
+BUILDING = -1  # Otherwise the entry is a tier upgrade and this is its tier index
+
+
+class Strategy(StrEnum):
+    """How candidates are ranked; each key depends only on the candidate's cost and gain."""
+
+    PAYBACK = "payback"  # Lowest cost / CpS gain first
+    CHEAPEST = "cheapest"  # Lowest cost first
+
+
+STRATEGY_KEYS: dict[Strategy, Callable[[float, float], float]] = {
+    Strategy.PAYBACK: lambda cost, gain: cost / gain,
+    Strategy.CHEAPEST: lambda cost, gain: cost,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Purchase:
+    """One planned purchase."""
+
+    at_s: float  # Seconds into the simulation
+    name: str
+    cost: float
+    cps: float  # Production after the purchase
+
+
+def tier_name(building: int, tier: int) -> str:
+    """Name of a tier upgrade in plans."""
+    return f"{BUILDINGS[building][0]} tier {tier + 1}"
+
+
+class PurchaseOptimizer:
+    """Plans purchases one at a time, keeping the ranking current incrementally.
+
+    ``click_income`` is the cookies per second the clicker adds on top of the
+    buildings; ``multiplier`` scales every building's output (prestige, ...).
+    """
+
+    def __init__(
+        self,
+        amounts: list[int] | None = None,
+        tiers: list[int] | None = None,
+        cookies: float = 0.0,
+        click_income: float = 0.0,
+        multiplier: float = 1.0,
+        strategy: Strategy = Strategy.PAYBACK,
+    ):
+        count = len(BUILDINGS)
+        self.amounts = list(amounts or [0] * count)
+        # Owned tier upgrades of each building type, as a bit mask
+        self.tiers = list(tiers or [0] * count)
+        self.cookies = cookies
+        self.click_income = click_income
+        self.multiplier = multiplier
+        self.strategy = Strategy(strategy)
+        self.key = STRATEGY_KEYS[self.strategy]
+        self.elapsed_s = 0.0
+        self.purchases = 0
+        self.baked = 0.0  # Cookies produced during the simulation
+        self._versions = [0] * count
+        self._heap: list[tuple[float, int, int, int, int, float]] = []
+        self._sequence = itertools.count()
+        self.rescored = 0  # Heap entries pushed, to show how little each purchase touches
+        self.cps = sum(self.output(building) for building in range(count))
+        for building in range(count):
+            self._rank(building)
+
+    @classmethod
+    def from_state(
+        cls,
+        state: GameState,
+        click_income: float = 0.0,
+        strategy: Strategy = Strategy.PAYBACK,
+        assume_tiers: bool = True,
+    ) -> "PurchaseOptimizer":
+        """Start from a saved game.
+
+        The save stores upgrades by the game's IDs, which this model does not map;
+        with ``assume_tiers`` every tier upgrade the building counts have unlocked
+        is taken as bought, otherwise none is.
+        """
+        amounts = [building.amount for building in state.buildings]
+        tiers = [
+            sum(1 << tier for tier, unlock in enumerate(TIER_UNLOCKS) if amount >= unlock)
+            if assume_tiers
+            else 0
+            for amount in amounts
+        ]
+        return cls(
+            amounts,
+            tiers,
+            cookies=state.cookies,
+            click_income=click_income,
+            multiplier=1 + state.prestige / 100,
+            strategy=strategy,
+        )
+
+    def unit_output(self, building: int) -> float:
+        """CpS of one building of a type with its current upgrades."""
+        return BUILDINGS[building][2] * (1 << self.tiers[building].bit_count()) * self.multiplier
+
+    def output(self, building: int) -> float:
+        """CpS of all buildings of a type."""
+        return self.amounts[building] * self.unit_output(building)
+
+    def building_price(self, building: int) -> float:
+        """Price of the next building of a type."""
+        return BUILDINGS[building][1] * PRICE_GROWTH ** self.amounts[building]
+
+    @property
+    def income(self) -> float:
+        """Cookies gained per second, clicking included."""
+        return self.cps + self.click_income
+
+    def _push(self, building: int, tier: int, cost: float, gain: float):
+        """Add one candidate to the ranking."""
+        if gain > 0:
+            heapq.heappush(
+                self._heap,
+                (
+                    self.key(cost, gain),
+                    next(self._sequence),
+                    building,
+                    tier,
+                    self._versions[building],
+                    cost,
+                ),
+            )
+            self.rescored += 1
+
+    def _rank(self, building: int):
+        """(Re-)rank the candidates of one building type after its cost or output changed."""
+        self._versions[building] += 1  # Entries pushed before are now outdated
+        self._push(building, BUILDING, self.building_price(building), self.unit_output(building))
+        owned, amount = self.tiers[building], self.amounts[building]
+        output = self.output(building)
+        base_price = BUILDINGS[building][1]
+        for tier, unlock in enumerate(TIER_UNLOCKS):
+            if unlock > amount:
+                break
+            if not owned >> tier & 1:
+                self._push(building, tier, base_price * TIER_PRICES[tier], output)
+
+    def best(self) -> tuple[int, int, float] | None:
+        """Get the top-ranked candidate as (building, tier, cost), dropping outdated entries."""
+        heap, versions = self._heap, self._versions
+        while heap:
+            _, _, building, tier, version, cost = heap[0]
+            if version == versions[building]:
+                return building, tier, cost
+            heapq.heappop(heap)
+        return None
+
+    def buy_next(self) -> Purchase | None:
+        """Wait until the best candidate is affordable and buy it; None if nothing ever will be."""
+        best = self.best()
+        if best is None:
+            return None
+        building, tier, cost = best
+        if self.cookies < cost:
+            if self.income <= 0:
+                return None
+            wait_s = (cost - self.cookies) / self.income
+            self.elapsed_s += wait_s
+            self.baked += self.cps * wait_s
+            self.cookies = cost
+        self.cookies -= cost
+
+        before = self.output(building)
+        if tier == BUILDING:
+            self.amounts[building] += 1
+            name = BUILDINGS[building][0]
+        else:
+            self.tiers[building] |= 1 << tier
+            name = tier_name(building, tier)
+        self.cps += self.output(building) - before
+        self._rank(building)
+        self.purchases += 1
+        return Purchase(self.elapsed_s, name, cost, self.cps)
+
+    def plan(self, purchases: int | None = None, duration_s: float | None = None) -> list[Purchase]:
+        """Plan purchases until a count or a simulated duration is reached."""
+        if purchases is None and duration_s is None:
+            raise ValueError("Give a number of purchases or a duration to plan for")
+        plan = []
+        while purchases is None or len(plan) < purchases:
+            best = self.best()
+            if best is None:
+                break
+            if duration_s is not None:
+                # Stop when the next purchase would only be affordable after the deadline
+                wait_s = max(0.0, best[2] - self.cookies) / self.income if self.income else math.inf
+                if self.elapsed_s + wait_s > duration_s:
+                    remaining_s = duration_s - self.elapsed_s
+                    self.elapsed_s = duration_s
+                    self.cookies += self.income * remaining_s
+                    self.baked += self.cps * remaining_s
+                    break
+            purchase = self.buy_next()
+            if purchase is None:
+                break
+            plan.append(purchase)
+        return plan
+
+
+def compare_strategies(
+    state: GameState, duration_s: float, click_income: float = 0.0
+) -> dict[str, dict]:
+    """Simulate every strategy from the same state and report where each ends up."""
+    results = {}
+    for strategy in Strategy:
+        optimizer = PurchaseOptimizer.from_state(state, click_income, strategy)
+        plan = optimizer.plan(duration_s=duration_s)
+        results[strategy.value] = {
+            "purchases": len(plan),
+            "final_cps": optimizer.cps,
+            "baked": optimizer.baked,
+            "cookies": optimizer.cookies,
+        }
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print a purchase plan for an exported save."""
+    parser = argparse.ArgumentParser(description="Plan purchases for an exported save.")
+    parser.add_argument("save", help="file holding the exported save text ('-' for stdin)")
+    parser.add_argument("--purchases", type=int, default=50)
+    parser.add_argument("--strategy", choices=[strategy.value for strategy in Strategy])
+    parser.add_argument("--click-income", type=float, default=0.0, help="cookies/s from clicking")
+    parser.add_argument(
+        "--compare", type=float, metavar="SECONDS", help="compare strategies over this long"
+    )
+    args = parser.parse_args(argv)
+
+    text = sys.stdin.read() if args.save == "-" else Path(args.save).read_text(encoding="utf-8")
+    try:
+        state = parse_save(text)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.compare:
+        for strategy, result in compare_strategies(state, args.compare, args.click_income).items():
+            print(
+                f"{strategy:<10} {result['purchases']:>6} purchases, "
+                f"{format_count(result['final_cps'])} CpS, {format_count(result['baked'])} baked"
+            )
+        return 0
+
+    optimizer = PurchaseOptimizer.from_state(
+        state, args.click_income, args.strategy or Strategy.PAYBACK
+    )
+    print(f"🍪 {state.bakery_name or 'Bakery'}: {format_count(optimizer.cps)} CpS modeled")
+    for purchase in optimizer.plan(purchases=args.purchases):
+        print(
+            f"{purchase.at_s:>10.0f}s  {purchase.name:<28} {format_count(purchase.cost):>16}  "
+            f"-> {format_count(purchase.cps)} CpS"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,95 @@
-"""Module for the visual overlay to show where the autoclicker is clicking."""
+"""Module for the visual overlay to show where the autoclicker is clicking.
+
+The overlay is one small borderless window whose canvas items are created once.
+Position changes, the click rate and golden cookie hits only update plain
+attributes (from any thread); a timer on the Tk thread applies the latest state
+at most ``max_fps`` times a second, and only moves the window or reconfigures an
+item when what it shows has changed.
+"""
 
 import contextlib
 import threading
+import time
 import tkinter as tk
+from collections import deque
+from collections.abc import Callable
 
 
-class ClickOverlay:
-    """Responsible for displaying a visual overlay at the click position."""
+# Overlay window edge length; the dot sits in the middle, the rate arc around it
+SIZE = 72
+DOT_RADIUS = 8
+CROSS_SIZE = 12
+ARC_RADIUS = 22
+HIT_RADIUS = 29
+
+# Upper bound on redraws per second, and how often the click rate is read
+MAX_FPS = 30
+RATE_REFRESH_S = 0.25
+
+# The arc grows in steps of this many degrees, so tiny rate changes don't redraw
+ARC_STEP_DEG = 6
+
+# Arc color by achieved/target ratio (first threshold reached wins)
+HEAT_COLORS = ((0.95, "#3cd25a"), (0.75, "#f0c040"), (0.0, "#e04040"))
+
+# A golden cookie hit flashes the outer ring this long and counts as recent this long
+HIT_FLASH_S = 1.0
+RECENT_HITS_S = 60.0
 
-    def __init__(self, parent=None):
+# Canvas background, made transparent on Windows
+TRANSPARENT = "white"
+
+
+def heat_color(ratio: float) -> str:
+    """Color of the rate arc for an achieved/target ratio."""
+    for threshold, color in HEAT_COLORS:
+        if ratio >= threshold:
+            return color
+    return HEAT_COLORS[-1][1]
+
+
+class ClickOverlay:
+    """Responsible for displaying a visual overlay at the click position.
+
+    ``rate`` returns (achieved CPS, target CPS) for the pulse arc; without it only
+    the click point is shown.
+    """
+
+    def __init__(
+        self,
+        parent=None,
+        rate: Callable[[], tuple[float, float]] | None = None,
+        max_fps: float = MAX_FPS,
+    ):
         self.parent = parent
+        self.rate = rate
+        self.period_ms = max(1, round(1000 / max_fps))
         self.root = None
         self.canvas = None
         self.running = False
         self.position_ready = threading.Event()
-        self.click_x = 0
-        self.click_y = 0
+        # Screen (x, y) of the click point, swapped as one tuple
+        self.position = (0, 0)
+        self.hit_times: deque[float] = deque(maxlen=64)
+        self.redraws = 0
+        self._items: dict[str, int] = {}
+        self._drawn: tuple | None = None
+        self._rate = (0.0, 0.0)
+        self._rate_read = 0.0
+
+    @property
+    def click_x(self) -> int:
+        """Screen X coordinate of the click point."""
+        return self.position[0]
+
+    @property
+    def click_y(self) -> int:
+        """Screen Y coordinate of the click point."""
+        return self.position[1]
 
     def set_position(self, x: int, y: int):
         """Set the position where the overlay will be created."""
-        self.click_x = x
-        self.click_y = y
+        self.position = (x, y)
         self.position_ready.set()
 
     def create_overlay(self):
@@ -38,52 +107,102 @@ class ClickOverlay:
         self.root.title("Click Overlay")
 
         # Configure the window as transparent and always on top
-        self.root.attributes("-transparentcolor", "white")
+        self.root.attributes("-transparentcolor", TRANSPARENT)
         self.root.attributes("-topmost", True)
         self.root.overrideredirect(True)  # No borders
 
-        # Overlay size (circle + margin)
-        size = 40
-        self.root.geometry(f"{size}x{size}+{self.click_x - size // 2}+{self.click_y - size // 2}")
-
-        # Canvas to draw the dot
         self.canvas = tk.Canvas(
-            self.root, width=size, height=size, bg="white", highlightthickness=0
+            self.root, width=SIZE, height=SIZE, bg=TRANSPARENT, highlightthickness=0
         )
         self.canvas.pack()
-
-        # Draw a red circle with border
-        center = size // 2
-        radius = 8
-        self.canvas.create_oval(
-            center - radius,
-            center - radius,
-            center + radius,
-            center + radius,
-            fill="red",
-            outline="yellow",
-            width=2,
-        )
-
-        # Draw a cross in the center
-        cross_size = 12
-        self.canvas.create_line(
-            center - cross_size, center, center + cross_size, center, fill="yellow", width=2
-        )
-        self.canvas.create_line(
-            center, center - cross_size, center, center + cross_size, fill="yellow", width=2
-        )
+        self._create_items()
 
         self.running = True
+        self._tick()
+
+    def _create_items(self):
+        """Create every canvas item once; later frames only reconfigure them."""
+        canvas = self.canvas
+        center = SIZE // 2
+
+        def box(radius: int) -> tuple[int, int, int, int]:
+            return center - radius, center - radius, center + radius, center + radius
+
+        self._items = {
+            "hit": canvas.create_oval(*box(HIT_RADIUS), outline="#ffd700", width=3, state="hidden"),
+            "heat": canvas.create_arc(
+                *box(ARC_RADIUS),
+                start=90,
+                extent=0,
+                style="arc",
+                width=4,
+                outline=HEAT_COLORS[0][1],
+            ),
+            "dot": canvas.create_oval(*box(DOT_RADIUS), fill="red", outline="yellow", width=2),
+            "cross_x": canvas.create_line(
+                center - CROSS_SIZE, center, center + CROSS_SIZE, center, fill="yellow", width=2
+            ),
+            "cross_y": canvas.create_line(
+                center, center - CROSS_SIZE, center, center + CROSS_SIZE, fill="yellow", width=2
+            ),
+            "label": canvas.create_text(
+                center, SIZE - 5, text="", fill="yellow", font=("Segoe UI", 7, "bold")
+            ),
+        }
 
     def update_position(self, x: int, y: int):
-        """Update the overlay position in real-time."""
-        if self.root and self.running:
-            self.click_x = x
-            self.click_y = y
-            size = 40
-            with contextlib.suppress(Exception):
-                self.root.geometry(f"{size}x{size}+{x - size // 2}+{y - size // 2}")
+        """Move the overlay to a new click position (applied on the next frame)."""
+        self.position = (x, y)
+
+    def notify_hit(self):
+        """Record a golden cookie hit (safe to call from any thread)."""
+        self.hit_times.append(time.perf_counter())
+
+    def state(self, now: float) -> tuple:
+        """What the overlay should show, quantized so that unchanged looks compare equal."""
+        if self.rate and now - self._rate_read >= RATE_REFRESH_S:
+            self._rate_read = now
+            with contextlib.suppress(Exception):  # The clicker may be shutting down
+                self._rate = self.rate()
+        achieved, target = self._rate
+        ratio = achieved / target if target > 0 else 0.0
+        extent = round(min(ratio, 1.0) * 360 / ARC_STEP_DEG) * ARC_STEP_DEG
+        recent = sum(1 for hit in self.hit_times if now - hit < RECENT_HITS_S)
+        flashing = bool(self.hit_times) and now - self.hit_times[-1] < HIT_FLASH_S
+        label = f"{achieved:.0f}" if self.rate else ""
+        if recent:
+            label += f" ★{recent}"
+        return self.position, min(extent, 359), heat_color(ratio), label, flashing
+
+    def _tick(self):
+        """Apply the latest state if it changed, then wait for the next frame."""
+        if not self.running:
+            return
+        state = self.state(time.perf_counter())
+        if state != self._drawn:
+            with contextlib.suppress(tk.TclError):  # The window may be closing
+                self._apply(state, self._drawn)
+                self._drawn = state
+                self.redraws += 1
+        self.root.after(self.period_ms, self._tick)
+
+    def _apply(self, state: tuple, previous: tuple | None):
+        """Push the parts of a state that differ from the previous one to Tk."""
+        (x, y), extent, color, label, flashing = state
+        changed = (
+            [True] * 5
+            if previous is None
+            else [a != b for a, b in zip(state, previous, strict=True)]
+        )
+        canvas, items = self.canvas, self._items
+        if changed[0]:
+            self.root.geometry(f"{SIZE}x{SIZE}+{x - SIZE // 2}+{y - SIZE // 2}")
+        if changed[1] or changed[2]:
+            canvas.itemconfigure(items["heat"], extent=-extent, outline=color)
+        if changed[3]:
+            canvas.itemconfigure(items["label"], text=label)
+        if changed[4]:
+            canvas.itemconfigure(items["hit"], state="normal" if flashing else "hidden")
 
     def run(self):
         """Start the tkinter loop."""
@@ -0,0 +1,392 @@
+"""Module for hosting the click engine in a child process.
+
+The GUI and the click loop otherwise share one interpreter and one GIL, so log
+inserts, slider drags and overlay redraws delay clicks. ``ProcessClicker`` runs
+an ``AutoClicker`` in a separate process instead. Both sides talk through a small
+shared-memory ``ControlBlock``: the GUI writes the settings and the stop flag,
+the engine writes its statistics back, and neither side ever takes a lock.
+"""
+
+import ctypes
+import dataclasses
+import multiprocessing
+import sys
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from struct import Struct
+
+from . import config, metrics
+from .backend import WindowBackend
+from .clicker import AutoClicker
+from .dispatch import HangEvent
+from .geometry import GeometryTracker, WindowGeometry
+from .scheduler import SchedulerStats
+from .telemetry import SESSIONS_DIR, TelemetrySnapshot, write_summary
+
+
+# How often each side looks at the control block
+POLL_INTERVAL_S = 0.02
+
+# How long a child that ignores the stop flag gets before it is terminated
+STOP_TIMEOUT_S = 2.0
+
+# Attempts at a consistent read before a reader gives up on a writer (one killed mid-write)
+READ_ATTEMPTS = 10_000
+
+ABOVE_NORMAL_PRIORITY_CLASS = 0x8000
+
+# Engine states published in the stats region
+STARTING, RUNNING, FINISHED = 0, 1, 2
+
+# Layout of the control block. Each region has a single writer and is guarded
+# by a sequence counter (a seqlock): the writer makes it odd while writing and
+# even when done, and a reader retries until it sees the same even value
+# before and after copying the fields. A writer that was killed mid-write
+# leaves the counter odd for good, so readers only retry a bounded number of
+# times and then fall back to the last copy they read.
+_SEQ = Struct("<Q")
+_STOP = Struct("<Q")
+_SETTINGS = Struct("<ddd")  # cps, relative_x, relative_y
+# state, scheduler stats, telemetry snapshot, dispatcher hung/hangs/recoveries
+_STATS = Struct("<Q" + "QQdddddd" + "Qdddddddd" + "QQQ")
+
+_STOP_OFFSET = 0
+_SETTINGS_SEQ_OFFSET = _STOP_OFFSET + _STOP.size
+_SETTINGS_OFFSET = _SETTINGS_SEQ_OFFSET + _SEQ.size
+_STATS_SEQ_OFFSET = _SETTINGS_OFFSET + _SETTINGS.size
+_STATS_OFFSET = _STATS_SEQ_OFFSET + _SEQ.size
+BLOCK_SIZE = _STATS_OFFSET + _STATS.size
+
+
+class ControlBlock:
+    """Fixed-layout shared-memory segment shared by the GUI and the engine."""
+
+    def __init__(self, memory: SharedMemory, owner: bool):
+        self.memory = memory
+        self.owner = owner
+        self._buf = memory.buf
+        # Last consistent copy of each region, by sequence offset
+        self._last: dict[int, tuple[int, tuple]] = {}
+
+    @classmethod
+    def create(cls) -> "ControlBlock":
+        """Allocate a new, zeroed control block."""
+        return cls(SharedMemory(create=True, size=BLOCK_SIZE), owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ControlBlock":
+        """Open a control block created by another process."""
+        return cls(SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name used to attach to the block from another process."""
+        return self.memory.name
+
+    def _write(self, seq_offset: int, layout: Struct, offset: int, values: tuple):
+        """Write a region under its sequence counter (single writer only)."""
+        buf = self._buf
+        seq = _SEQ.unpack_from(buf, seq_offset)[0]
+        _SEQ.pack_into(buf, seq_offset, seq + 1)
+        layout.pack_into(buf, offset, *values)
+        _SEQ.pack_into(buf, seq_offset, seq + 2)
+
+    def _read(self, seq_offset: int, layout: Struct, offset: int) -> tuple[int, tuple]:
+        """Read a consistent copy of a region and the sequence value it was read at.
+
+        If no consistent copy can be had (the writer died mid-write), the last
+        one read is returned, or zeros if there was none.
+        """
+        buf = self._buf
+        for _ in range(READ_ATTEMPTS):
+            before = _SEQ.unpack_from(buf, seq_offset)[0]
+            if before & 1:
+                continue  # Write in progress
+            values = layout.unpack_from(buf, offset)
+            if _SEQ.unpack_from(buf, seq_offset)[0] == before:
+                self._last[seq_offset] = before, values
+                return before, values
+        return self._last.get(seq_offset) or (0, layout.unpack(bytes(layout.size)))
+
+    def request_stop(self):
+        """Ask the engine to stop."""
+        _STOP.pack_into(self._buf, _STOP_OFFSET, 1)
+
+    @property
+    def stop_requested(self) -> bool:
+        """Whether the GUI asked the engine to stop."""
+        return bool(_STOP.unpack_from(self._buf, _STOP_OFFSET)[0])
+
+    def write_settings(self, settings: config.Settings):
+        """Publish the settings the engine should follow."""
+        values = (settings.cps, settings.relative_x, settings.relative_y)
+        self._write(_SETTINGS_SEQ_OFFSET, _SETTINGS, _SETTINGS_OFFSET, values)
+
+    def read_settings(self) -> tuple[int, tuple[float, float, float]]:
+        """Get (version, (cps, relative_x, relative_y)); the version changes on every write."""
+        return self._read(_SETTINGS_SEQ_OFFSET, _SETTINGS, _SETTINGS_OFFSET)
+
+    def write_stats(
+        self,
+        state: int,
+        stats: SchedulerStats,
+        telemetry: TelemetrySnapshot,
+        dispatch: tuple[int, int, int],
+    ):
+        """Publish the engine state and statistics."""
+        values = (
+            state,
+            stats.clicks,
+            stats.skipped,
+            stats.elapsed_s,
+            stats.target_cps,
+            stats.achieved_cps,
+            stats.mean_lateness_us,
+            stats.max_lateness_us,
+            stats.jitter_us,
+            telemetry.clicks,
+            telemetry.target_cps,
+            telemetry.achieved_cps,
+            telemetry.dispatch_mean_us,
+            telemetry.dispatch_p50_us,
+            telemetry.dispatch_p99_us,
+            telemetry.dispatch_max_us,
+            telemetry.jitter_p50_us,
+            telemetry.jitter_p99_us,
+            *dispatch,
+        )
+        self._write(_STATS_SEQ_OFFSET, _STATS, _STATS_OFFSET, values)
+
+    def read_stats(
+        self,
+    ) -> tuple[int, SchedulerStats, TelemetrySnapshot, tuple[int, int, int]]:
+        """Get (state, scheduler stats, telemetry, (hung, hangs, recoveries))."""
+        values = self._read(_STATS_SEQ_OFFSET, _STATS, _STATS_OFFSET)[1]
+        return (
+            values[0],
+            SchedulerStats(*values[1:9]),
+            TelemetrySnapshot(*values[9:18]),
+            values[18:21],
+        )
+
+    def close(self):
+        """Detach from the block, and free it if this side created it."""
+        self._buf = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+class ProcessTelemetry:
+    """Telemetry of a ProcessClicker, read from its control block."""
+
+    def __init__(self, block: ControlBlock):
+        self.block = block
+        self._last: TelemetrySnapshot | None = None
+        self.started_ns = time.perf_counter_ns()
+
+    def snapshot(self) -> TelemetrySnapshot:
+        """Get the engine's latest telemetry."""
+        if self.block is not None:
+            self._last = self.block.read_stats()[2]
+        return self._last
+
+    @property
+    def clicks(self) -> int:
+        """Clicks the engine has delivered so far."""
+        return self.snapshot().clicks
+
+    def detach(self):
+        """Keep the final snapshot once the block is released."""
+        self.snapshot()
+        self.block = None
+
+    def summary(self) -> dict:
+        """Build a JSON-serializable session summary."""
+        elapsed_s = (time.perf_counter_ns() - self.started_ns) / 1_000_000_000
+        snapshot = self.snapshot()
+        return {
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_s": elapsed_s,
+            "session_cps": snapshot.clicks / elapsed_s if elapsed_s > 0 else 0.0,
+            "process_isolated": True,
+            **dataclasses.asdict(snapshot),
+        }
+
+    def write_summary(self, directory: Path = SESSIONS_DIR) -> Path:
+        """Write the session summary as JSON and return its path."""
+        return write_summary(self.summary(), directory)
+
+
+def _raise_priority():
+    """Give the engine process a head start over ordinary desktop work (Windows only)."""
+    if sys.platform == "win32":
+        kernel32 = ctypes.WinDLL("kernel32")
+        kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), ABOVE_NORMAL_PRIORITY_CLASS)
+
+
+def _publish(block: ControlBlock, clicker: AutoClicker, state: int):
+    """Write the clicker's statistics to the control block."""
+    dispatcher = clicker.dispatcher
+    block.write_stats(
+        state,
+        clicker.get_stats(),
+        clicker.telemetry.snapshot(),
+        (int(dispatcher.hung), dispatcher.hangs, dispatcher.recoveries),
+    )
+
+
+def _follow_control_block(block: ControlBlock, clicker: AutoClicker, stop_event: threading.Event):
+    """Apply settings and stop requests from the GUI and report statistics back."""
+    version = block.read_settings()[0]
+    while not stop_event.wait(POLL_INTERVAL_S):
+        if block.stop_requested:
+            stop_event.set()
+            break
+
+        new_version, (cps, relative_x, relative_y) = block.read_settings()
+        if new_version != version:
+            version = new_version
+            previous = config.current()
+            config.update(cps=int(cps), relative_x=relative_x, relative_y=relative_y)
+            if int(cps) != previous.cps:
+                clicker.update_cps()
+            if (relative_x, relative_y) != (previous.relative_x, previous.relative_y):
+                clicker.update_position()
+
+        _publish(block, clicker, RUNNING)
+
+
+def run_engine(
+    block_name: str,
+    hwnd: int,
+    settings: config.Settings,
+    backend_factory: Callable[[], WindowBackend] | None = None,
+):
+    """Child-process entry point: run an AutoClicker driven by the control block."""
+    _raise_priority()
+    config.set_current(settings)
+    block = ControlBlock.attach(block_name)
+    stop_event = threading.Event()
+    try:
+        backend = backend_factory() if backend_factory else None
+        clicker = AutoClicker(hwnd, stop_event, backend=backend)
+        _publish(block, clicker, RUNNING)
+        monitor = threading.Thread(
+            target=_follow_control_block, args=(block, clicker, stop_event), daemon=True
+        )
+        monitor.start()
+        clicker.run()
+        stop_event.set()
+        monitor.join()
+        _publish(block, clicker, FINISHED)
+    finally:
+        block.close()
+
+
+class ProcessClicker:
+    """Runs an AutoClicker in a child process behind the same interface.
+
+    The GUI thread that calls ``run()`` only polls the control block, so the
+    click loop keeps its timing however busy the interface gets. The child builds
+    its own window backend, with ``backend_factory`` (a picklable callable) if given.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        stop_event: threading.Event,
+        geometry_tracker: GeometryTracker | None = None,
+        on_dispatch_event: Callable[[HangEvent], None] | None = None,
+        backend_factory: Callable[[], WindowBackend] | None = None,
+    ):
+        self.hwnd = hwnd
+        self.stop_event = stop_event
+        self.geometry_tracker = geometry_tracker or GeometryTracker()
+        self._geometry = self.geometry_tracker.track(hwnd)
+        self.on_dispatch_event = on_dispatch_event
+        self.backend_factory = backend_factory
+        self.block = ControlBlock.create()
+        self.block.write_settings(config.current())
+        self.telemetry = ProcessTelemetry(self.block)
+        self.process: multiprocessing.Process | None = None
+        self._final_stats: SchedulerStats | None = None
+        self._final_dispatch: tuple[int, int, int] | None = None
+        metrics.REGISTRY.add_clicker(self)
+
+    @property
+    def geometry(self) -> WindowGeometry:
+        """Latest geometry of the game window."""
+        return self.geometry_tracker.get(self.hwnd) or self._geometry
+
+    def update_position(self):
+        """Send the current position to the engine."""
+        if self._final_stats is None:
+            self.block.write_settings(config.current())
+
+    def update_cps(self):
+        """Send the current CPS to the engine."""
+        if self._final_stats is None:
+            self.block.write_settings(config.current())
+
+    def get_screen_position(self) -> tuple[int, int]:
+        """Get the screen coordinates of the click point."""
+        settings = config.current()
+        point = self.geometry.client_point(settings.relative_x, settings.relative_y)
+        return self.geometry.to_screen(*point)
+
+    def get_stats(self) -> SchedulerStats:
+        """Get the achieved click rate and timing jitter reported by the engine."""
+        if self._final_stats is not None:
+            return self._final_stats
+        return self.block.read_stats()[1]
+
+    def dispatch_counts(self) -> tuple[int, int, int]:
+        """Get the engine's (hung, hangs, recoveries), kept once the engine has stopped."""
+        if self._final_dispatch is not None:
+            return self._final_dispatch
+        return self.block.read_stats()[3]
+
+    def _check_dispatch(self, hung: int, hangs: int, recoveries: int, seen: list[int]):
+        """Turn changes in the engine's hang counters into dispatch events."""
+        if not self.on_dispatch_event or [hangs, recoveries] == seen:
+            return
+        now = time.perf_counter_ns()
+        if hangs != seen[0]:
+            self.on_dispatch_event(HangEvent("hang", self.hwnd, now))
+        if recoveries != seen[1] and not hung:
+            self.on_dispatch_event(HangEvent("recover", self.hwnd, now))
+        seen[:] = [hangs, recoveries]
+
+    def run(self) -> SchedulerStats:
+        """Start the engine process and supervise it until it stops."""
+        context = multiprocessing.get_context("spawn")
+        self.process = process = context.Process(
+            target=run_engine,
+            args=(self.block.name, self.hwnd, config.current(), self.backend_factory),
+            name="click-engine",
+            daemon=True,
+        )
+        process.start()
+        seen = [0, 0]
+        try:
+            while process.is_alive():
+                if self.stop_event.wait(POLL_INTERVAL_S):
+                    self.block.request_stop()
+                    process.join(STOP_TIMEOUT_S)
+                    break
+                state, _, _, dispatch = self.block.read_stats()
+                if state != STARTING:
+                    self._check_dispatch(*dispatch, seen)
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            _, self._final_stats, _, self._final_dispatch = self.block.read_stats()
+            self.telemetry.detach()
+            self.block.close()
+        return self._final_stats
@@ -0,0 +1,113 @@
+"""Module for named settings profiles persisted to disk."""
+
+import dataclasses
+import json
+import logging
+from pathlib import Path
+
+from . import config
+from .config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileStore:
+    """Named settings profiles stored in a JSON file.
+
+    A profile can be bound to a window client size, so the matching setup is
+    picked automatically when a game window of that size is found.
+    """
+
+    def __init__(self, path: Path = config.PROFILES_FILE):
+        self.path = path
+        self._profiles: dict[str, Settings] = {}
+        self._client_sizes: dict[str, tuple[int, int]] = {}
+        self._by_size: dict[tuple[int, int], str] = {}
+        # Entries skipped as invalid, written back unchanged so saving does not lose them
+        self._invalid: dict[str, dict] = {}
+
+    def load(self) -> "ProfileStore":
+        """Load the profiles from disk; a missing file means no profiles.
+
+        A profile with an invalid value (edited by hand, or saved by an older
+        version) is skipped with a warning, so it never reaches a clicker, and is
+        kept in the file as it was.
+        """
+        self._profiles.clear()
+        self._client_sizes.clear()
+        self._by_size.clear()
+        self._invalid.clear()
+        if not self.path.exists():
+            return self
+
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        fields = {field.name for field in dataclasses.fields(Settings)}
+        for name, entry in data.get("profiles", {}).items():
+            size = entry.get("client_size")
+            settings = Settings(**{key: value for key, value in entry.items() if key in fields})
+            try:
+                settings.validate()
+            except ValueError as e:
+                logger.warning("⚠️ Profile '%s' skipped: %s", name, e)
+                self._invalid[name] = entry
+                continue
+            self._store(name, settings, tuple(size) if size else None)
+        return self
+
+    def save(self):
+        """Write all profiles to disk atomically."""
+        profiles = dict(self._invalid)
+        for name, settings in self._profiles.items():
+            entry = dataclasses.asdict(settings)
+            if name in self._client_sizes:
+                entry["client_size"] = list(self._client_sizes[name])
+            profiles[name] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"profiles": profiles}, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def _unbind(self, name: str):
+        """Remove a profile's client-size binding from the indexes."""
+        old_size = self._client_sizes.pop(name, None)
+        if old_size and self._by_size.get(old_size) == name:
+            del self._by_size[old_size]
+
+    def _store(self, name: str, settings: Settings, client_size: tuple[int, int] | None):
+        """Insert or replace a profile in the in-memory indexes."""
+        self._unbind(name)
+        self._invalid.pop(name, None)
+        self._profiles[name] = settings
+        if client_size:
+            self._client_sizes[name] = client_size
+            self._by_size[client_size] = name
+
+    def put(self, name: str, settings: Settings, client_size: tuple[int, int] | None = None):
+        """Create or overwrite a profile and persist it."""
+        self._store(name, settings, client_size)
+        self.save()
+
+    def delete(self, name: str):
+        """Remove a profile and persist the change."""
+        self._unbind(name)
+        del self._profiles[name]
+        self.save()
+
+    def names(self) -> list[str]:
+        """Get the profile names in insertion order."""
+        return list(self._profiles)
+
+    def get(self, name: str) -> Settings | None:
+        """Get a profile by name."""
+        return self._profiles.get(name)
+
+    def for_client_size(self, width: int, height: int) -> tuple[str, Settings] | None:
+        """Get the profile bound to a window client size, if any."""
+        name = self._by_size.get((width, height))
+        return (name, self._profiles[name]) if name else None
+
+    def activate(self, name: str) -> Settings:
+        """Publish a profile as the current settings snapshot."""
+        return config.set_current(self._profiles[name])
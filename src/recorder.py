@@ -0,0 +1,127 @@
+"""Module for recording every click of a session to an append-only binary file.
+
+Each click is one fixed-size record (time, target window and point, dispatch
+latency, result) written with ``struct.pack_into`` straight into a
+memory-mapped file, so recording allocates no buffers and makes no system call
+per click. The file grows in doubling steps and is trimmed to its records when
+the session ends, which is also when the record count is written to the header.
+A file left by a crash keeps its zero-filled tail, which the analyzer skips.
+``analyzer.py`` loads a recording as a NumPy array.
+"""
+
+import mmap
+import struct
+import time
+from pathlib import Path
+
+from .telemetry import SESSIONS_DIR, create_timestamped
+
+
+MAGIC = b"CCBREC01"
+VERSION = 1
+SUFFIX = ".ccrec"
+
+# Header: magic, version, record size, wall-clock start (ns since the epoch),
+# perf_counter_ns at the start, record count (0 until closed); padded to HEADER_SIZE bytes
+HEADER = struct.Struct("<8sIIqqQ")
+HEADER_SIZE = 64
+COUNT = struct.Struct("<Q")
+COUNT_OFFSET = HEADER.size - COUNT.size
+
+# Record: perf_counter_ns at dispatch, window handle, packed client point (lParam),
+# dispatch latency in ns (saturated at 2^32 - 1), result, kind; padded to 24 bytes
+RECORD = struct.Struct("<qIIIBB2x")
+RECORD_SIZE = RECORD.size
+
+# Record kinds
+KIND_CLICK = 0
+KIND_INJECTED = 1  # One-off click, such as a golden cookie
+
+# Records the file has room for at first; it doubles whenever it is full
+INITIAL_CAPACITY = 65_536
+
+MAX_LATENCY_NS = 0xFFFFFFFF
+
+
+class SessionRecorder:
+    """Appends click records to a memory-mapped session file.
+
+    Not thread-safe: records are written from the click thread only.
+    """
+
+    def __init__(self, path: Path, capacity: int = INITIAL_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.started_ns = time.perf_counter_ns()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("w+b")
+        self._file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        HEADER.pack_into(
+            self._map, 0, MAGIC, VERSION, RECORD_SIZE, time.time_ns(), self.started_ns, 0
+        )
+        self._offset = HEADER_SIZE
+        self._end = HEADER_SIZE + capacity * RECORD_SIZE
+        self._pack = RECORD.pack_into
+
+    @classmethod
+    def create(cls, directory: Path = SESSIONS_DIR, prefix: str = "session") -> "SessionRecorder":
+        """Start a recording in a new timestamped file."""
+        return cls(create_timestamped(directory, prefix, SUFFIX))
+
+    @property
+    def count(self) -> int:
+        """Number of clicks recorded."""
+        return (self._offset - HEADER_SIZE) // RECORD_SIZE
+
+    @property
+    def closed(self) -> bool:
+        """Whether the recording has been finished."""
+        return self._map is None
+
+    def record(
+        self,
+        at_ns: int,
+        hwnd: int,
+        l_param: int,
+        latency_ns: int,
+        delivered: bool,
+        kind: int = KIND_CLICK,
+    ):
+        """Append one click."""
+        offset = self._offset
+        if offset == self._end:
+            self._grow()
+        self._pack(
+            self._map,
+            offset,
+            at_ns,
+            hwnd & 0xFFFFFFFF,
+            l_param,
+            latency_ns if latency_ns < MAX_LATENCY_NS else MAX_LATENCY_NS,
+            delivered,
+            kind,
+        )
+        self._offset = offset + RECORD_SIZE
+
+    def _grow(self):
+        """Double the room for records."""
+        self.capacity *= 2
+        self._end = HEADER_SIZE + self.capacity * RECORD_SIZE
+        self._map.resize(self._end)
+
+    def flush(self):
+        """Write the records so far to disk."""
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        """Finish the recording: flush it and trim the file to its records."""
+        if self._map is None:
+            return
+        COUNT.pack_into(self._map, COUNT_OFFSET, self.count)
+        self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.truncate(HEADER_SIZE + self.count * RECORD_SIZE)
+        self._file.close()
@@ -0,0 +1,406 @@
+"""Module for driving many headless bot instances from one controller.
+
+An agent is a headless runner that also listens on a local TCP port
+(``python main.py --headless --listen PORT``). A controller connects to every
+agent and sends all of them the same batch of commands at once: the batch is
+encoded once and written to every connection before any reply is awaited, so
+updating a fleet takes about one round trip instead of one per agent.
+
+Messages are JSON objects, one per line. A batch is
+``{"id": 1, "commands": [{"op": "configure", "changes": {"cps": 30}}, {"op": "start"}]}``
+and the reply ``{"id": 1, "results": [{"ok": true}, {"ok": true}]}``; a failed
+command gets ``{"ok": false, "error": "..."}`` and does not stop the rest.
+Commands run on the runner's main thread, one batch at a time.
+
+Usage:
+    python -m src.remote --agents 127.0.0.1:9470 127.0.0.1:9471 --set cps=30 --start
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING
+
+from . import config, logs
+
+
+if TYPE_CHECKING:
+    from .cli import HeadlessRunner
+
+
+# Longest a batch may wait for the runner's main thread
+COMMAND_TIMEOUT_S = 10.0
+
+# Longest a controller waits for an agent's reply
+REPLY_TIMEOUT_S = 15.0
+
+# Named, not __name__: run with ``python -m src.remote`` this module is __main__,
+# outside the package logger that logs.setup() routes
+logger = logging.getLogger(f"{logs.LOGGER_NAME}.remote")
+
+
+def parse_address(text: str) -> tuple[str, int]:
+    """Parse "host:port" or a bare port (on localhost)."""
+    host, _, port = text.rpartition(":")
+    try:
+        return host or config.AGENT_HOST, int(port)
+    except ValueError as e:
+        raise ValueError(f"'{text}' is not host:port") from e
+
+
+class Agent:
+    """Serves remote commands for a headless runner on a local TCP port."""
+
+    class _Server(socketserver.ThreadingTCPServer):
+        """TCP server that knows its agent."""
+
+        allow_reuse_address = True
+        agent: "Agent"
+
+    class _Handler(socketserver.StreamRequestHandler):
+        """Answers the batches of one controller connection."""
+
+        server: "Agent._Server"
+        disable_nagle_algorithm = True  # Replies are single small writes
+
+        def handle(self):
+            """Execute each batch received and write its reply."""
+            agent = self.server.agent
+            agent._connections.add(self.connection)
+            try:
+                for line in self.rfile:
+                    reply, shutdown = agent.handle_batch(line)
+                    self.wfile.write(reply)
+                    if shutdown:
+                        # Only now that the reply is out may the runner exit
+                        agent.runner.stop()
+            except OSError:
+                pass  # The controller went away, or the agent is stopping
+            finally:
+                agent._connections.discard(self.connection)
+
+    def __init__(
+        self,
+        runner: "HeadlessRunner",
+        port: int = config.AGENT_PORT,
+        host: str = config.AGENT_HOST,
+    ):
+        self.runner = runner
+        self.host = host
+        self.requested_port = port
+        self._server: Agent._Server | None = None
+        self._thread: threading.Thread | None = None
+        self._connections: set[socket.socket] = set()
+        self.operations: dict[str, Callable[..., dict]] = {
+            "configure": self._configure,
+            "profile": self._profile,
+            "start": self._start,
+            "stop": self._stop,
+            "status": self._status,
+            "sampling": self._sampling,
+            "shutdown": self._shutdown,
+        }
+
+    @property
+    def port(self) -> int:
+        """Port the agent listens on (the one picked by the system if 0 was requested)."""
+        return self._server.server_address[1] if self._server else self.requested_port
+
+    def start(self):
+        """Bind the port and start serving; raises OSError if the port is taken."""
+        if self._server is not None:
+            return
+        server = self._Server((self.host, self.requested_port), self._Handler)
+        server.agent = self
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="agent", daemon=True)
+        self._thread.start()
+        logger.info("📡 Agent listening on %s:%d", self.host, self.port)
+
+    def stop(self):
+        """Stop serving and drop the controllers' connections."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        for connection in list(self._connections):
+            with contextlib.suppress(OSError):  # Already closed by the controller
+                connection.shutdown(socket.SHUT_RDWR)
+        server.server_close()
+        self._thread.join()
+        self._thread = None
+
+    def handle_batch(self, line: bytes) -> tuple[bytes, bool]:
+        """Run one batch on the runner's thread; returns the encoded reply and whether to exit."""
+        try:
+            batch = json.loads(line)
+            commands = batch["commands"]
+            if not isinstance(commands, list):
+                raise TypeError("'commands' must be a list")
+        except (ValueError, KeyError, TypeError) as e:
+            return self._encode({"id": None, "error": f"Malformed batch: {e}"}), False
+
+        try:
+            results = self.runner.submit(lambda: self.execute(commands)).result(COMMAND_TIMEOUT_S)
+        except FutureTimeoutError:
+            results = [{"ok": False, "error": "Runner busy"} for _ in commands]
+        shutdown = any(
+            command.get("op") == "shutdown" and result["ok"]
+            for command, result in zip(commands, results, strict=True)
+            if isinstance(command, dict)
+        )
+        return self._encode({"id": batch.get("id"), "results": results}), shutdown
+
+    @staticmethod
+    def _encode(message: dict) -> bytes:
+        """Encode one message as a JSON line."""
+        return (json.dumps(message) + "\n").encode("utf-8")
+
+    def execute(self, commands: list) -> list[dict]:
+        """Run a batch of commands in order (runner thread only)."""
+        results = []
+        for command in commands:
+            try:
+                if not isinstance(command, dict):
+                    raise TypeError("A command must be an object")
+                arguments = dict(command)
+                operation = self.operations.get(arguments.pop("op", None))
+                if operation is None:
+                    raise ValueError(f"Unknown command {command.get('op')!r}")
+                results.append({"ok": True, **operation(**arguments)})
+            except (OSError, ValueError, TypeError) as e:
+                results.append({"ok": False, "error": str(e)})
+        return results
+
+    def _configure(self, changes: dict) -> dict:
+        """Change settings; the position and CPS are applied without restarting."""
+        settings = config.current().replace(**changes)
+        # Settings pushed by the controller win over a profile bound to the window size
+        self.runner.use_profiles = False
+        self.runner.apply_settings(settings)
+        logger.info("📡 Settings changed: %s", ", ".join(f"{k}={v}" for k, v in changes.items()))
+        return {}
+
+    def _profile(self, name: str) -> dict:
+        """Switch to a saved profile."""
+        settings = self.runner.profiles.load().get(name)
+        if settings is None:
+            raise ValueError(f"Profile '{name}' not found")
+        self.runner.use_profiles = False
+        self.runner.apply_settings(settings.replace(show_overlay=False))
+        logger.info("📡 Profile '%s' loaded", name)
+        return {}
+
+    def _start(self) -> dict:
+        """Start clicking."""
+        if not self.runner.start():
+            raise ValueError("Game window not found")
+        return {}
+
+    def _stop(self) -> dict:
+        """Stop clicking; the agent keeps listening."""
+        if self.runner.running:
+            self.runner.pause()
+            logger.info("⏸️ Autoclicker paused")
+        return {}
+
+    def _status(self) -> dict:
+        """Report the runner's state and telemetry."""
+        return self.runner.status()
+
+    def _sampling(self, enabled: bool) -> dict:
+        """Switch the profiler on or off; switching it off reports and writes the samples."""
+        self.runner.set_sampling(bool(enabled))
+        return {}
+
+    def _shutdown(self) -> dict:
+        """Let the agent exit once the reply is sent."""
+        return {}
+
+
+class Controller:
+    """Sends batches of commands to many agents at once and collects their replies."""
+
+    def __init__(self, addresses: list[tuple[str, int]], timeout: float = REPLY_TIMEOUT_S):
+        self.addresses = [(host, port) for host, port in addresses]
+        self.timeout = timeout
+        self._connections: dict[str, tuple[socket.socket, object]] = {}
+        self._next_id = 1
+
+    @staticmethod
+    def name(address: tuple[str, int]) -> str:
+        """Key of an agent in results."""
+        return f"{address[0]}:{address[1]}"
+
+    def connect(self, wait_s: float = 0.0) -> list[str]:
+        """Connect to the agents, retrying for up to ``wait_s``; returns those unreachable."""
+        deadline = time.monotonic() + wait_s
+        missing = [
+            address for address in self.addresses if self.name(address) not in self._connections
+        ]
+        while True:
+            for address in list(missing):
+                try:
+                    connection = socket.create_connection(address, timeout=self.timeout)
+                except OSError:
+                    continue
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._connections[self.name(address)] = (connection, connection.makefile("rb"))
+                missing.remove(address)
+            if not missing or time.monotonic() >= deadline:
+                return [self.name(address) for address in missing]
+            time.sleep(0.05)
+
+    def broadcast(self, commands: list[dict]) -> dict[str, dict]:
+        """Send one batch to every connected agent; returns each agent's reply.
+
+        A reply is ``{"results": [...]}``, or ``{"error": "..."}`` when the agent
+        could not be reached, in which case its connection is dropped.
+        """
+        batch_id, self._next_id = self._next_id, self._next_id + 1
+        payload = (json.dumps({"id": batch_id, "commands": commands}) + "\n").encode("utf-8")
+        replies: dict[str, dict] = {}
+        sent = []
+        for name, (connection, _) in list(self._connections.items()):
+            try:
+                connection.sendall(payload)
+                sent.append(name)
+            except OSError as e:
+                replies[name] = {"error": str(e)}
+                self._drop(name)
+        for name in sent:
+            try:
+                line = self._connections[name][1].readline()
+                if not line:
+                    raise ConnectionError("Agent closed the connection")
+                reply = json.loads(line)
+                if reply.get("id") != batch_id:
+                    raise ValueError(reply.get("error") or "Reply to another batch")
+                replies[name] = {"results": reply["results"]}
+            except (OSError, ValueError, KeyError) as e:
+                replies[name] = {"error": str(e)}
+                self._drop(name)
+        return replies
+
+    def _drop(self, name: str):
+        """Close the connection to one agent."""
+        connection, reader = self._connections.pop(name)
+        reader.close()
+        connection.close()
+
+    def configure(self, **changes) -> dict[str, dict]:
+        """Change settings on every agent."""
+        return self.broadcast([{"op": "configure", "changes": changes}])
+
+    def start(self) -> dict[str, dict]:
+        """Start clicking on every agent."""
+        return self.broadcast([{"op": "start"}])
+
+    def stop(self) -> dict[str, dict]:
+        """Stop clicking on every agent."""
+        return self.broadcast([{"op": "stop"}])
+
+    def status(self) -> dict[str, dict]:
+        """Collect every agent's state and telemetry."""
+        return {
+            name: reply["results"][0] if "results" in reply else reply
+            for name, reply in self.broadcast([{"op": "status"}]).items()
+        }
+
+    def close(self):
+        """Disconnect from every agent."""
+        for name in list(self._connections):
+            self._drop(name)
+
+
+def _parse_value(text: str):
+    """Read a setting value as JSON (numbers, true/false), or else as a string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def build_batch(args: argparse.Namespace) -> list[dict]:
+    """Turn the command-line options into one batch: profile, changes, start/stop, sampling, status."""
+    commands = []
+    if args.profile:
+        commands.append({"op": "profile", "name": args.profile})
+    if args.set:
+        changes = {}
+        for assignment in args.set:
+            key, separator, value = assignment.partition("=")
+            if not separator:
+                raise ValueError(f"'{assignment}' is not KEY=VALUE")
+            changes[key] = _parse_value(value)
+        commands.append({"op": "configure", "changes": changes})
+    if args.start:
+        commands.append({"op": "start"})
+    if args.stop:
+        commands.append({"op": "stop"})
+    if args.sampling is not None:
+        commands.append({"op": "sampling", "enabled": args.sampling})
+    commands.append({"op": "status"})
+    if args.shutdown:
+        commands.append({"op": "shutdown"})
+    return commands
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Send one batch to every agent and print what each reports."""
+    parser = argparse.ArgumentParser(description="Control headless bot agents.")
+    parser.add_argument("--agents", nargs="+", required=True, help="host:port of each agent")
+    parser.add_argument("--profile", help="switch every agent to a saved profile")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="change a setting")
+    parser.add_argument("--start", action="store_true", help="start clicking")
+    parser.add_argument("--stop", action="store_true", help="stop clicking")
+    parser.add_argument(
+        "--sampling",
+        action=argparse.BooleanOptionalAction,
+        help="switch the agents' profiler on or off",
+    )
+    parser.add_argument("--shutdown", action="store_true", help="make the agents exit")
+    parser.add_argument("--wait", type=float, default=0.0, help="seconds to wait for agents")
+    args = parser.parse_args(argv)
+
+    try:
+        addresses = [parse_address(agent) for agent in args.agents]
+        commands = build_batch(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    controller = Controller(addresses)
+    unreachable = controller.connect(args.wait)
+    for name in unreachable:
+        print(f"❌ {name}: not reachable", file=sys.stderr)
+    failed = bool(unreachable)
+    for name, reply in sorted(controller.broadcast(commands).items()):
+        if "error" in reply:
+            print(f"❌ {name}: {reply['error']}", file=sys.stderr)
+            failed = True
+            continue
+        for command, result in zip(commands, reply["results"], strict=True):
+            if not result["ok"]:
+                print(f"❌ {name}: {command['op']}: {result['error']}", file=sys.stderr)
+                failed = True
+            elif command["op"] == "status":
+                telemetry = result["telemetry"] or {}
+                print(
+                    f"{'✅' if result['running'] else '⏸️'} {name}: "
+                    f"{telemetry.get('achieved_cps', 0.0):.1f}/{result['settings']['cps']} CPS, "
+                    f"{telemetry.get('clicks', 0)} clicks"
+                )
+    controller.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
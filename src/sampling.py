@@ -0,0 +1,196 @@
+"""Module for sampling where chosen threads spend their time, while they run.
+
+A background thread wakes at a fixed interval, takes the current frame of each
+watched thread (the click loop, the Tk mainloop) from ``sys._current_frames``
+and counts the stack as a tuple of code objects; names are only formatted when
+the results are read. Nothing is installed in the watched threads, so the
+sampler can be switched on and off during a live session; the cost is a few
+microseconds of the sampler holding the GIL per sample.
+
+Results are a hot-spot table per thread and collapsed stacks (one
+``thread;outer;...;inner count`` line per distinct stack), which flamegraph.pl,
+speedscope and similar tools read directly. The samples are wall-clock:
+a thread waiting for its next click is counted in the wait.
+
+A thread running Python code holds the GIL, and the sampler only gets to look
+once it lets go: at a blocking call, or when the interpreter forces a switch.
+At the default switch interval (5 ms) a short burst of work would always end
+before the sampler runs and the thread would look idle, so the interval is
+lowered while sampling and restored afterwards. The interval between samples
+is randomized around its mean, so a sampler that happens to run at the click
+loop's period does not see the same phase of it every time.
+"""
+
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+
+from . import config
+from .telemetry import SESSIONS_DIR, create_timestamped
+
+
+SUFFIX = ".folded"
+
+# Frames kept per sample, innermost first; deeper stacks are cut at the outer end
+MAX_DEPTH = 64
+
+# Interpreter switch interval while sampling, so busy threads are caught mid-work
+SWITCH_INTERVAL_S = 0.0005
+
+# Rows of the hot-spot table reported per thread
+HOT_SPOTS = 10
+
+
+@dataclass(frozen=True, slots=True)
+class HotSpot:
+    """Where one thread was seen, for one function."""
+
+    thread: str
+    function: str
+    self_samples: int  # Samples with the function innermost
+    total_samples: int  # Samples with the function anywhere on the stack
+    self_pct: float
+    total_pct: float
+
+
+def frame_name(code: CodeType) -> str:
+    """Name a function as module:qualified name."""
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}".replace(" ", "_")
+
+
+class SamplingProfiler:
+    """Samples the stacks of registered threads at a fixed interval."""
+
+    def __init__(
+        self, interval_ms: float = config.SAMPLING_INTERVAL_MS, max_depth: int = MAX_DEPTH
+    ):
+        self.interval_s = interval_ms / 1000
+        self.max_depth = max_depth
+        self.threads: dict[int, str] = {}  # Thread ident -> name in the results
+        # Per thread name: stack (code objects, innermost first) -> samples
+        self.stacks: dict[str, dict[tuple[CodeType, ...], int]] = {}
+        self.samples = 0  # Sampling rounds taken
+        self.sampling_ns = 0  # Time spent taking them
+        self.started_ns = 0
+        self.stopped_ns = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._switch_interval = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether samples are being taken."""
+        return self._thread is not None
+
+    def add_thread(self, name: str, thread: threading.Thread | None = None):
+        """Watch a thread (by default the calling one), naming it in the results."""
+        ident = (thread or threading.current_thread()).ident
+        if ident is not None:
+            self.stacks.setdefault(name, {})
+            self.threads[ident] = name
+
+    def start(self):
+        """Start sampling the registered threads."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, SWITCH_INTERVAL_S))
+        self.started_ns = time.perf_counter_ns()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling; the results stay available."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+        self.stopped_ns = time.perf_counter_ns()
+
+    def _run(self):
+        """Take a sample every interval until stopped."""
+        current_frames = sys._current_frames
+        perf_counter_ns = time.perf_counter_ns
+        max_depth = self.max_depth
+        threads, stacks = self.threads, self.stacks
+        interval_s = self.interval_s
+        uniform = random.uniform
+        while not self._stop.wait(uniform(0.5, 1.5) * interval_s):
+            start = perf_counter_ns()
+            frames = current_frames()
+            # Threads may be added while sampling runs
+            for ident, name in list(threads.items()):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue  # The thread has ended
+                counts = stacks[name]
+                stack = []
+                while frame is not None and len(stack) < max_depth:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                key = tuple(stack)
+                counts[key] = counts.get(key, 0) + 1
+            del frames  # Do not keep other threads' frames alive until the next round
+            self.samples += 1
+            self.sampling_ns += perf_counter_ns() - start
+
+    @property
+    def sample_cost_us(self) -> float:
+        """Mean time one sampling round takes."""
+        return self.sampling_ns / self.samples / 1000 if self.samples else 0.0
+
+    def hot_spots(self, thread: str, limit: int = HOT_SPOTS) -> list[HotSpot]:
+        """The functions a thread was most often seen running (innermost), by self samples."""
+        counts = dict(self.stacks.get(thread, {}))  # Copy: the sampler may be adding stacks
+        total = sum(counts.values())
+        self_samples: dict[CodeType, int] = {}
+        total_samples: dict[CodeType, int] = {}
+        for stack, samples in counts.items():
+            self_samples[stack[0]] = self_samples.get(stack[0], 0) + samples
+            for code in set(stack):  # Recursion counts once per sample
+                total_samples[code] = total_samples.get(code, 0) + samples
+        ranked = sorted(self_samples, key=self_samples.__getitem__, reverse=True)
+        return [
+            HotSpot(
+                thread,
+                frame_name(code),
+                self_samples[code],
+                total_samples[code],
+                self_samples[code] / total * 100,
+                total_samples[code] / total * 100,
+            )
+            for code in ranked[:limit]
+        ]
+
+    def collapsed(self) -> list[str]:
+        """The samples as collapsed stacks, outermost frame first, one line per stack."""
+        lines = []
+        for thread, counts in self.stacks.items():
+            for stack, samples in dict(counts).items():
+                frames = ";".join(frame_name(code) for code in reversed(stack))
+                lines.append(f"{thread};{frames} {samples}")
+        return sorted(lines)
+
+    def write_collapsed(self, directory: Path = SESSIONS_DIR, prefix: str = "profile") -> Path:
+        """Write the collapsed stacks for a flame graph and return the file's path."""
+        path = create_timestamped(directory, prefix, SUFFIX)
+        path.write_text("\n".join(self.collapsed()) + "\n", encoding="utf-8")
+        return path
+
+    def report(self, limit: int = HOT_SPOTS) -> list[str]:
+        """Format the hot-spot tables of every thread as log lines."""
+        lines = []
+        for thread in self.stacks:
+            for spot in self.hot_spots(thread, limit):
+                lines.append(
+                    f"🔥 {thread}: {spot.self_pct:5.1f}% self {spot.total_pct:5.1f}% total  "
+                    f"{spot.function}"
+                )
+        return lines
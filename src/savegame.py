@@ -0,0 +1,199 @@
+"""Module for reading exported Cookie Clicker saves into a typed game state.
+
+An exported save is base64 of UTF-8 text, optionally URL-escaped, followed by
+"!END!". The text is a "|"-separated list of sections: version, (empty), run
+details, preferences, game counters, buildings, upgrades, achievements, ...;
+fields inside a section are ";"-separated, and a building's fields
+","-separated. Upgrades and achievements are strings of "0"/"1" flags indexed
+by the game's IDs (two flags per upgrade: unlocked, bought).
+
+Fields this module does not model are ignored, and fields missing from older
+saves take their default, so every save since version 2.0 can be read.
+"""
+
+import base64
+import binascii
+import urllib.parse
+from dataclasses import dataclass
+from datetime import datetime
+
+
+END_MARKER = "!END!"
+
+# Every building in the game's order: name, base price, base CpS of one building
+BUILDINGS = (
+    ("Cursor", 15, 0.1),
+    ("Grandma", 100, 1),
+    ("Farm", 1_100, 8),
+    ("Mine", 12_000, 47),
+    ("Factory", 130_000, 260),
+    ("Bank", 1.4e6, 1_400),
+    ("Temple", 2e7, 7_800),
+    ("Wizard tower", 3.3e8, 44_000),
+    ("Shipment", 5.1e9, 260_000),
+    ("Alchemy lab", 7.5e10, 1.6e6),
+    ("Portal", 1e12, 1e7),
+    ("Time machine", 1.4e13, 6.5e7),
+    ("Antimatter condenser", 1.7e14, 4.3e8),
+    ("Prism", 2.1e15, 2.9e9),
+    ("Chancemaker", 2.6e16, 2.1e10),
+    ("Fractal engine", 3.1e17, 1.5e11),
+    ("Javascript console", 7.1e19, 1.1e12),
+    ("Idleverse", 1.2e22, 8.3e12),
+    ("Cortex baker", 1.9e24, 6.4e13),
+    ("You", 5.4e26, 5.1e14),
+)  # fmt: skip
+
+# Section indices in the decoded text
+_VERSION, _RUN, _GAME, _BUILDINGS, _UPGRADES, _ACHIEVEMENTS = 0, 2, 4, 5, 6, 7
+
+# Field indices in the game counters section
+_COOKIES, _EARNED, _CLICKS, _GOLDEN_CLICKS, _HANDMADE = 0, 1, 2, 3, 4
+_COOKIES_RESET, _RESETS, _SEASON, _PRESTIGE, _HEAVENLY_CHIPS, _LUMPS = 8, 14, 22, 25, 26, 42
+
+
+@dataclass(frozen=True, slots=True)
+class Building:
+    """One building type as saved."""
+
+    name: str
+    amount: int
+    bought: int  # Ever bought this ascension, including ones sold since
+    baked: float  # Cookies this building type produced
+    level: int  # Sugar lump level
+    highest: int  # Highest amount owned at once
+
+
+@dataclass(frozen=True, slots=True)
+class GameState:
+    """What an exported save says about a game."""
+
+    version: float
+    bakery_name: str
+    started: datetime | None  # Start of the current ascension
+    saved: datetime | None
+    cookies: float  # In the bank
+    cookies_earned: float  # This ascension
+    cookie_clicks: int
+    golden_clicks: int
+    handmade_cookies: float
+    cookies_reset: float  # Earned in previous ascensions
+    resets: int
+    prestige: float
+    heavenly_chips: float
+    lumps: float
+    season: str
+    buildings: tuple[Building, ...]
+    upgrades_unlocked: frozenset[int]
+    upgrades_bought: frozenset[int]
+    achievements: frozenset[int]
+
+    def building(self, name: str) -> Building | None:
+        """Get a building type by name."""
+        return next((building for building in self.buildings if building.name == name), None)
+
+    @property
+    def building_count(self) -> int:
+        """Buildings owned, of every type."""
+        return sum(building.amount for building in self.buildings)
+
+
+def decode_save(save: str) -> str:
+    """Get the text of an exported save; raises ValueError if it is not one."""
+    save = urllib.parse.unquote(save.strip())
+    if save.endswith(END_MARKER):
+        save = save[: -len(END_MARKER)]
+    try:
+        return base64.b64decode(save + "=" * (-len(save) % 4), validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Not a Cookie Clicker save: {e}") from e
+
+
+def encode_save(text: str) -> str:
+    """Encode save text the way the game exports it."""
+    encoded = base64.b64encode(text.encode("utf-8")).decode("ascii")
+    return urllib.parse.quote(encoded + END_MARKER, safe="")
+
+
+def _field(fields: list[str], index: int, kind: type, default=0):
+    """Convert one field, or get the default when the save has no (valid) value for it."""
+    try:
+        return kind(fields[index])
+    except (IndexError, ValueError):
+        return default
+
+
+def _int(text: str) -> int:
+    """Parse an integer the game may have written as a float ("12.0", "1e21")."""
+    return int(float(text))
+
+
+def _date(milliseconds: int) -> datetime | None:
+    """Convert a JavaScript timestamp, keeping None for an unset one."""
+    return datetime.fromtimestamp(milliseconds / 1000) if milliseconds > 0 else None
+
+
+def _flags(bits: str, stride: int = 1, offset: int = 0) -> frozenset[int]:
+    """IDs whose flag is set in a string of per-ID "0"/"1" groups."""
+    return frozenset(index for index, flag in enumerate(bits[offset::stride]) if flag == "1")
+
+
+def _building(name: str, text: str) -> Building:
+    """Parse one building's ","-separated fields."""
+    fields = text.split(",")
+    return Building(
+        name=name,
+        amount=_field(fields, 0, _int),
+        bought=_field(fields, 1, _int),
+        baked=_field(fields, 2, float, 0.0),
+        level=_field(fields, 3, _int),
+        highest=_field(fields, 6, _int),
+    )
+
+
+def parse_save_text(text: str) -> GameState:
+    """Build the game state from decoded save text; raises ValueError if it is malformed."""
+    sections = text.split("|")
+    if len(sections) <= _BUILDINGS:
+        raise ValueError(f"Save has {len(sections)} sections, expected at least {_BUILDINGS + 1}")
+    try:
+        version = float(sections[_VERSION])
+    except ValueError as e:
+        raise ValueError(f"Save version '{sections[_VERSION]}' is not a number") from e
+
+    run = sections[_RUN].split(";")
+    game = sections[_GAME].split(";")
+    saved_buildings = sections[_BUILDINGS].split(";")
+    buildings = tuple(
+        _building(name, saved_buildings[index] if index < len(saved_buildings) else "")
+        for index, (name, _, _) in enumerate(BUILDINGS)
+    )
+    upgrades = sections[_UPGRADES] if len(sections) > _UPGRADES else ""
+    achievements = sections[_ACHIEVEMENTS] if len(sections) > _ACHIEVEMENTS else ""
+
+    return GameState(
+        version=version,
+        bakery_name=run[3] if len(run) > 3 else "",
+        started=_date(_field(run, 0, _int)),
+        saved=_date(_field(run, 2, _int)),
+        cookies=_field(game, _COOKIES, float, 0.0),
+        cookies_earned=_field(game, _EARNED, float, 0.0),
+        cookie_clicks=_field(game, _CLICKS, _int),
+        golden_clicks=_field(game, _GOLDEN_CLICKS, _int),
+        handmade_cookies=_field(game, _HANDMADE, float, 0.0),
+        cookies_reset=_field(game, _COOKIES_RESET, float, 0.0),
+        resets=_field(game, _RESETS, _int),
+        prestige=_field(game, _PRESTIGE, float, 0.0),
+        heavenly_chips=_field(game, _HEAVENLY_CHIPS, float, 0.0),
+        lumps=_field(game, _LUMPS, float, 0.0),
+        season=_field(game, _SEASON, str, ""),
+        buildings=buildings,
+        upgrades_unlocked=_flags(upgrades, 2, 0),
+        upgrades_bought=_flags(upgrades, 2, 1),
+        achievements=_flags(achievements),
+    )
+
+
+def parse_save(save: str) -> GameState:
+    """Decode an exported save string into the game state."""
+    return parse_save_text(decode_save(save))
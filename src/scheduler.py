@@ -0,0 +1,231 @@
+"""Module for deadline-based click scheduling."""
+
+import contextlib
+import ctypes
+import math
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+# Below this much remaining time the scheduler stops sleeping and busy-waits,
+# because OS sleeps routinely overshoot by a millisecond or more.
+DEFAULT_SPIN_NS = 2_000_000
+
+# Maximum number of overdue clicks fired back-to-back under the BURST policy
+DEFAULT_MAX_BURST = 5
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class CatchUpPolicy(StrEnum):
+    """What the scheduler does when it falls behind its deadlines."""
+
+    BURST = "burst"  # Fire the missed clicks back-to-back (bounded by max_burst)
+    SKIP = "skip"  # Drop the missed clicks and realign to the next future slot
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerStats:
+    """Snapshot of the scheduler's achieved timing."""
+
+    clicks: int
+    skipped: int
+    elapsed_s: float
+    target_cps: float
+    achieved_cps: float
+    mean_lateness_us: float
+    max_lateness_us: float
+    jitter_us: float  # Standard deviation of the lateness
+
+
+@contextlib.contextmanager
+def high_resolution_timer(period_ms: int = 1) -> Iterator[None]:
+    """Raise the Windows timer resolution for the duration of the block.
+
+    The default 15.6 ms system tick makes every sleep overshoot badly; on other
+    platforms this is a no-op.
+    """
+    if sys.platform != "win32":
+        yield
+        return
+
+    winmm = ctypes.WinDLL("winmm")
+    winmm.timeBeginPeriod(period_ms)
+    try:
+        yield
+    finally:
+        winmm.timeEndPeriod(period_ms)
+
+
+def wait_until(
+    deadline_ns: int, stop_event: threading.Event, spin_ns: int = DEFAULT_SPIN_NS
+) -> bool:
+    """Block until the absolute perf_counter_ns deadline, sleeping then spinning.
+
+    Returns False as soon as the stop event is set, True once the deadline is reached.
+    """
+    perf_counter_ns = time.perf_counter_ns
+    remaining = deadline_ns - perf_counter_ns()
+
+    # Coarse phase: sleep on the stop event so a stop request wakes us at once
+    if remaining > spin_ns and stop_event.wait((remaining - spin_ns) / NS_PER_SECOND):
+        return False
+
+    # Fine phase: spin for the last stretch
+    while perf_counter_ns() < deadline_ns:
+        if stop_event.is_set():
+            return False
+    return not stop_event.is_set()
+
+
+def period_for(cps: float) -> int:
+    """Convert a clicks-per-second rate into a period in nanoseconds."""
+    if cps <= 0:
+        raise ValueError(f"CPS must be positive, got {cps}")
+    return max(1, round(NS_PER_SECOND / cps))
+
+
+def advance_deadline(
+    deadline_ns: int,
+    period_ns: int,
+    now_ns: int,
+    policy: CatchUpPolicy,
+    max_burst: int = DEFAULT_MAX_BURST,
+) -> tuple[int, int]:
+    """Compute the deadline after one click, applying the catch-up policy.
+
+    Returns the next deadline and the number of slots that were skipped.
+    """
+    deadline_ns += period_ns
+    if now_ns - deadline_ns < period_ns:
+        return deadline_ns, 0
+
+    # Fell behind: decide what to do with the slots we already missed
+    missed = (now_ns - deadline_ns) // period_ns
+    if policy is not CatchUpPolicy.SKIP:
+        missed = max(0, missed - max_burst)
+    return deadline_ns + missed * period_ns, missed
+
+
+class TimingStats:
+    """Running click count and lateness statistics for a click loop."""
+
+    __slots__ = (
+        "clicks", "skipped", "started_ns", "stopped_ns", "_first_ns", "_last_ns", "_mean", "_m2",
+        "_max",
+    )  # fmt: skip
+
+    def __init__(self):
+        self.clicks = 0
+        self.skipped = 0
+        self.started_ns = 0
+        self.stopped_ns = 0
+        self._first_ns = 0
+        self._last_ns = 0
+        # Welford accumulators for the lateness of each click
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._max = 0
+
+    def record(self, click_ns: int, lateness_ns: int):
+        """Fold one click (its start time and lateness) into the running statistics."""
+        if not self.clicks:
+            self._first_ns = click_ns
+        self._last_ns = click_ns
+        self.clicks += 1
+        delta = lateness_ns - self._mean
+        self._mean += delta / self.clicks
+        self._m2 += delta * (lateness_ns - self._mean)
+        if lateness_ns > self._max:
+            self._max = lateness_ns
+
+    def snapshot(self, target_cps: float) -> SchedulerStats:
+        """Build an immutable snapshot of the statistics gathered so far."""
+        clicks = self.clicks
+        end_ns = self.stopped_ns or time.perf_counter_ns()
+        elapsed_s = (end_ns - self.started_ns) / NS_PER_SECOND if self.started_ns else 0.0
+        variance = self._m2 / (clicks - 1) if clicks > 1 else 0.0
+        # Rate over the click intervals; fall back to clicks per elapsed time for 0-1 clicks
+        span_ns = self._last_ns - self._first_ns
+        if clicks > 1 and span_ns > 0:
+            achieved_cps = (clicks - 1) / span_ns * NS_PER_SECOND
+        else:
+            achieved_cps = clicks / elapsed_s if elapsed_s > 0 else 0.0
+        return SchedulerStats(
+            clicks=clicks,
+            skipped=self.skipped,
+            elapsed_s=elapsed_s,
+            target_cps=target_cps,
+            achieved_cps=achieved_cps,
+            mean_lateness_us=self._mean / 1000,
+            max_lateness_us=self._max / 1000,
+            jitter_us=math.sqrt(variance) / 1000,
+        )
+
+
+class ClickScheduler:
+    """Runs an action at a fixed rate against absolute deadlines, without drift.
+
+    An action that returns a number of nanoseconds sets the time until its next
+    run instead (a macro's step delays); one that returns None keeps the rate.
+    """
+
+    def __init__(
+        self,
+        action: Callable[[], int | None],
+        cps: float,
+        stop_event: threading.Event,
+        policy: CatchUpPolicy = CatchUpPolicy.SKIP,
+        spin_ns: int = DEFAULT_SPIN_NS,
+        max_burst: int = DEFAULT_MAX_BURST,
+    ):
+        self.action = action
+        self.stop_event = stop_event
+        self.policy = CatchUpPolicy(policy)
+        self.spin_ns = spin_ns
+        self.max_burst = max(1, max_burst)
+        self.period_ns = period_for(cps)
+        self.cps = cps
+        self.timing = TimingStats()
+
+    def set_cps(self, cps: float):
+        """Change the rate; takes effect from the next deadline."""
+        self.period_ns = period_for(cps)
+        self.cps = cps
+
+    def run(self) -> SchedulerStats:
+        """Execute the action on schedule until the stop event is set."""
+        perf_counter_ns = time.perf_counter_ns
+        action = self.action
+        stop_event = self.stop_event
+
+        self.timing = timing = TimingStats()
+        timing.started_ns = deadline = perf_counter_ns()
+
+        while not stop_event.is_set():
+            if not wait_until(deadline, stop_event, self.spin_ns):
+                break
+
+            click_ns = perf_counter_ns()
+            delay_ns = action()
+            timing.record(click_ns, click_ns - deadline)
+
+            deadline, skipped = advance_deadline(
+                deadline,
+                self.period_ns if delay_ns is None else delay_ns,
+                perf_counter_ns(),
+                self.policy,
+                self.max_burst,
+            )
+            timing.skipped += skipped
+
+        timing.stopped_ns = perf_counter_ns()
+        return self.stats()
+
+    def stats(self) -> SchedulerStats:
+        """Return the timing achieved so far (safe to call while running)."""
+        return self.timing.snapshot(self.cps)
@@ -0,0 +1,285 @@
+"""Module for spotting golden cookies (shimmers) and clicking them.
+
+Detection works on captured frames: a vectorized color mask picks golden pixels,
+tiles with enough of them are grouped into blobs, and each blob is checked
+against a template before it counts as a hit. Only tiles that changed since the
+previous frame are scanned, with a periodic full scan for sprites that sit still.
+
+Requires the optional ``vision`` extra (NumPy).
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .backend import WindowBackend
+from .capture import DEFAULT_FPS, DEFAULT_TILE, ScreenCapture, color_mask, tile_clusters
+from .scheduler import period_for, wait_until
+from .telemetry import LatencyHistogram
+
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Golden cookie detection needs NumPy: pip install 'cookie-clicker-bot[vision]'"
+    ) from e
+
+
+# Inclusive BGR range of golden-cookie pixels
+GOLDEN_LOWER = (0, 160, 200)
+GOLDEN_UPPER = (150, 245, 255)
+
+# A blob needs this many golden pixels to be considered at all
+MIN_PIXELS = 120
+
+# Fraction of template cells a blob must agree with (a filled square scores about 0.8)
+MATCH_THRESHOLD = 0.85
+
+# Golden cookies are round: blobs much wider than tall (or the reverse) are something else
+MAX_ASPECT = 1.5
+
+# Edge length of the template grid blobs are resampled to
+TEMPLATE_SIZE = 16
+
+# Scan the whole frame every this many frames, not only the changed tiles
+FULL_SCAN_INTERVAL = 15
+
+# A hit this close to a recent click is the same cookie, not yet gone from the screen
+SUPPRESS_RADIUS = 40
+SUPPRESS_NS = 400_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class Detection:
+    """A golden cookie found in a frame."""
+
+    x: int  # Client coordinates of the center
+    y: int
+    width: int
+    height: int
+    pixels: int
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class ShimmerStats:
+    """What a ShimmerWatcher found and clicked."""
+
+    frames_scanned: int
+    detections: int
+    clicks: int
+    scan_mean_us: float
+    scan_p99_us: float
+    detect_p50_us: float  # Frame captured to detection finished
+    detect_p99_us: float
+
+
+def disc_template(size: int = TEMPLATE_SIZE) -> np.ndarray:
+    """A filled circle, the shape of a golden cookie."""
+    center = (size - 1) / 2
+    y, x = np.ogrid[:size, :size]
+    return (x - center) ** 2 + (y - center) ** 2 <= (size / 2) ** 2
+
+
+class ShimmerDetector:
+    """Finds golden cookies in BGRA frames."""
+
+    def __init__(
+        self,
+        template: np.ndarray | None = None,
+        lower: tuple[int, int, int] = GOLDEN_LOWER,
+        upper: tuple[int, int, int] = GOLDEN_UPPER,
+        min_pixels: int = MIN_PIXELS,
+        threshold: float = MATCH_THRESHOLD,
+        tile: int = DEFAULT_TILE,
+    ):
+        self.template = disc_template() if template is None else template.astype(bool)
+        self.lower = lower
+        self.upper = upper
+        self.min_pixels = min_pixels
+        self.threshold = threshold
+        self.tile = tile
+        height, width = self.template.shape
+        self._rows = np.arange(height)
+        self._cols = np.arange(width)
+
+    @classmethod
+    def from_sprite(
+        cls,
+        sprite: np.ndarray,
+        lower: tuple[int, int, int] = GOLDEN_LOWER,
+        upper: tuple[int, int, int] = GOLDEN_UPPER,
+        **kwargs,
+    ) -> "ShimmerDetector":
+        """Build a detector whose template is the golden pixels of a recorded BGRA sprite."""
+        return cls(template=color_mask(sprite, lower, upper), lower=lower, upper=upper, **kwargs)
+
+    def score(self, mask: np.ndarray) -> float:
+        """Agreement between a blob's mask and the template, resampled to its size."""
+        height, width = mask.shape
+        template_height, template_width = self.template.shape
+        rows = self._rows * height // template_height
+        cols = self._cols * width // template_width
+        return float((mask[np.ix_(rows, cols)] == self.template).mean())
+
+    def detect(
+        self,
+        array: np.ndarray,
+        changed: np.ndarray | None = None,
+        origin: tuple[int, int] = (0, 0),
+    ) -> list[Detection]:
+        """Find golden cookies in a frame, looking only at changed tiles if a mask is given.
+
+        ``changed`` is a per-tile bool mask (as in ``Frame.changed``); ``origin`` is
+        the client position of the frame, added to the reported coordinates.
+        """
+        tile = self.tile
+        height, width = array.shape[:2]
+        if changed is None:
+            areas = [(0, 0, height, width)]
+        else:
+            areas = [
+                (row0 * tile, col0 * tile, min(row1 * tile, height), min(col1 * tile, width))
+                for row0, col0, row1, col1 in tile_clusters(changed)
+            ]
+
+        detections = []
+        for top, left, bottom, right in areas:
+            mask = color_mask(array[top:bottom, left:right], self.lower, self.upper)
+            if mask.sum() < self.min_pixels:
+                continue
+            # Group tiles with golden pixels into blobs before looking at single pixels
+            counts = np.add.reduceat(
+                np.add.reduceat(mask, np.arange(0, mask.shape[0], tile), axis=0, dtype=np.int32),
+                np.arange(0, mask.shape[1], tile),
+                axis=1,
+            )
+            for row0, col0, row1, col1 in tile_clusters(counts > 0):
+                blob = mask[row0 * tile : row1 * tile, col0 * tile : col1 * tile]
+                detection = self._measure(blob, top + row0 * tile, left + col0 * tile, origin)
+                if detection:
+                    detections.append(detection)
+        return detections
+
+    def _measure(
+        self, blob: np.ndarray, top: int, left: int, origin: tuple[int, int]
+    ) -> Detection | None:
+        """Turn a blob of golden pixels into a detection if it looks like a cookie."""
+        ys, xs = np.nonzero(blob)
+        if len(ys) < self.min_pixels:
+            return None
+        y0, y1, x0, x1 = int(ys.min()), int(ys.max()) + 1, int(xs.min()), int(xs.max()) + 1
+        if max(x1 - x0, y1 - y0) > MAX_ASPECT * min(x1 - x0, y1 - y0):
+            return None
+        score = self.score(blob[y0:y1, x0:x1])
+        if score < self.threshold:
+            return None
+        return Detection(
+            x=origin[0] + left + int(xs.mean()),
+            y=origin[1] + top + int(ys.mean()),
+            width=x1 - x0,
+            height=y1 - y0,
+            pixels=len(ys),
+            score=score,
+        )
+
+
+class ShimmerWatcher:
+    """Captures a window, detects golden cookies and hands each one to a click callback.
+
+    ``click(x, y, detected_ns)`` is typically ``AutoClicker.inject_click``, so golden
+    cookies are clicked by the running click loop without interrupting it.
+    """
+
+    def __init__(
+        self,
+        hwnd: int,
+        click: Callable[[int, int, int], None],
+        backend: WindowBackend | None = None,
+        detector: ShimmerDetector | None = None,
+        region: tuple[int, int, int, int] | None = None,
+        on_click: Callable[[Detection], None] | None = None,
+    ):
+        self.capture = ScreenCapture(hwnd, backend, region)
+        self.detector = detector or ShimmerDetector()
+        self.click = click
+        self.on_click = on_click
+        self.scan = LatencyHistogram()
+        self.detection = LatencyHistogram()
+        self.frames_scanned = 0
+        self.detections = 0
+        self.clicks = 0
+        # Recent clicks as (x, y, clicked_ns), to avoid clicking one cookie twice
+        self._recent: deque[tuple[int, int, int]] = deque(maxlen=32)
+
+    def _is_recent(self, detection: Detection, now: int) -> bool:
+        """Whether a detection is a cookie that was just clicked."""
+        radius = SUPPRESS_RADIUS * SUPPRESS_RADIUS
+        return any(
+            now - clicked_ns < SUPPRESS_NS
+            and (detection.x - x) ** 2 + (detection.y - y) ** 2 <= radius
+            for x, y, clicked_ns in self._recent
+        )
+
+    def poll(self) -> list[Detection]:
+        """Capture one frame, detect golden cookies and click the new ones."""
+        capture = self.capture
+        frame = capture.capture()
+        if frame is None:
+            # Nothing changed; still rescan now and then for cookies that sit still
+            if capture.frames_captured % FULL_SCAN_INTERVAL:
+                return []
+            frame = capture.latest()
+            if frame is None:
+                return []
+            changed = None
+        else:
+            full_scan = frame.changed is None or capture.frames_captured % FULL_SCAN_INTERVAL == 0
+            changed = None if full_scan else frame.changed
+
+        frame_id = frame.id
+        start_ns = time.perf_counter_ns()
+        detections = self.detector.detect(frame.array, changed, frame.region[:2])
+        detected_ns = time.perf_counter_ns()
+        if frame.id != frame_id:
+            return []  # The slot was overwritten while scanning
+
+        self.frames_scanned += 1
+        self.scan.record(detected_ns - start_ns)
+        for detection in detections:
+            self.detections += 1
+            self.detection.record(detected_ns - frame.timestamp_ns)
+            if self._is_recent(detection, detected_ns):
+                continue
+            self.click(detection.x, detection.y, detected_ns)
+            self._recent.append((detection.x, detection.y, detected_ns))
+            self.clicks += 1
+            if self.on_click:
+                self.on_click(detection)
+        return detections
+
+    def run(self, stop_event: threading.Event, fps: float = DEFAULT_FPS):
+        """Watch for golden cookies until the stop event is set."""
+        period_ns = period_for(fps)
+        deadline = time.perf_counter_ns()
+        try:
+            while wait_until(deadline, stop_event, 0):
+                self.poll()
+                deadline = max(deadline + period_ns, time.perf_counter_ns())
+        finally:
+            self.capture.close()
+
+    def stats(self) -> ShimmerStats:
+        """Get detection counts and latencies."""
+        return ShimmerStats(
+            frames_scanned=self.frames_scanned,
+            detections=self.detections,
+            clicks=self.clicks,
+            scan_mean_us=self.scan.mean_us(),
+            scan_p99_us=self.scan.percentile(99),
+            detect_p50_us=self.detection.percentile(50),
+            detect_p99_us=self.detection.percentile(99),
+        )
@@ -0,0 +1,379 @@
+"""Module for an in-memory simulated window server.
+
+``SimulatedBackend`` implements the same interface as the Win32 backend, so
+the clicker, engine, window registry and geometry tracker can run headless on
+any platform. The server can inject message-handling delay and window churn.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .backend import WM_LBUTTONDOWN
+from .win_events import (
+    EVENT_OBJECT_CREATE,
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_LOCATIONCHANGE,
+    EVENT_OBJECT_NAMECHANGE,
+    EVENT_OBJECT_SHOW,
+)
+
+
+# BGRA colors used to paint simulated windows
+BACKGROUND_COLOR = (0x40, 0x2A, 0x1C, 0xFF)
+COOKIE_COLOR = (0x2C, 0x7A, 0xC8, 0xFF)
+SHIMMER_COLOR = (0x3C, 0xD2, 0xFA, 0xFF)  # Golden cookie
+SHIMMER_RADIUS = 24
+
+
+def _sleep_until(deadline: float):
+    """Block until a perf_counter deadline."""
+    remaining = deadline - time.perf_counter()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+@dataclass(slots=True)
+class SimulatedWindow:
+    """State of one simulated top-level window."""
+
+    hwnd: int
+    title: str
+    process_id: int
+    width: int = 1280
+    height: int = 720
+    origin_x: int = 0
+    origin_y: int = 0
+    visible: bool = True
+    message_delay_s: float = 0.0  # Time the window takes to handle each message
+    busy_until: float = 0.0  # perf_counter time until which the window's thread is occupied
+    hung_until: float = 0.0  # perf_counter time until which the window is stalled
+    clicks: int = 0  # WM_LBUTTONDOWN messages handled
+    messages: int = 0
+    big_cookie: tuple[float, float] | None = None  # Relative position of the painted cookie
+    # Golden cookies on screen: id -> (x, y, radius, perf_counter time it appeared)
+    shimmers: dict[int, tuple[int, int, int, float]] = field(default_factory=dict)
+    shimmer_latencies: list[float] = field(default_factory=list)  # Appear-to-click seconds
+    # Client-area pixels (BGRA rows), painted lazily at the current size
+    pixels: bytearray = field(default_factory=bytearray, repr=False)
+
+    def surface(self) -> bytearray:
+        """Get the client-area pixels, repainting the background after a resize."""
+        if len(self.pixels) != self.width * self.height * 4:
+            self.pixels = bytearray(bytes(BACKGROUND_COLOR) * (self.width * self.height))
+            if self.big_cookie:
+                radius = min(self.width, self.height) // 8
+                cx, cy = self.client_point(*self.big_cookie)
+                self.fill_circle(cx, cy, radius, COOKIE_COLOR)
+            for x, y, radius, _ in self.shimmers.values():
+                self.fill_circle(x, y, radius, SHIMMER_COLOR)
+        return self.pixels
+
+    def client_point(self, relative_x: float, relative_y: float) -> tuple[int, int]:
+        """Convert a relative position into client coordinates."""
+        return int(self.width * relative_x), int(self.height * relative_y)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, color: tuple[int, ...]):
+        """Paint a rectangle, clipped to the client area."""
+        x0, x1 = max(x, 0), min(x + width, self.width)
+        if x0 >= x1:
+            return
+        pixels = self.surface()
+        row = bytes(color) * (x1 - x0)
+        for line in range(max(y, 0), min(y + height, self.height)):
+            start = (line * self.width + x0) * 4
+            pixels[start : start + len(row)] = row
+
+    def fill_circle(self, cx: int, cy: int, radius: int, color: tuple[int, ...]):
+        """Paint a filled circle, clipped to the client area."""
+        for dy in range(-radius, radius + 1):
+            half = int((radius * radius - dy * dy) ** 0.5)
+            self.fill_rect(cx - half, cy + dy, 2 * half + 1, 1, color)
+
+    def handle(self, msg: int, lparam: int = 0) -> float:
+        """Queue one message behind the window's current work; returns its completion time."""
+        now = time.perf_counter()
+        done = max(now, self.busy_until) + self.message_delay_s
+        self.busy_until = done
+        self.messages += 1
+        if msg == WM_LBUTTONDOWN:
+            self.clicks += 1
+            if self.shimmers:
+                self._click_shimmer(lparam & 0xFFFF, lparam >> 16, now)
+        return done
+
+    def _click_shimmer(self, x: int, y: int, now: float):
+        """Collect the golden cookie under a click, if there is one."""
+        for shimmer_id, (sx, sy, radius, appeared) in list(self.shimmers.items()):
+            if (x - sx) ** 2 + (y - sy) ** 2 <= radius * radius:
+                del self.shimmers[shimmer_id]
+                self.shimmer_latencies.append(now - appeared)
+                self.pixels = bytearray()  # Repaint without it
+                return
+
+
+class SimulatedEventSource:
+    """Event source fed synchronously by the simulated server."""
+
+    def __init__(self, server: "SimulatedBackend", handler: Callable[[int, int], None]):
+        self.server = server
+        self.handler = handler
+        self.hooks: list[tuple[int, int, int]] = []
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        """Whether events are being delivered."""
+        return self._running
+
+    def add_hook(self, event_min: int, event_max: int, process_id: int = 0):
+        """Subscribe to an event range, optionally limited to one process."""
+        key = (event_min, event_max, process_id)
+        if key not in self.hooks:
+            self.hooks.append(key)
+
+    def start(self):
+        """Start delivering events."""
+        if not self._running:
+            self._running = True
+            self.server.event_sources.append(self)
+
+    def stop(self):
+        """Stop delivering events."""
+        if self._running:
+            self._running = False
+            self.server.event_sources.remove(self)
+
+    def deliver(self, event: int, hwnd: int, process_id: int):
+        """Call the handler if one of the hooks matches the event."""
+        for event_min, event_max, hook_pid in self.hooks:
+            if event_min <= event <= event_max and hook_pid in (0, process_id):
+                self.handler(event, hwnd)
+                return
+
+
+class SimulatedBackend:
+    """In-memory window server implementing the WindowBackend interface."""
+
+    def __init__(self, seed: int | None = None):
+        self.windows: dict[int, SimulatedWindow] = {}
+        self.event_sources: list[SimulatedEventSource] = []
+        self._hwnds = itertools.count(0x10000, 2)
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        # Min-heap of (completion time, sequence, callback) for asynchronous messages
+        self._replies: list[tuple[float, int, Callable[[], None]]] = []
+        self._reply_ids = itertools.count()
+        self._shimmer_ids = itertools.count(1)
+
+    # Window management (the "other applications" side)
+
+    def create_window(
+        self,
+        title: str,
+        width: int = 1280,
+        height: int = 720,
+        process_id: int = 1000,
+        visible: bool = True,
+        message_delay_s: float = 0.0,
+    ) -> int:
+        """Create a window and announce it to the event sources."""
+        with self._lock:
+            hwnd = next(self._hwnds)
+            self.windows[hwnd] = SimulatedWindow(
+                hwnd,
+                title,
+                process_id,
+                width,
+                height,
+                visible=visible,
+                message_delay_s=message_delay_s,
+            )
+        self._emit(EVENT_OBJECT_CREATE, hwnd)
+        if visible:
+            self._emit(EVENT_OBJECT_SHOW, hwnd)
+        return hwnd
+
+    def create_game_window(self, cookies: str = "245", **kwargs) -> int:
+        """Create a window titled like a running Cookie Clicker game, big cookie included."""
+        hwnd = self.create_window(f"{cookies} cookies - Cookie Clicker", **kwargs)
+        self.windows[hwnd].big_cookie = (0.15, 0.39)  # The game's default layout
+        return hwnd
+
+    def spawn_shimmer(self, hwnd: int, x: int, y: int, radius: int = SHIMMER_RADIUS) -> int:
+        """Show a golden cookie that disappears when it is clicked."""
+        window = self.windows[hwnd]
+        shimmer_id = next(self._shimmer_ids)
+        window.shimmers[shimmer_id] = (x, y, radius, time.perf_counter())
+        window.fill_circle(x, y, radius, SHIMMER_COLOR)
+        return shimmer_id
+
+    def move_big_cookie(self, hwnd: int, relative_x: float, relative_y: float):
+        """Repaint the window with the big cookie at another relative position."""
+        window = self.windows[hwnd]
+        window.big_cookie = (relative_x, relative_y)
+        window.pixels = bytearray()
+
+    def draw_rect(self, hwnd: int, x: int, y: int, width: int, height: int, color: tuple[int, ...]):
+        """Paint a rectangle into a window's client area."""
+        self.windows[hwnd].fill_rect(x, y, width, height, color)
+
+    def draw_circle(self, hwnd: int, cx: int, cy: int, radius: int, color: tuple[int, ...]):
+        """Paint a filled circle into a window's client area."""
+        self.windows[hwnd].fill_circle(cx, cy, radius, color)
+
+    def destroy_window(self, hwnd: int):
+        """Destroy a window."""
+        window = self.windows.get(hwnd)
+        if window is None:
+            return
+        self._emit(EVENT_OBJECT_DESTROY, hwnd)
+        with self._lock:
+            self.windows.pop(hwnd, None)
+
+    def set_title(self, hwnd: int, title: str):
+        """Rename a window."""
+        self.windows[hwnd].title = title
+        self._emit(EVENT_OBJECT_NAMECHANGE, hwnd)
+
+    def move_window(
+        self, hwnd: int, x: int, y: int, width: int | None = None, height: int | None = None
+    ):
+        """Move and optionally resize a window."""
+        window = self.windows[hwnd]
+        window.origin_x, window.origin_y = x, y
+        if width is not None:
+            window.width = width
+        if height is not None:
+            window.height = height
+        self._emit(EVENT_OBJECT_LOCATIONCHANGE, hwnd)
+
+    def set_message_delay(self, hwnd: int, delay_s: float):
+        """Make a window take this long to handle every message."""
+        self.windows[hwnd].message_delay_s = delay_s
+
+    def stall(self, hwnd: int, seconds: float):
+        """Make a window stop processing messages for a while (autosave, GC pause...)."""
+        window = self.windows[hwnd]
+        now = time.perf_counter()
+        window.hung_until = now + seconds
+        window.busy_until = max(now, window.busy_until) + seconds
+
+    def add_noise_windows(self, count: int) -> list[int]:
+        """Create unrelated windows, as found on a busy desktop."""
+        return [
+            self.create_window(f"Untitled - Notepad {index}", process_id=2000 + index)
+            for index in range(count)
+        ]
+
+    def churn(self, count: int = 1):
+        """Destroy and create some unrelated windows."""
+        noise = [hwnd for hwnd, w in self.windows.items() if "Cookie Clicker" not in w.title]
+        for hwnd in self._random.sample(noise, min(count, len(noise))):
+            self.destroy_window(hwnd)
+        for _ in range(count):
+            self.create_window(f"Churn {self._random.randrange(1 << 30)}", process_id=3000)
+
+    def _emit(self, event: int, hwnd: int):
+        """Deliver an event to every running event source."""
+        window = self.windows.get(hwnd)
+        process_id = window.process_id if window else 0
+        for source in list(self.event_sources):
+            source.deliver(event, hwnd, process_id)
+
+    # WindowBackend interface (the bot's side)
+
+    def enum_windows(self) -> list[tuple[int, str, bool]]:
+        """List all top-level windows as (hwnd, title, visible)."""
+        with self._lock:
+            return [(w.hwnd, w.title, w.visible) for w in self.windows.values()]
+
+    def get_window_text(self, hwnd: int) -> str:
+        """Get a window's title ("" for invalid windows, like Win32)."""
+        window = self.windows.get(hwnd)
+        return window.title if window else ""
+
+    def is_window(self, hwnd: int) -> bool:
+        """Check whether a window exists."""
+        return hwnd in self.windows
+
+    def is_window_visible(self, hwnd: int) -> bool:
+        """Check whether a window is visible."""
+        window = self.windows.get(hwnd)
+        return bool(window and window.visible)
+
+    def get_client_rect(self, hwnd: int) -> tuple[int, int, int, int]:
+        """Get a window's client rectangle."""
+        window = self.windows[hwnd]
+        return 0, 0, window.width, window.height
+
+    def client_to_screen(self, hwnd: int, point: tuple[int, int]) -> tuple[int, int]:
+        """Convert client coordinates to screen coordinates."""
+        window = self.windows[hwnd]
+        return window.origin_x + point[0], window.origin_y + point[1]
+
+    def get_window_process_id(self, hwnd: int) -> int:
+        """Get the id of the process that owns a window."""
+        return self.windows[hwnd].process_id
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        """Deliver a message, blocking until the window has handled it."""
+        window = self.windows.get(hwnd)
+        if window is None:
+            return 0  # Messages to destroyed windows are silently dropped
+        _sleep_until(window.handle(msg, lparam))
+        return 0
+
+    def send_message_timeout(
+        self, hwnd: int, msg: int, wparam: int, lparam: int, timeout_ms: int
+    ) -> bool:
+        """Deliver a message, giving up if the window is hung or slower than the timeout."""
+        window = self.windows.get(hwnd)
+        if window is None or self.is_hung(hwnd):
+            return False
+
+        now = time.perf_counter()
+        timeout_s = timeout_ms / 1000
+        # The message is still handled eventually, even if the sender gives up
+        done = window.handle(msg, lparam)
+        if done - now > timeout_s:
+            _sleep_until(now + timeout_s)
+            return False
+        _sleep_until(done)
+        return True
+
+    def send_message_async(
+        self, hwnd: int, msg: int, wparam: int, lparam: int, on_done: Callable[[], None]
+    ) -> bool:
+        """Queue a message; on_done runs once it has been handled."""
+        window = self.windows.get(hwnd)
+        if window is None:
+            return False
+        heapq.heappush(self._replies, (window.handle(msg, lparam), next(self._reply_ids), on_done))
+        return True
+
+    def process_async_replies(self):
+        """Run the callbacks of the asynchronous messages handled so far."""
+        replies = self._replies
+        now = time.perf_counter()
+        while replies and replies[0][0] <= now:
+            heapq.heappop(replies)[2]()
+
+    def is_hung(self, hwnd: int) -> bool:
+        """Check whether a window is stalled."""
+        window = self.windows.get(hwnd)
+        return bool(window and time.perf_counter() < window.hung_until)
+
+    def create_event_source(self, handler: Callable[[int, int], None]) -> SimulatedEventSource:
+        """Create an event source fed by this server."""
+        return SimulatedEventSource(self, handler)
+
+    def create_frame_source(self, hwnd: int):
+        """Create a frame source that copies a window's painted surface (needs NumPy)."""
+        from .capture import SimulatedFrameSource
+
+        return SimulatedFrameSource(self.windows[hwnd])
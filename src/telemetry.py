@@ -0,0 +1,206 @@
+"""Module for low-overhead click telemetry."""
+
+import json
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from . import config
+
+
+# Bucket upper bounds in microseconds; the last bucket catches everything above
+BUCKET_BOUNDS_US = (
+    5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 1_000_000,
+)  # fmt: skip
+
+# Number of recent click timestamps kept for the achieved-rate estimate
+RECENT_CLICKS = 256
+
+SESSIONS_DIR = config.DATA_DIR / "sessions"
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations, stored in a preallocated array."""
+
+    __slots__ = ("_bounds_ns", "counts", "total", "sum_ns", "max_ns")
+
+    def __init__(self, bounds_us: tuple[int, ...] = BUCKET_BOUNDS_US):
+        self._bounds_ns = [bound * 1000 for bound in bounds_us]
+        self.counts = array("Q", bytes(8 * (len(bounds_us) + 1)))
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    @property
+    def bounds_us(self) -> list[int]:
+        """Upper bound of each bucket in microseconds (the last one is open-ended)."""
+        return [bound // 1000 for bound in self._bounds_ns]
+
+    def record(self, duration_ns: int):
+        """Count one duration."""
+        self.counts[bisect_left(self._bounds_ns, duration_ns)] += 1
+        self.total += 1
+        self.sum_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile (0-100) in microseconds from the bucket counts.
+
+        The durations in a bucket are taken as evenly spread between its bounds,
+        so the estimate moves within the bucket instead of snapping to its upper
+        bound; the open-ended last bucket, and every bucket, ends at the maximum.
+        """
+        if not self.total:
+            return 0.0
+        rank = q / 100 * self.total
+        seen = 0
+        lower_ns = 0
+        bounds_ns = self._bounds_ns
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                upper_ns = bounds_ns[index] if index < len(bounds_ns) else self.max_ns
+                upper_ns = min(upper_ns, self.max_ns)
+                lower_ns = min(lower_ns, upper_ns)
+                fraction = max(rank - seen, 0) / count
+                return (lower_ns + (upper_ns - lower_ns) * fraction) / 1000
+            seen += count
+            if index < len(bounds_ns):
+                lower_ns = bounds_ns[index]
+        return self.max_ns / 1000
+
+    def mean_us(self) -> float:
+        """Mean duration in microseconds."""
+        return self.sum_ns / self.total / 1000 if self.total else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetrySnapshot:
+    """Point-in-time view of the click telemetry."""
+
+    clicks: int
+    target_cps: float
+    achieved_cps: float
+    dispatch_mean_us: float
+    dispatch_p50_us: float
+    dispatch_p99_us: float
+    dispatch_max_us: float
+    jitter_p50_us: float
+    jitter_p99_us: float
+
+
+class ClickTelemetry:
+    """Measures dispatch latency, achieved rate and inter-click jitter.
+
+    Recording a click touches only preallocated arrays and integer counters, so
+    it can sit on the click path; everything else is computed on demand.
+    """
+
+    def __init__(self, target_cps: float | None = None):
+        self.target_cps = target_cps or config.current().cps
+        self.dispatch = LatencyHistogram()
+        self.jitter = LatencyHistogram()  # |interval - target period| per click
+        self.injection = LatencyHistogram()  # Detection to dispatch of one-off clicks
+        self._recent = array("q", bytes(8 * RECENT_CLICKS))
+        self._next = 0
+        self.clicks = 0
+        self.started_ns = time.perf_counter_ns()
+        self._last_start_ns = 0
+
+    def set_target_cps(self, cps: float):
+        """Change the rate the jitter is measured against."""
+        self.target_cps = cps
+
+    def record_click(self, start_ns: int, end_ns: int, expected_ns: int | None = None):
+        """Record one click whose dispatch started and ended at the given times.
+
+        ``expected_ns`` is the planned interval since the previous click when it is
+        not the target period (a macro's step delay).
+        """
+        self.dispatch.record(end_ns - start_ns)
+        if self._last_start_ns:
+            interval = start_ns - self._last_start_ns
+            if expected_ns is None:
+                expected_ns = round(1_000_000_000 / self.target_cps)
+            self.jitter.record(abs(interval - expected_ns))
+        self._last_start_ns = start_ns
+        self._recent[self._next] = start_ns
+        self._next = (self._next + 1) % RECENT_CLICKS
+        self.clicks += 1
+
+    def record_injected(self, detected_ns: int, start_ns: int):
+        """Record a one-off click that was dispatched some time after it was requested."""
+        self.injection.record(start_ns - detected_ns)
+
+    def achieved_cps(self) -> float:
+        """Click rate over the most recent clicks."""
+        count = min(self.clicks, RECENT_CLICKS)
+        if count < 2:
+            return 0.0
+        newest = self._recent[(self._next - 1) % RECENT_CLICKS]
+        oldest = self._recent[(self._next - count) % RECENT_CLICKS]
+        # Include the time since the last click so the rate drops when clicking stalls
+        span = max(newest - oldest, time.perf_counter_ns() - oldest)
+        return (count - 1) / span * 1_000_000_000 if span > 0 else 0.0
+
+    def snapshot(self) -> TelemetrySnapshot:
+        """Summarize the telemetry gathered so far."""
+        return TelemetrySnapshot(
+            clicks=self.clicks,
+            target_cps=self.target_cps,
+            achieved_cps=self.achieved_cps(),
+            dispatch_mean_us=self.dispatch.mean_us(),
+            dispatch_p50_us=self.dispatch.percentile(50),
+            dispatch_p99_us=self.dispatch.percentile(99),
+            dispatch_max_us=self.dispatch.max_ns / 1000,
+            jitter_p50_us=self.jitter.percentile(50),
+            jitter_p99_us=self.jitter.percentile(99),
+        )
+
+    def summary(self) -> dict:
+        """Build a JSON-serializable session summary including the histograms."""
+        elapsed_s = (time.perf_counter_ns() - self.started_ns) / 1_000_000_000
+        return {
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_s": elapsed_s,
+            "session_cps": self.clicks / elapsed_s if elapsed_s > 0 else 0.0,
+            **asdict(self.snapshot()),
+            "bucket_bounds_us": self.dispatch.bounds_us,
+            "dispatch_histogram": list(self.dispatch.counts),
+            "jitter_histogram": list(self.jitter.counts),
+            "injected_clicks": self.injection.total,
+            "injection_p50_us": self.injection.percentile(50),
+            "injection_p99_us": self.injection.percentile(99),
+        }
+
+    def write_summary(self, directory: Path = SESSIONS_DIR) -> Path:
+        """Write the session summary as JSON and return its path."""
+        return write_summary(self.summary(), directory)
+
+
+def create_timestamped(directory: Path, prefix: str, suffix: str) -> Path:
+    """Create a new empty file named after the current time and return its path.
+
+    Sessions restarted within the same second would get the same name, so the
+    file is created exclusively and a counter is appended until the name is free.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{prefix}-{datetime.now():%Y%m%d-%H%M%S}"
+    path, attempt = directory / f"{stem}{suffix}", 1
+    while True:
+        try:
+            path.open("x").close()
+            return path
+        except FileExistsError:
+            attempt += 1
+            path = directory / f"{stem}-{attempt}{suffix}"
+
+
+def write_summary(summary: dict, directory: Path = SESSIONS_DIR, prefix: str = "session") -> Path:
+    """Write a session summary as JSON and return its path."""
+    path = create_timestamped(directory, prefix, ".json")
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return path
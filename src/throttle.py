@@ -0,0 +1,69 @@
+"""Module for coalescing bursts of GUI updates."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+# One display frame at 60 Hz
+DEFAULT_INTERVAL_MS = 16
+
+
+class CoalescingUpdater:
+    """Applies only the latest submitted value, at most once per interval.
+
+    Values submitted while an update is pending replace it instead of queuing
+    another one, so a slider drag that fires hundreds of traces per second
+    results in at most one apply per frame. Must be used from the Tk thread.
+    """
+
+    def __init__(
+        self,
+        root: Any,
+        apply: Callable[[Any], None],
+        interval_ms: int = DEFAULT_INTERVAL_MS,
+    ):
+        self.root = root
+        self.apply = apply
+        self.interval_ms = interval_ms
+        self.submitted = 0
+        self.applied = 0
+        self._pending: Any = None
+        self._scheduled = False
+        self._last_apply = 0.0
+
+    @property
+    def dropped(self) -> int:
+        """Number of submitted values superseded before they were applied."""
+        return self.submitted - self.applied - (1 if self._scheduled else 0)
+
+    def submit(self, value: Any):
+        """Queue a value, replacing any value that has not been applied yet."""
+        self.submitted += 1
+        self._pending = value
+        if self._scheduled:
+            return
+
+        self._scheduled = True
+        elapsed_ms = (time.perf_counter() - self._last_apply) * 1000
+        delay = max(0, round(self.interval_ms - elapsed_ms))
+        self.root.after(delay, self._flush)
+
+    def flush(self):
+        """Apply the pending value right away, if there is one."""
+        if self._scheduled:
+            self._flush()
+
+    def _flush(self):
+        """Apply the latest pending value."""
+        if not self._scheduled:
+            return  # Already flushed manually
+        self._scheduled = False
+        self._last_apply = time.perf_counter()
+        self.applied += 1
+        self.apply(self._pending)
+
+    def reset_counters(self):
+        """Start counting applied and dropped updates from zero."""
+        self.submitted = 1 if self._scheduled else 0
+        self.applied = 0
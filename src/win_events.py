@@ -0,0 +1,142 @@
+"""Module for receiving Windows accessibility (WinEvent) notifications."""
+
+import ctypes
+import queue
+import threading
+from collections.abc import Callable
+from ctypes import wintypes
+
+
+# WinEvent constants (winuser.h); pywin32 does not wrap SetWinEventHook
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+WM_APP = 0x8000
+
+
+class WinEventThread:
+    """Hosts WinEvent hooks on a dedicated message-pump thread.
+
+    Only whole-window events (OBJID_WINDOW / CHILDID_SELF) are forwarded to the
+    handler as ``handler(event, hwnd)``; everything else is accessibility noise.
+    Hooks can be added while the thread runs, optionally scoped to one process.
+    """
+
+    def __init__(self, handler: Callable[[int, int], None]):
+        self.handler = handler
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._pending: queue.SimpleQueue[tuple[int, int, int]] = queue.SimpleQueue()
+        self._hooked: set[tuple[int, int, int]] = set()
+
+    @property
+    def running(self) -> bool:
+        """Whether the message-pump thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_hook(self, event_min: int, event_max: int, process_id: int = 0):
+        """Install a hook for an event range, optionally limited to one process."""
+        key = (event_min, event_max, process_id)
+        if key in self._hooked:
+            return
+        self._hooked.add(key)
+        self._pending.put(key)
+        if self._thread_id:
+            # Wake the pump so it installs the hook on its own thread
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_APP, 0, 0)
+
+    def start(self):
+        """Start the message-pump thread and wait until it accepts messages."""
+        if self.running:
+            return
+        self._ready.clear()
+        # Hooks die with the thread: queue every one exactly once for the new thread
+        while not self._pending.empty():
+            self._pending.get()
+        for key in self._hooked:
+            self._pending.put(key)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=2)
+
+    def stop(self):
+        """Remove all hooks and stop the thread."""
+        if self._thread and self._thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._thread_id = 0
+
+    def _run(self):
+        """Install the hooks and pump messages until WM_QUIT."""
+        user32 = ctypes.windll.user32
+        win_event_proc = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+        # HWINEVENTHOOK is a pointer-sized handle: the default int return would truncate it
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            win_event_proc,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.UnhookWinEvent.restype = wintypes.BOOL
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        handler = self.handler
+
+        def callback(_hook, event, hwnd, id_object, id_child, _thread, _time):
+            if hwnd and id_object == OBJID_WINDOW and id_child == CHILDID_SELF:
+                handler(event, hwnd)
+
+        # Keep a reference so the callback is not garbage collected
+        self._callback = win_event_proc(callback)
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = []
+
+        def install_pending():
+            while not self._pending.empty():
+                event_min, event_max, process_id = self._pending.get()
+                hook = user32.SetWinEventHook(
+                    event_min, event_max, 0, self._callback, process_id, 0, flags
+                )
+                if hook:
+                    hooks.append(hook)
+
+        install_pending()
+
+        # Make sure the thread has a message queue before anyone posts to it
+        msg = wintypes.MSG()
+        user32.PeekMessageW(ctypes.byref(msg), 0, 0, 0, 0)
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._ready.set()
+
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                if msg.message == WM_APP:
+                    install_pending()
+                    continue
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
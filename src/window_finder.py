@@ -1,86 +1,209 @@
 """Module for finding and managing Cookie Clicker windows."""
 
-import re
+import logging
+import threading
+from collections.abc import Callable
 
-import win32gui
+from . import metrics
+from .backend import WindowBackend, get_backend
+from .cookies import TITLE_PATTERN
+from .win_events import (
+    EVENT_OBJECT_CREATE,
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_HIDE,
+    EVENT_OBJECT_NAMECHANGE,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 class CookieClickerWindowFinder:
     """Responsible for finding the Cookie Clicker window."""
 
+    def __init__(self, backend: WindowBackend | None = None):
+        self.backend = backend or get_backend()
+
     @staticmethod
     def is_cookie_clicker_window(title: str) -> bool:
         """Verify if the title matches the dynamic Cookie Clicker pattern."""
-        # Pattern: "[number] [optional: million/billion/trillion/etc.] cookies - Cookie Clicker"
-        # Examples:
-        #   - "245 cookies - Cookie Clicker"
-        #   - "1,111 cookies - Cookie Clicker"
-        #   - "72.197 million cookies - Cookie Clicker"
-        #   - "13.564 billion cookies - Cookie Clicker"
-        #   - "6.432 trillion cookies - Cookie Clicker"
-        pattern = r"^[\d,\.]+\s*(million|billion|trillion|quadrillion|quintillion)?\s*cookies\s*-\s*Cookie Clicker$"
-        return bool(re.match(pattern, title, re.IGNORECASE))
+        return TITLE_PATTERN.match(title) is not None
 
-    def find_window(self) -> int | None:
-        """Find the Cookie Clicker window with dynamic title."""
+    def snapshot(self) -> list[tuple[int, str, bool]]:
+        """Take a single pass over all top-level windows as (hwnd, title, visible)."""
+        return self.backend.enum_windows()
 
-        def enum_window_callback(hwnd, window_list):
-            if win32gui.IsWindowVisible(hwnd):
-                window_title = win32gui.GetWindowText(hwnd)
-                if self.is_cookie_clicker_window(window_title):
-                    window_list.append((hwnd, window_title))
+    def find_windows(
+        self, snapshot: list[tuple[int, str, bool]] | None = None
+    ) -> list[tuple[int, str]]:
+        """Find every visible Cookie Clicker window as (hwnd, title) pairs."""
+        if snapshot is None:
+            snapshot = self.snapshot()
+        match = TITLE_PATTERN.match
+        return [(hwnd, title) for hwnd, title, visible in snapshot if visible and match(title)]
 
-        windows = []
-        win32gui.EnumWindows(enum_window_callback, windows)
+    def find_window(self) -> int | None:
+        """Find the Cookie Clicker window with dynamic title."""
+        snapshot = self.snapshot()
+        windows = self.find_windows(snapshot)
 
         if not windows:
-            print("❌ No window found with pattern '[number] [unit] cookies - Cookie Clicker'")
-            print("   Examples: '245 cookies', '72.197 million cookies', '13.564 billion cookies'")
-            self._print_diagnostic_info()
+            logger.warning(
+                "❌ No window found with pattern '[number] [unit] cookies - Cookie Clicker' "
+                "(e.g. '245 cookies', '72.197 million cookies', '13.564 billion cookies')"
+            )
+            self._log_diagnostic_info(snapshot)
             return None
 
         # Return the first match
         hwnd, title = windows[0]
-        print(f"🎮 Game detected: '{title}' (HWND: {hwnd})")
+        logger.info("🎮 Game detected: '%s' (HWND: %s)", title, hwnd)
         return hwnd
 
-    def _print_diagnostic_info(self):
+    def _log_diagnostic_info(self, snapshot: list[tuple[int, str, bool]] | None = None):
         """Show diagnostic information about relevant windows."""
-        print("📌 Active windows that might be relevant:")
+        if snapshot is None:
+            snapshot = self.snapshot()
 
-        # Search for windows containing "cookie" in the title
+        # Classify every window in one pass over the snapshot
         relevant_windows = []
-        win32gui.EnumWindows(
-            lambda hwnd, hwnds: hwnds.append((hwnd, win32gui.GetWindowText(hwnd)))
-            if "cookie" in win32gui.GetWindowText(hwnd).lower()
-            else None,
-            relevant_windows,
+        steam_windows = []
+        for _, title, _ in snapshot:
+            lowered = title.lower()
+            if "cookie" in lowered:
+                relevant_windows.append(title)
+            if "steam" in lowered:
+                steam_windows.append(title)
+
+        logger.info(
+            "📌 Active windows that might be relevant: %s",
+            ", ".join(f"'{title}'" for title in relevant_windows) or "none",
+            extra={"data": {"relevant": relevant_windows}},
         )
 
-        for _, title in relevant_windows:
-            if title:
-                print(f"  - '{title}'")
-
         # Show Steam windows just in case
-        print("\n🔍 Steam windows detected:")
-        steam_windows = []
-        win32gui.EnumWindows(
-            lambda hwnd, hwnds: hwnds.append((hwnd, win32gui.GetWindowText(hwnd)))
-            if "steam" in win32gui.GetWindowText(hwnd).lower()
-            else None,
-            steam_windows,
+        logger.info(
+            "🔍 Steam windows detected: %s",
+            ", ".join(f"'{title}'" for title in steam_windows) or "none",
+            extra={"data": {"steam": steam_windows}},
         )
 
-        for _, title in steam_windows:
-            if title:
-                print(f"  - '{title}'")
-
-    @staticmethod
-    def get_client_rect(hwnd: int) -> tuple[int, int, int, int]:
+    def get_client_rect(self, hwnd: int) -> tuple[int, int, int, int]:
         """Get the client rectangle of the window."""
-        return win32gui.GetClientRect(hwnd)
+        return self.backend.get_client_rect(hwnd)
 
-    @staticmethod
-    def client_to_screen(hwnd: int, x: int, y: int) -> tuple[int, int]:
+    def client_to_screen(self, hwnd: int, x: int, y: int) -> tuple[int, int]:
         """Convert client coordinates to screen coordinates."""
-        return win32gui.ClientToScreen(hwnd, (x, y))
+        return self.backend.client_to_screen(hwnd, (x, y))
+
+
+class WindowRegistry(CookieClickerWindowFinder):
+    """Keeps the set of game windows up to date from window events.
+
+    One EnumWindows snapshot seeds the registry; after ``start()`` it follows
+    window create/destroy/show/hide/title-change events instead of rescanning,
+    so lookups are a dictionary read and a cheap ``IsWindow`` check.
+    """
+
+    def __init__(self, backend: WindowBackend | None = None):
+        super().__init__(backend)
+        self._windows: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._cached_hwnd: int | None = None
+        self._seeded = False
+        self._events = self.backend.create_event_source(self._handle_event)
+        self._events.add_hook(EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE)
+        self._events.add_hook(EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE)
+        # Called as listener(event, hwnd, title) with event "added" or "removed"
+        self.listeners: list[Callable[[str, int, str], None]] = []
+        self.rediscoveries = 0  # Game windows found after the cached one was lost
+        metrics.REGISTRY.add_registry(self)
+
+    @property
+    def watching(self) -> bool:
+        """Whether the registry is following window events."""
+        return self._events.running
+
+    def refresh(self, snapshot: list[tuple[int, str, bool]] | None = None):
+        """Rebuild the registry from a full window snapshot."""
+        windows = dict(super().find_windows(snapshot))
+        with self._lock:
+            self._windows = windows
+            self._seeded = True
+
+    def find_windows(
+        self, snapshot: list[tuple[int, str, bool]] | None = None
+    ) -> list[tuple[int, str]]:
+        """Get the known game windows, scanning only if the registry is not live."""
+        if snapshot is not None or not (self._seeded and self.watching):
+            self.refresh(snapshot)
+        with self._lock:
+            return list(self._windows.items())
+
+    def find_window(self) -> int | None:
+        """Get the cached game window, falling back to the registry or a scan."""
+        hwnd = self._cached_hwnd
+        if (
+            hwnd
+            and self.backend.is_window(hwnd)
+            and self.is_cookie_clicker_window(self.backend.get_window_text(hwnd))
+        ):
+            return hwnd
+
+        self._cached_hwnd = None
+        if self._seeded and self.watching:
+            windows = self.find_windows()
+            if windows:
+                self._cached_hwnd, title = windows[0]
+                logger.info("🎮 Game detected: '%s' (HWND: %s)", title, self._cached_hwnd)
+        if self._cached_hwnd is None:
+            self._cached_hwnd = super().find_window()
+        if hwnd and self._cached_hwnd:
+            # The window found before is gone (closed, reloaded) and another took its place
+            self.rediscoveries += 1
+        return self._cached_hwnd
+
+    def start(self):
+        """Seed the registry and start following window events."""
+        if self.watching:
+            return
+        self.refresh()
+        self._events.start()
+
+    def stop(self):
+        """Stop following window events."""
+        self._events.stop()
+
+    def _set(self, hwnd: int, title: str):
+        """Record a game window, notifying listeners if it is new."""
+        with self._lock:
+            is_new = hwnd not in self._windows
+            self._windows[hwnd] = title
+        if is_new:
+            logger.debug("Game window appeared", extra={"data": {"hwnd": hwnd, "title": title}})
+            for listener in self.listeners:
+                listener("added", hwnd, title)
+
+    def _discard(self, hwnd: int):
+        """Forget a window, notifying listeners if it was a game window."""
+        with self._lock:
+            title = self._windows.pop(hwnd, None)
+        if hwnd == self._cached_hwnd:
+            self._cached_hwnd = None
+        if title is not None:
+            logger.debug("Game window went away", extra={"data": {"hwnd": hwnd, "title": title}})
+            for listener in self.listeners:
+                listener("removed", hwnd, title)
+
+    def _handle_event(self, event: int, hwnd: int):
+        """Update the registry for a single window event."""
+        backend = self.backend
+        if event == EVENT_OBJECT_DESTROY or not backend.is_window(hwnd):
+            self._discard(hwnd)
+            return
+
+        title = backend.get_window_text(hwnd)
+        if backend.is_window_visible(hwnd) and self.is_cookie_clicker_window(title):
+            self._set(hwnd, title)
+        else:
+            self._discard(hwnd)